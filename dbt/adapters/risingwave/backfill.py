@@ -0,0 +1,129 @@
+"""Backfill tuning derived from upstream relation sizes and previous runs."""
+
+import json
+import math
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+HISTORY_DIRECTORY = Path("risingwave") / "backfill_history"
+
+# Number of runs kept per model in the history store.
+HISTORY_LIMIT = 20
+
+DEFAULT_TARGET_BACKFILL_SECONDS = 300
+
+# Relation types whose snapshot is read by a materialized view backfill.
+BACKFILLED_RELATION_TYPES = frozenset({"table", "materialized view"})
+
+
+def auto_backfill_order(rows: Iterable[Any], quote: Callable[[str], str]) -> List[str]:
+    """Render `FIXED` edges that backfill every smaller upstream before the largest one.
+
+    `rows` are `(schema_name, relation_name, relation_type, row_count)` rows from
+    `risingwave__get_relation_row_counts`. Relations without statistics, and relations
+    that are not backfilled such as sources and views, are left out of the order. No
+    edges are returned when fewer than two sized relations remain.
+    """
+    sized = {}
+    for schema_name, relation_name, relation_type, row_count in rows:
+        if relation_type not in BACKFILLED_RELATION_TYPES or row_count is None:
+            continue
+        sized[(schema_name, relation_name)] = int(row_count)
+
+    if len(sized) < 2:
+        return []
+
+    ordered = sorted(sized.items(), key=lambda item: (item[1], item[0]))
+    largest, largest_rows = ordered[-1]
+    target = _qualified_name(largest, quote)
+    return [
+        "{} -> {}".format(_qualified_name(key, quote), target)
+        for key, rows in ordered[:-1]
+        if rows < largest_rows
+    ]
+
+
+def _qualified_name(key, quote) -> str:
+    schema_name, relation_name = key
+    return "{}.{}".format(quote(schema_name), quote(relation_name))
+
+
+@dataclass
+class BackfillRun:
+    relation: str
+    recorded_at: str
+    input_rows: int
+    duration_seconds: float
+    parallelism: Optional[int] = None
+    serverless_backfill: bool = False
+
+
+def history_path(target_path: Path, unique_id: str) -> Path:
+    return Path(target_path) / HISTORY_DIRECTORY / "{}.json".format(unique_id)
+
+
+def load_history(path: Path) -> List[BackfillRun]:
+    try:
+        with open(path) as handle:
+            return [BackfillRun(**run) for run in json.load(handle)]
+    except (OSError, TypeError, ValueError):
+        return []
+
+
+def append_history(path: Path, run: BackfillRun, limit: int = HISTORY_LIMIT) -> None:
+    history = load_history(path) + [run]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as handle:
+        json.dump([asdict(item) for item in history[-limit:]], handle, indent=2)
+
+
+def input_rows(rows: Iterable[Any]) -> int:
+    """Total rows a backfill reads, from `risingwave__get_relation_row_counts` rows."""
+    return sum(
+        int(row_count)
+        for _, _, relation_type, row_count in rows
+        if relation_type in BACKFILLED_RELATION_TYPES and row_count is not None
+    )
+
+
+def choose_settings(
+    history: List[BackfillRun], rows: int, tuning: Mapping[str, Any]
+) -> Dict[str, Any]:
+    """Pick `streaming_parallelism` and `enable_serverless_backfill` for the next backfill.
+
+    Throughput per parallel unit comes from the most recent run that recorded its
+    parallelism. The parallelism that would finish `rows` within
+    `target_backfill_seconds` is clamped to `[min_parallelism, max_parallelism]`.
+    Without usable history the parallelism is left to the session defaults.
+    """
+    minimum = int(tuning.get("min_parallelism") or 1)
+    maximum = tuning.get("max_parallelism")
+    maximum = None if maximum is None else max(int(maximum), minimum)
+    target_seconds = float(
+        tuning.get("target_backfill_seconds") or DEFAULT_TARGET_BACKFILL_SECONDS
+    )
+
+    settings: Dict[str, Any] = {}
+    serverless_rows = tuning.get("serverless_backfill_rows")
+    if serverless_rows is not None:
+        settings["enable_serverless_backfill"] = rows >= int(serverless_rows)
+
+    previous = next(
+        (
+            run
+            for run in reversed(history)
+            if run.parallelism and run.duration_seconds > 0 and run.input_rows > 0
+        ),
+        None,
+    )
+    if previous is None or previous.parallelism is None:
+        return settings
+
+    rows_per_unit_second = previous.input_rows / (previous.duration_seconds * previous.parallelism)
+    parallelism = math.ceil(rows / (rows_per_unit_second * target_seconds)) if rows else minimum
+    parallelism = max(parallelism, minimum)
+    if maximum is not None:
+        parallelism = min(parallelism, maximum)
+    settings["streaming_parallelism"] = parallelism
+    return settings
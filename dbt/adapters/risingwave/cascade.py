@@ -0,0 +1,135 @@
+"""Relations that `DROP ... CASCADE` removes together with a dropped relation.
+
+`risingwave__get_relation_dependencies` reads every `rw_depend` edge whose
+dependent is a relation, along with the statement that created the dependent.
+`cascade_set` walks those edges from the dropped relation and orders the
+dependents so each one is rebuilt after everything it reads. Dependents on the
+same `level` do not read each other and can be rebuilt concurrently. Dependents
+that are models selected in the same run are left out: dbt rebuilds them itself.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Collection, Dict, Iterable, List, Optional, Set, Tuple
+
+# `WAIT` keyword for each relation type that runs a streaming job.
+WAIT_KEYWORDS = {
+    "table": "TABLE",
+    "materialized view": "MATERIALIZED VIEW",
+    "sink": "SINK",
+    "index": "INDEX",
+}
+
+
+@dataclass(frozen=True)
+class CascadeDependent:
+    schema: str
+    name: str
+    relation_type: str
+    definition: Optional[str]
+    level: int
+    # Selected relations this dependent reads, directly or through other dependents.
+    # It cannot be rebuilt before dbt recreates them later in the run.
+    reads_selected: Tuple[str, ...] = ()
+
+    @property
+    def wait_keyword(self) -> Optional[str]:
+        return WAIT_KEYWORDS.get(self.relation_type)
+
+
+def cascade_set(
+    rows: Iterable[Any],
+    key: Tuple[str, str],
+    selected: Collection[Tuple[str, str]] = (),
+) -> List[CascadeDependent]:
+    """Dependents dropped with the relation at `key`, in rebuild order.
+
+    Each row is `(dependent_id, dependent_schema, dependent_name, dependent_type,
+    definition, referenced_id, referenced_schema, referenced_name)`. Indexes on the
+    dropped relation itself are left out: the model recreates them. So are the
+    `selected` relations, keyed by `(schema, name)`, and their indexes.
+    """
+    relations: Dict[Any, Tuple[str, str, str, Optional[str]]] = {}
+    readers: Dict[Any, Set[Any]] = defaultdict(set)
+    roots: Set[Any] = set()
+    for (
+        dependent_id,
+        dependent_schema,
+        dependent_name,
+        dependent_type,
+        definition,
+        referenced_id,
+        referenced_schema,
+        referenced_name,
+    ) in rows:
+        relations[dependent_id] = (dependent_schema, dependent_name, dependent_type, definition)
+        readers[referenced_id].add(dependent_id)
+        if (referenced_schema, referenced_name) == key:
+            roots.add(referenced_id)
+
+    # Longest path from the dropped relation, so a dependent comes after all of its
+    # dropped inputs, not just the first one reached.
+    levels: Dict[Any, int] = {}
+    frontier = {
+        dependent_id
+        for root in roots
+        for dependent_id in readers[root]
+        if relations[dependent_id][2] != "index"
+    }
+    level = 1
+    while frontier:
+        for dependent_id in frontier:
+            levels[dependent_id] = level
+        frontier = {
+            reader
+            for dependent_id in frontier
+            for reader in readers[dependent_id]
+            if reader not in roots
+        }
+        level += 1
+        if level > len(relations) + 1:
+            raise ValueError("rw_depend contains a cycle through {}.{}".format(*key))
+
+    selected_ids = {
+        dependent_id
+        for dependent_id in levels
+        if (relations[dependent_id][0], relations[dependent_id][1]) in selected
+    }
+    skipped = set(selected_ids)
+    reads_selected: Dict[Any, Set[str]] = defaultdict(set)
+    for selected_id in selected_ids:
+        name = "{}.{}".format(*relations[selected_id][:2])
+        pending = [
+            reader
+            for reader in readers[selected_id]
+            if reader in levels and reader not in selected_ids
+        ]
+        while pending:
+            reader = pending.pop()
+            if name in reads_selected[reader]:
+                continue
+            if reader in readers[selected_id] and relations[reader][2] == "index":
+                # The selected model recreates its own indexes.
+                skipped.add(reader)
+                continue
+            reads_selected[reader].add(name)
+            pending.extend(
+                next_reader
+                for next_reader in readers[reader]
+                if next_reader in levels and next_reader not in selected_ids
+            )
+
+    dependents = [
+        CascadeDependent(
+            schema=relations[dependent_id][0],
+            name=relations[dependent_id][1],
+            relation_type=relations[dependent_id][2],
+            definition=relations[dependent_id][3],
+            level=level,
+            reads_selected=tuple(sorted(reads_selected.get(dependent_id, ()))),
+        )
+        for dependent_id, level in levels.items()
+        if dependent_id not in skipped
+    ]
+    dependents.sort(key=lambda dependent: (dependent.level, dependent.schema, dependent.name))
+    return dependents
@@ -1,16 +1,20 @@
+import threading
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
 
 import psycopg2
-from dbt.adapters.contracts.connection import Connection
+from dbt.adapters.contracts.connection import AdapterResponse, Connection
 from dbt.adapters.events.logging import AdapterLogger
 from dbt.adapters.postgres.connections import (
     PostgresConnectionManager,
     PostgresCredentials,
 )
 from dbt.adapters.postgres.record import PostgresRecordReplayHandle
+from dbt_common.exceptions import DbtRuntimeError
 from dbt_common.record import RecorderMode, get_record_mode_from_env
 
+from dbt.adapters.risingwave.hosts import Address, HostPool, format_address, parse_hosts
+
 logger = AdapterLogger("RisingWave")
 
 
@@ -31,6 +35,28 @@ RISINGWAVE_PROFILE_SESSION_SETTINGS = (
     "enable_index_selection",
 )
 
+QUERY_MODES = ("auto", "local", "distributed")
+
+# Batch query settings per statement class, before the profile's `query_settings`
+# and model configs. Catalog lookups and `dbt show` previews are small enough for
+# local execution; data tests scan whole relations. Every class lists every setting,
+# and `None` resets it to the session default, so one class's value never carries
+# over to statements of another on the same connection.
+STATEMENT_CLASS_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "catalog": {"query_mode": "local", "statement_timeout": None},
+    "test": {"query_mode": "distributed", "statement_timeout": None},
+    "show": {"query_mode": "local", "statement_timeout": None},
+    "ddl": {"query_mode": None, "statement_timeout": None},
+}
+
+
+@dataclass
+class RisingWaveAdapterResponse(AdapterResponse):
+    # `query_mode` the statement ran with, when the adapter chose one.
+    query_mode: Optional[str] = None
+    # Storage and state totals of the built relation, when `collect_footprint` is set.
+    footprint: Optional[Dict[str, Any]] = None
+
 
 @dataclass
 class RisingWaveCredentials(PostgresCredentials):
@@ -53,6 +79,18 @@ class RisingWaveCredentials(PostgresCredentials):
     streaming_parallelism_for_sink: Optional[Any] = None
     streaming_parallelism_for_index: Optional[Any] = None
     enable_index_selection: Optional[bool] = None
+    # Frontend nodes to spread connections across, as `host` or `host:port`.
+    hosts: Optional[List[str]] = None
+    host_selection: str = "round_robin"
+    # Statement class -> {query_mode, statement_timeout}.
+    query_settings: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @classmethod
+    def __pre_deserialize__(cls, data):
+        data = super().__pre_deserialize__(data)
+        if not data.get("host") and data.get("hosts"):
+            data["host"] = parse_hosts(data["hosts"], data.get("port") or 4566)[0][0]
+        return data
 
     @property
     def type(self):
@@ -60,11 +98,17 @@ class RisingWaveCredentials(PostgresCredentials):
 
     @property
     def unique_field(self):
-        return self.host
+        return ",".join(self.hosts) if self.hosts else self.host
+
+    def host_addresses(self) -> List[Address]:
+        return parse_hosts(self.hosts or [self.host], self.port)
 
     def _connection_keys(self):
         return (
             "host",
+            "hosts",
+            "host_selection",
+            "query_settings",
             "port",
             "user",
             "database",
@@ -81,6 +125,64 @@ class RisingWaveCredentials(PostgresCredentials):
 class RisingWaveConnectionManager(PostgresConnectionManager):
     TYPE = "risingwave"
 
+    # id(handle) -> {setting: rendered value} for every session setting the profile or
+    # dbt has set on that connection. Settings that are absent use the server default.
+    _session_state: Dict[int, Dict[str, str]] = {}
+
+    # One pool per distinct frontend list, shared by every thread's connections.
+    _host_pools: Dict[Tuple[Tuple[Address, ...], str], HostPool] = {}
+    _host_pools_lock = threading.Lock()
+    # id(connection) -> (pool, frontend) the connection counts against.
+    _handle_hosts: Dict[int, Tuple[HostPool, Address]] = {}
+
+    @classmethod
+    def _host_pool(cls, credentials: RisingWaveCredentials) -> HostPool:
+        key = (tuple(credentials.host_addresses()), credentials.host_selection)
+        with cls._host_pools_lock:
+            pool = cls._host_pools.get(key)
+            if pool is None:
+                try:
+                    pool = HostPool(key[0], credentials.host_selection)
+                except ValueError as exc:
+                    raise DbtRuntimeError(str(exc)) from exc
+                cls._host_pools[key] = pool
+            return pool
+
+    @classmethod
+    def _connect_to_frontend(cls, pool: HostPool, connect_to, connection):
+        """Connect to the frontend picked by `pool`, failing over to the others.
+
+        A frontend that raises `OperationalError` is marked unhealthy and the next one
+        is tried. The last error is raised once every frontend has failed, which leaves
+        the backoff between rounds to `retry_connection`.
+        """
+        tried: Set[Address] = set()
+        address = pool.acquire()
+        while address is not None:
+            try:
+                handle = connect_to(*address)
+            except psycopg2.errors.OperationalError as exc:
+                pool.release(address)
+                pool.mark_unhealthy(address)
+                tried.add(address)
+                next_address = pool.acquire(exclude=tried)
+                if next_address is None:
+                    raise
+                logger.debug(
+                    f"Frontend is unavailable, trying {format_address(next_address)} next: {exc}"
+                )
+                address = next_address
+                continue
+            pool.mark_healthy(address)
+            # Keyed by the dbt connection: record and replay modes wrap the raw handle.
+            cls._handle_hosts[id(connection)] = (pool, address)
+            logger.debug(
+                f"Opened connection to frontend {format_address(address)}; "
+                f"connections per host: {pool.describe()}"
+            )
+            return handle
+        raise DbtRuntimeError("No RisingWave frontend is configured")
+
     @classmethod
     def _super_open(cls, connection, extra_kwargs: Optional[Dict[str, str]] = None):
         """Copied from upstream repo."""
@@ -129,14 +231,20 @@ class RisingWaveConnectionManager(PostgresConnectionManager):
             # and diff modes wrap one to observe native connection activity.
             rec_mode = get_record_mode_from_env()
             if rec_mode != RecorderMode.REPLAY:
-                handle = psycopg2.connect(
-                    dbname=credentials.database,
-                    user=credentials.user,
-                    host=credentials.host,
-                    password=credentials.password,
-                    port=credentials.port,
-                    connect_timeout=credentials.connect_timeout,
-                    **kwargs,
+
+                def connect_to(host, port):
+                    return psycopg2.connect(
+                        dbname=credentials.database,
+                        user=credentials.user,
+                        host=host,
+                        password=credentials.password,
+                        port=port,
+                        connect_timeout=credentials.connect_timeout,
+                        **kwargs,
+                    )
+
+                handle = cls._connect_to_frontend(
+                    cls._host_pool(credentials), connect_to, connection
                 )
 
             if handle is not None and credentials.autocommit:
@@ -146,7 +254,11 @@ class RisingWaveConnectionManager(PostgresConnectionManager):
                 handle = PostgresRecordReplayHandle(handle, connection)
 
             if credentials.role:
-                handle.cursor().execute("set role {}".format(credentials.role))
+                try:
+                    handle.cursor().execute("set role {}".format(credentials.role))
+                except BaseException:
+                    cls._release_frontend(connection)
+                    raise
             return handle
 
         retryable_exceptions = [
@@ -181,25 +293,115 @@ class RisingWaveConnectionManager(PostgresConnectionManager):
             },
         )
         credentials = cls.get_credentials(connection.credentials)
-        cls._configure_session(connection.handle, credentials)
+        try:
+            cls._configure_session(connection.handle, credentials)
+        except BaseException:
+            cls._release_frontend(connection)
+            raise
         return connection
 
+    @classmethod
+    def get_response(cls, cursor) -> RisingWaveAdapterResponse:
+        response = super().get_response(cursor)
+        # Record and replay cursors point at the dbt connection rather than the handle.
+        handle = getattr(cursor.connection, "handle", cursor.connection)
+        query_mode = cls._session_state.get(id(handle), {}).get("query_mode")
+        return RisingWaveAdapterResponse(
+            _message=response._message,
+            code=response.code,
+            rows_affected=response.rows_affected,
+            query_mode=None if query_mode is None else query_mode.strip("'"),
+        )
+
+    @classmethod
+    def close(cls, connection):
+        cls._session_state.pop(id(connection.handle), None)
+        cls._release_frontend(connection)
+        return super().close(connection)
+
+    @classmethod
+    def _release_frontend(cls, connection):
+        """Stop counting `connection` against its frontend, if it still does."""
+        frontend = cls._handle_hosts.pop(id(connection), None)
+        if frontend is not None:
+            pool, address = frontend
+            pool.release(address)
+            logger.debug(
+                f"Released connection to frontend {format_address(address)}; "
+                f"connections per host: {pool.describe()}"
+            )
+
     @staticmethod
     def _configure_session(handle, credentials: RisingWaveCredentials):
         if handle is None or credentials is None:
             return
 
+        # Send every SET in one simple-query round trip instead of one per setting.
         cursor = handle.cursor()
         try:
-            cursor.execute("SET RW_IMPLICIT_FLUSH TO true")
-            for setting in RISINGWAVE_PROFILE_SESSION_SETTINGS:
-                value = getattr(credentials, setting, None)
-                if value is not None:
-                    cursor.execute(
-                        f"SET {setting} = {RisingWaveConnectionManager._format_session_value(value)}"
-                    )
+            cursor.execute("; ".join(RisingWaveConnectionManager._session_statements(credentials)))
         finally:
             cursor.close()
+        RisingWaveConnectionManager._session_state[id(handle)] = (
+            RisingWaveConnectionManager._profile_session_state(credentials)
+        )
+
+    @staticmethod
+    def _profile_session_state(credentials: RisingWaveCredentials) -> Dict[str, str]:
+        state = {"rw_implicit_flush": "true"}
+        for setting in RISINGWAVE_PROFILE_SESSION_SETTINGS:
+            value = getattr(credentials, setting, None)
+            if value is not None:
+                state[setting] = RisingWaveConnectionManager._format_session_value(value)
+        return state
+
+    def session_setting_statements(self, settings: Mapping[str, Any]) -> List[str]:
+        """`SET` statements for the settings whose value differs from the connection's state.
+
+        The statements are recorded as applied: the caller sends them, usually in the same
+        execution as the statement they configure. A `None` value resets the setting to
+        the server default.
+        """
+        connection = self.get_thread_connection()
+        state = self._session_state.setdefault(id(connection.handle), {})
+
+        statements = []
+        for setting, value in settings.items():
+            setting = setting.lower()
+            if value is None:
+                if setting not in state:
+                    continue
+                statements.append(f"SET {setting} = DEFAULT")
+                del state[setting]
+                continue
+
+            rendered = self._format_session_value(value)
+            if state.get(setting) == rendered:
+                continue
+            statements.append(f"SET {setting} = {rendered}")
+            state[setting] = rendered
+        return statements
+
+    def apply_session_settings(self, settings: Mapping[str, Any]) -> List[str]:
+        """SET only the session settings whose value differs from the connection's state.
+
+        All changed settings are sent in one batch; the statements are returned.
+        """
+        statements = self.session_setting_statements(settings)
+        if statements:
+            self.add_query("; ".join(statements), auto_begin=False)
+        return statements
+
+    @staticmethod
+    def _session_statements(credentials: RisingWaveCredentials) -> List[str]:
+        statements = ["SET RW_IMPLICIT_FLUSH TO true"]
+        for setting in RISINGWAVE_PROFILE_SESSION_SETTINGS:
+            value = getattr(credentials, setting, None)
+            if value is not None:
+                statements.append(
+                    f"SET {setting} = {RisingWaveConnectionManager._format_session_value(value)}"
+                )
+        return statements
 
     @staticmethod
     def _format_session_value(value: Any) -> str:
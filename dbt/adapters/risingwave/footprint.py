@@ -0,0 +1,144 @@
+"""Storage and streaming state footprint of dbt-managed relations.
+
+A streaming job stores its output in the relation's own table and keeps the
+state of its operators, such as join and aggregation state, in internal tables.
+`risingwave__get_relation_footprints` reads both from `rw_table_stats` in one
+catalog query. Footprints are summed per model over the relation and its
+indexes, which are attributed to the model that owns the indexed relation.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from dbt.adapters.risingwave import planner
+
+# Materializations that run a streaming job and therefore keep state.
+FOOTPRINT_MATERIALIZATIONS = frozenset(
+    {
+        "materialized_view",
+        "materializedview",
+        "table",
+        "table_with_connector",
+        "incremental",
+        "sink",
+    }
+)
+
+
+@dataclass(frozen=True)
+class RelationFootprint:
+    schema: str
+    name: str
+    relation_type: str
+    parent_name: Optional[str] = None
+    row_count: Optional[int] = None
+    storage_bytes: int = 0
+    state_bytes: int = 0
+    state_tables: int = 0
+
+    @property
+    def owner_key(self) -> Tuple[str, str]:
+        """The relation whose model owns this one: the indexed relation for an index."""
+        if self.relation_type == "index" and self.parent_name is not None:
+            return self.schema, self.parent_name
+        return self.schema, self.name
+
+
+def from_rows(rows: Iterable[Any]) -> List[RelationFootprint]:
+    """Parse `risingwave__get_relation_footprints` rows.
+
+    Each row is `(schema_name, relation_name, relation_type, parent_name, row_count,
+    storage_bytes, state_bytes, state_tables)`.
+    """
+    return [
+        RelationFootprint(
+            schema=schema_name,
+            name=relation_name,
+            relation_type=relation_type,
+            parent_name=parent_name,
+            row_count=None if row_count is None else int(row_count),
+            storage_bytes=int(storage_bytes or 0),
+            state_bytes=int(state_bytes or 0),
+            state_tables=int(state_tables or 0),
+        )
+        for (
+            schema_name,
+            relation_name,
+            relation_type,
+            parent_name,
+            row_count,
+            storage_bytes,
+            state_bytes,
+            state_tables,
+        ) in rows
+    ]
+
+
+def summarize(footprints: Iterable[RelationFootprint], key: Tuple[str, str]) -> Dict[str, Any]:
+    """Totals for the relation at `key` and its indexes.
+
+    `row_count` is the row estimate of the relation itself, or `None` when
+    `rw_table_stats` has no entry for it yet.
+    """
+    summary: Dict[str, Any] = {
+        "row_count": None,
+        "storage_bytes": 0,
+        "state_bytes": 0,
+        "state_tables": 0,
+        "indexes": 0,
+    }
+    for footprint in footprints:
+        if footprint.owner_key != key:
+            continue
+        summary["storage_bytes"] += footprint.storage_bytes
+        summary["state_bytes"] += footprint.state_bytes
+        summary["state_tables"] += footprint.state_tables
+        if footprint.relation_type == "index":
+            summary["indexes"] += 1
+        elif footprint.row_count is not None:
+            summary["row_count"] = footprint.row_count
+    return summary
+
+
+def rank_models(
+    nodes: Mapping[str, Mapping[str, Any]],
+    footprints: Iterable[RelationFootprint],
+    select: Optional[Iterable[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Footprint of every selected streaming model, largest state first.
+
+    Models whose relation is missing from the catalog are left out.
+    """
+    footprints = list(footprints)
+    found = {footprint.owner_key for footprint in footprints}
+
+    ranked = []
+    for node in planner.select_nodes(nodes, select):
+        materialized = (node.get("config") or {}).get("materialized")
+        if materialized not in FOOTPRINT_MATERIALIZATIONS:
+            continue
+        key = planner.relation_key(node)
+        if key not in found:
+            continue
+        ranked.append(
+            {
+                "unique_id": node.get("unique_id"),
+                "name": node.get("name"),
+                "relation": "{}.{}".format(*key),
+                "materialized": materialized,
+                **summarize(footprints, key),
+            }
+        )
+    ranked.sort(key=lambda item: (-item["state_bytes"], -item["storage_bytes"], item["relation"]))
+    return ranked
+
+
+def format_bytes(size: int) -> str:
+    if abs(size) < 1024:
+        return "{} B".format(int(size))
+    value: float = size
+    for unit in ("KiB", "MiB", "GiB"):
+        value /= 1024
+        if abs(value) < 1024:
+            return "{:.1f} {}".format(value, unit)
+    return "{:.1f} TiB".format(value / 1024)
@@ -0,0 +1,109 @@
+"""Frontend selection for profiles that list several RisingWave frontend nodes.
+
+Every frontend serves the same cluster, so connections are spread across the
+profile's `hosts` and a frontend that refuses a connection is skipped for a
+cooldown period instead of being retried by every dbt thread.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+HOST_SELECTION_STRATEGIES = ("round_robin", "least_connections")
+
+# Seconds a frontend is skipped after a failed connection attempt.
+DEFAULT_COOLDOWN_SECONDS = 30
+
+Address = Tuple[str, int]
+
+
+def parse_hosts(hosts: Sequence[str], default_port: int) -> List[Address]:
+    """Parse `host` or `host:port` entries, keeping the first of any duplicates."""
+    addresses: List[Address] = []
+    for entry in hosts:
+        host, separator, port = str(entry).strip().rpartition(":")
+        if not separator or not port.isdigit():
+            host, port = str(entry).strip(), str(default_port)
+        address = (host.strip("[]"), int(port))
+        if address not in addresses:
+            addresses.append(address)
+    return addresses
+
+
+def format_address(address: Address) -> str:
+    return "{}:{}".format(*address)
+
+
+class HostPool:
+    """Open connection counts and health of the frontends of one profile."""
+
+    def __init__(
+        self,
+        addresses: Sequence[Address],
+        strategy: str = "round_robin",
+        cooldown_seconds: float = DEFAULT_COOLDOWN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if strategy not in HOST_SELECTION_STRATEGIES:
+            raise ValueError(
+                "`host_selection` must be one of {}, got {!r}".format(
+                    ", ".join(HOST_SELECTION_STRATEGIES), strategy
+                )
+            )
+        self.addresses = list(addresses)
+        self.strategy = strategy
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connections: Dict[Address, int] = {address: 0 for address in self.addresses}
+        self._unhealthy_until: Dict[Address, float] = {}
+        self._next = 0
+
+    def acquire(self, exclude: Optional[Set[Address]] = None) -> Optional[Address]:
+        """Pick a frontend for a new connection and count it as open.
+
+        Frontends cooling down after a failure are only picked when every other
+        candidate has been excluded. Returns `None` when no candidate is left.
+        """
+        with self._lock:
+            # Walk the frontends starting after the last one picked, so round robin
+            # continues past a failed frontend and ties in load are spread evenly.
+            start = self._next % len(self.addresses)
+            rotated = self.addresses[start:] + self.addresses[:start]
+            ordered = [address for address in rotated if address not in (exclude or ())]
+            if not ordered:
+                return None
+            now = self._clock()
+            healthy = [
+                address for address in ordered if self._unhealthy_until.get(address, 0) <= now
+            ]
+            if not healthy:
+                address = min(ordered, key=lambda address: self._unhealthy_until[address])
+            elif self.strategy == "least_connections":
+                address = min(healthy, key=lambda address: self._connections[address])
+            else:
+                address = healthy[0]
+            self._next = self.addresses.index(address) + 1
+            self._connections[address] += 1
+            return address
+
+    def release(self, address: Address) -> None:
+        with self._lock:
+            if self._connections.get(address, 0) > 0:
+                self._connections[address] -= 1
+
+    def mark_unhealthy(self, address: Address) -> None:
+        with self._lock:
+            self._unhealthy_until[address] = self._clock() + self.cooldown_seconds
+
+    def mark_healthy(self, address: Address) -> None:
+        with self._lock:
+            self._unhealthy_until.pop(address, None)
+
+    def describe(self) -> str:
+        """Open connections per frontend, for debug logs."""
+        with self._lock:
+            return ", ".join(
+                "{}={}".format(format_address(address), self._connections[address])
+                for address in self.addresses
+            )
@@ -1,21 +1,572 @@
+import dataclasses
+import threading
 import time
+from datetime import datetime, timezone
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type
 
+from dbt.adapters.base.column import Column
 from dbt.adapters.base.meta import available
+from dbt.adapters.capability import Capability, CapabilityDict, CapabilitySupport, Support
+from dbt.adapters.base.relation import BaseRelation
+from dbt.adapters.contracts.relation import RelationConfig
+from dbt.adapters.events.logging import AdapterLogger
 from dbt.adapters.postgres.impl import PostgresAdapter
+from dbt_common.exceptions import DbtDatabaseError, DbtRuntimeError
 
-from dbt.adapters.risingwave.connections import RisingWaveConnectionManager
+from dbt.adapters.risingwave import (
+    backfill,
+    cascade,
+    footprint,
+    planner,
+    snapshot,
+    stream_plan,
+    subscription,
+)
+from dbt.adapters.risingwave.connections import (
+    QUERY_MODES,
+    STATEMENT_CLASS_DEFAULTS,
+    RisingWaveAdapterResponse,
+    RisingWaveConnectionManager,
+)
 from dbt.adapters.risingwave.relation import RisingWaveRelation
 
+logger = AdapterLogger("RisingWave")
+
 
 class RisingWaveAdapter(PostgresAdapter):
     ConnectionManager = RisingWaveConnectionManager
-    Relation = RisingWaveRelation
+    connections: RisingWaveConnectionManager
+    Relation: Type[RisingWaveRelation] = RisingWaveRelation
+
+    _capabilities = CapabilityDict(
+        {
+            Capability.SchemaMetadataByRelations: CapabilitySupport(support=Support.Full),
+            Capability.MicrobatchConcurrency: CapabilitySupport(support=Support.Full),
+        }
+    )
+
+    def __init__(self, config, mp_context) -> None:
+        super().__init__(config, mp_context)
+        # unique_id -> backfill started by `tune_backfill_settings`, awaiting `record_backfill`.
+        self._pending_backfills: Dict[str, Dict[str, Any]] = {}
+        # Schema DDL already settled in this run, shared by every thread.
+        self._schema_ddl_lock = threading.Lock()
+        self._schema_locks: Dict[Tuple[Optional[str], Optional[str]], threading.Lock] = {}
+        self._created_schemas: Set[Tuple[Optional[str], Optional[str]]] = set()
+        # database -> {schema: owner}
+        self._schema_owners: Dict[Optional[str], Dict[Optional[str], str]] = {}
+        # (database, schema) -> {identifier: [Column]} read from `rw_columns` once per
+        # schema. `_column_cache_generation` bumps on every invalidation so a schema
+        # read that raced with DDL is not stored.
+        self._column_cache_lock = threading.Lock()
+        self._column_cache: Dict[Tuple[Optional[str], Optional[str]], Dict[str, List[Column]]] = {}
+        self._column_cache_generation = 0
 
     def _link_cached_relations(self, manifest):
         # lack of `pg_depend`, `pg_rewrite`
         pass
 
+    def _relations_cache_for_schemas(
+        self,
+        relation_configs: Iterable[RelationConfig],
+        cache_schemas: Optional[Set[BaseRelation]] = None,
+    ) -> None:
+        # One catalog query per database instead of one per schema.
+        if not cache_schemas:
+            cache_schemas = self._get_cache_schemas(relation_configs)
+
+        schemas_by_database = defaultdict(set)
+        for cache_schema in cache_schemas:
+            if cache_schema.schema:
+                schemas_by_database[cache_schema.database].add(cache_schema.schema)
+
+        for database, schemas in schemas_by_database.items():
+            for relation in self.list_relations_in_schemas(database, sorted(schemas)):
+                self.cache.add(relation)
+
+        self.cache.update_schemas(
+            (database, schema)
+            for database, schemas in schemas_by_database.items()
+            for schema in schemas
+        )
+
+    def get_columns_in_relation(self, relation: BaseRelation) -> List[Column]:
+        if not relation.schema or not relation.identifier:
+            return super().get_columns_in_relation(relation)
+
+        key = (relation.database, relation.schema)
+        with self._column_cache_lock:
+            schema_columns = self._column_cache.get(key)
+            generation = self._column_cache_generation
+        if schema_columns is None:
+            schema_columns = self._get_columns_in_schema(relation.database, relation.schema)
+            with self._column_cache_lock:
+                if generation == self._column_cache_generation:
+                    self._column_cache[key] = schema_columns
+
+        columns = schema_columns.get(relation.identifier)
+        if columns is None:
+            # Created after the schema was cached; empty results are never cached.
+            columns = super().get_columns_in_relation(relation)
+            with self._column_cache_lock:
+                if columns and generation == self._column_cache_generation:
+                    schema_columns[relation.identifier] = columns
+        return list(columns)
+
+    def _get_columns_in_schema(self, database, schema) -> Dict[str, List[Column]]:
+        results = self.execute_macro(
+            "risingwave__get_columns_in_schema",
+            kwargs={"database": database, "schema": schema},
+        )
+        schema_columns = defaultdict(list)
+        for relation_name, column_name, data_type in results:
+            schema_columns[relation_name].append(
+                self.Column(column_name, data_type, None, None, None)
+            )
+        return dict(schema_columns)
+
+    @available
+    def invalidate_column_cache(self, relation: BaseRelation) -> str:
+        """Forget cached columns of `relation` after DDL that changes them."""
+        with self._column_cache_lock:
+            self._column_cache_generation += 1
+            schema_columns = self._column_cache.get((relation.database, relation.schema))
+            if schema_columns is not None and relation.identifier:
+                schema_columns.pop(relation.identifier, None)
+        return ""
+
+    def drop_relation(self, relation: BaseRelation) -> None:
+        super().drop_relation(relation)
+        self.invalidate_column_cache(relation)
+
+    def rename_relation(self, from_relation: BaseRelation, to_relation: BaseRelation) -> None:
+        super().rename_relation(from_relation, to_relation)
+        self.invalidate_column_cache(from_relation)
+        self.invalidate_column_cache(to_relation)
+
+    def list_relations_without_caching(self, schema_relation: BaseRelation) -> List[BaseRelation]:
+        if schema_relation.schema is None:
+            return []
+        return self.list_relations_in_schemas(schema_relation.database, [schema_relation.schema])
+
+    def list_relations_in_schemas(
+        self, database: Optional[str], schemas: List[str]
+    ) -> List[BaseRelation]:
+        results = self.execute_macro(
+            "risingwave__list_relations_in_schemas",
+            kwargs={"database": database, "schemas": schemas},
+        )
+
+        relations: List[BaseRelation] = []
+        quote_policy = {"database": True, "schema": True, "identifier": True}
+        for _database, name, _schema, _type in results:
+            try:
+                _type = self.Relation.get_relation_type(_type)
+            except ValueError:
+                _type = self.Relation.External
+            relations.append(
+                self.Relation.create(
+                    database=_database,
+                    schema=_schema,
+                    identifier=name,
+                    quote_policy=quote_policy,
+                    type=_type,
+                )
+            )
+        return relations
+
+    def _schema_lock(self, key: Tuple[Optional[str], Optional[str]]) -> threading.Lock:
+        """Lock held while DDL on the schema at `key` runs, so other threads wait for it."""
+        with self._schema_ddl_lock:
+            return self._schema_locks.setdefault(key, threading.Lock())
+
+    def create_schema(self, relation: BaseRelation) -> None:
+        # `create schema if not exists` is idempotent, so issue it once per schema and run.
+        # The schema is recorded only once it exists; a failed CREATE is retried.
+        key = (relation.database, relation.schema)
+        with self._schema_lock(key):
+            with self._schema_ddl_lock:
+                if key in self._created_schemas:
+                    return
+            super().create_schema(relation)
+            with self._schema_ddl_lock:
+                self._created_schemas.add(key)
+
+    def drop_schema(self, relation: BaseRelation) -> None:
+        super().drop_schema(relation)
+        with self._schema_ddl_lock:
+            self._created_schemas.discard((relation.database, relation.schema))
+            self._schema_owners.get(relation.database, {}).pop(relation.schema, None)
+        with self._column_cache_lock:
+            self._column_cache_generation += 1
+            self._column_cache.pop((relation.database, relation.schema), None)
+
+    @available
+    def ensure_schema_owner(self, relation, owner) -> str:
+        """Run `ALTER SCHEMA ... OWNER TO owner` unless the schema is already owned by `owner`.
+
+        Schema owners are read from the catalog once per database. Concurrent models in
+        the same schema wait for the first one's ALTER, and the schema is recorded as
+        owned by `owner` only after it succeeds.
+        """
+        with self._schema_lock((relation.database, relation.schema)):
+            with self._schema_ddl_lock:
+                owners = self._schema_owners.get(relation.database)
+                if owners is None:
+                    owners = {
+                        schema_name: owner_name
+                        for schema_name, owner_name in self.execute_macro(
+                            "risingwave__get_schema_owners",
+                            kwargs={"database": relation.database},
+                        )
+                    }
+                    self._schema_owners[relation.database] = owners
+                if owners.get(relation.schema) == owner:
+                    return ""
+            self.execute_macro(
+                "risingwave__alter_schema_owner", kwargs={"relation": relation, "owner": owner}
+            )
+            with self._schema_ddl_lock:
+                owners[relation.schema] = owner
+        return ""
+
     @available
     @classmethod
     def sleep(cls, seconds):
         time.sleep(seconds)
+
+    @available
+    def apply_session_settings(self, settings):
+        """SET the given session settings on this thread's connection, skipping unchanged ones."""
+        self.connections.apply_session_settings(settings)
+        return ""
+
+    @available
+    def session_setting_statements(self, settings) -> List[str]:
+        """`SET` statements to send with the next statement, skipping unchanged settings."""
+        return self.connections.session_setting_statements(settings)
+
+    @available
+    def statement_class_settings(self, statement_class, config=None) -> Dict[str, Any]:
+        """`query_mode` and `statement_timeout` for one class of statements.
+
+        Adapter defaults are overridden by the profile's `query_settings` for the
+        class, then by the `query_mode` and `statement_timeout` configs of the model.
+        Both settings are always returned; `None` resets one to the session default.
+        """
+        if statement_class not in STATEMENT_CLASS_DEFAULTS:
+            raise DbtRuntimeError(
+                "Unknown statement class {!r}; expected one of {}.".format(
+                    statement_class, ", ".join(STATEMENT_CLASS_DEFAULTS)
+                )
+            )
+
+        settings = dict(STATEMENT_CLASS_DEFAULTS[statement_class])
+        profile_settings = getattr(self.config.credentials, "query_settings", None) or {}
+        settings.update(profile_settings.get(statement_class) or {})
+        for setting in ("query_mode", "statement_timeout"):
+            value = config.get(setting, None) if config is not None else None
+            if value is not None:
+                settings[setting] = value
+
+        unknown = set(settings) - {"query_mode", "statement_timeout"}
+        if unknown:
+            raise DbtRuntimeError(
+                "Unsupported `query_settings` keys for {!r}: {}.".format(
+                    statement_class, ", ".join(sorted(unknown))
+                )
+            )
+        query_mode = settings.get("query_mode")
+        if query_mode is not None and str(query_mode).lower() not in QUERY_MODES:
+            raise DbtRuntimeError(
+                "`query_mode` must be one of {}, got {!r}.".format(
+                    ", ".join(QUERY_MODES), query_mode
+                )
+            )
+        return settings
+
+    @available
+    def rebuild_plan_schemas(self, graph, select=None):
+        """Schemas holding the selected nodes and their upstream relations."""
+        nodes, sources = graph.get("nodes", {}), graph.get("sources", {})
+        selected = planner.select_nodes(nodes, select)
+        return planner.snapshot_schemas(selected, nodes, sources)
+
+    @available
+    def rebuild_plan_missing_row_counts(self, graph, snapshot_table, select=None):
+        """Upstream tables and MVs whose `rw_table_stats` entry is missing."""
+        nodes, sources = graph.get("nodes", {}), graph.get("sources", {})
+        selected = planner.select_nodes(nodes, select)
+        snapshot = planner.CatalogSnapshot.from_rows(snapshot_table)
+        return [
+            list(key)
+            for key in planner.relations_missing_row_counts(selected, nodes, sources, snapshot)
+        ]
+
+    @available
+    def plan_rebuilds(
+        self,
+        graph,
+        snapshot_table,
+        select=None,
+        full_refresh=False,
+        zero_downtime=False,
+        row_counts=None,
+    ):
+        """Plan the action each selected materialization would take.
+
+        Returns one dict per node, sorted by expected backfill rows, descending.
+        """
+        snapshot = planner.CatalogSnapshot.from_rows(snapshot_table)
+        if row_counts is not None:
+            snapshot.with_row_counts(row_counts)
+        plan = planner.plan_rebuilds(
+            graph.get("nodes", {}),
+            graph.get("sources", {}),
+            snapshot,
+            select=select,
+            full_refresh=full_refresh,
+            zero_downtime=zero_downtime,
+        )
+        return [planned.to_dict() for planned in plan]
+
+    @available
+    def upstream_relations(self, graph, node):
+        """Relations read by `node`, looking through ephemeral models."""
+        relations = []
+        for upstream in planner.upstream_nodes(
+            node, graph.get("nodes", {}), graph.get("sources", {})
+        ):
+            schema, identifier = planner.relation_key(upstream)
+            relations.append(
+                self.Relation.create(
+                    database=upstream.get("database"), schema=schema, identifier=identifier
+                )
+            )
+        return relations
+
+    @available
+    def auto_backfill_order(self, row_counts_table):
+        """Render `backfill_order: auto` edges from `risingwave__get_relation_row_counts` rows."""
+        return backfill.auto_backfill_order(row_counts_table, self.quote)
+
+    @available
+    def tune_backfill_settings(self, unique_id, row_counts_table, tuning):
+        """Choose backfill session settings for a model from its recorded history.
+
+        The backfill is timed from this call until `record_backfill`.
+        """
+        rows = backfill.input_rows(row_counts_table)
+        history = backfill.load_history(backfill.history_path(self._target_path(), unique_id))
+        settings = backfill.choose_settings(history, rows, tuning or {})
+        self._pending_backfills[unique_id] = {
+            "input_rows": rows,
+            "started": time.monotonic(),
+            "serverless_backfill": bool(settings.get("enable_serverless_backfill", False)),
+        }
+        return settings
+
+    @available
+    def record_backfill(self, unique_id, relation, parallelism_table=None):
+        """Append the finished backfill started by `tune_backfill_settings` to the history."""
+        pending = self._pending_backfills.pop(unique_id, None)
+        if pending is None:
+            return
+        parallelism = None
+        if parallelism_table is not None and len(parallelism_table.rows) > 0:
+            value = parallelism_table.rows[0][0]
+            parallelism = None if value is None else int(value)
+        backfill.append_history(
+            backfill.history_path(self._target_path(), unique_id),
+            backfill.BackfillRun(
+                relation=str(relation),
+                recorded_at=datetime.now(timezone.utc).isoformat(),
+                input_rows=pending["input_rows"],
+                duration_seconds=round(time.monotonic() - pending["started"], 3),
+                parallelism=parallelism,
+                serverless_backfill=pending["serverless_backfill"],
+            ),
+        )
+
+    @available
+    def cascade_dependents(self, dependency_table, relation, selected_nodes=()):
+        """Relations `DROP ... CASCADE` of `relation` also drops, in rebuild order.
+
+        Models among `selected_nodes` are rebuilt by the run itself and left out.
+        """
+        selected = {
+            planner.relation_key(node)
+            for node in selected_nodes
+            if node.get("resource_type") == "model"
+        }
+        return cascade.cascade_set(
+            dependency_table, (relation.schema, relation.identifier), selected
+        )
+
+    @available
+    def attach_footprint(self, response, footprint_table, relation):
+        """Return `response` with the footprint of `relation` and its indexes."""
+        summary = footprint.summarize(
+            footprint.from_rows(footprint_table), (relation.schema, relation.identifier)
+        )
+        if not isinstance(response, RisingWaveAdapterResponse):
+            response = RisingWaveAdapterResponse(
+                _message=response._message,
+                code=response.code,
+                rows_affected=response.rows_affected,
+            )
+        return dataclasses.replace(response, footprint=summary)
+
+    @available
+    def footprint_schemas(self, graph, select=None):
+        """Schemas holding the selected models."""
+        selected = planner.select_nodes(graph.get("nodes", {}), select)
+        return sorted({node.get("schema") for node in selected if node.get("schema")})
+
+    @available
+    def rank_footprints(self, graph, footprint_table, select=None):
+        """Footprint of each selected streaming model, sorted by state size, descending."""
+        return footprint.rank_models(
+            graph.get("nodes", {}), footprint.from_rows(footprint_table), select
+        )
+
+    @available
+    @classmethod
+    def format_bytes(cls, size):
+        return footprint.format_bytes(size)
+
+    @available
+    def iter_subscription_changes(
+        self, subscription_relation, batch_size=1000, start="full", name=None
+    ):
+        """Yield changes from a subscription in batches, resuming where the last run stopped.
+
+        Each batch is an agate table with the subscribed columns plus `op` and
+        `rw_timestamp`. The position is stored under the target directory per `name`,
+        which defaults to the subscription name. `start` (`full`, `begin` or `now`)
+        applies only when no position is stored.
+        """
+        name = name or str(subscription_relation).replace('"', "")
+        return subscription.iter_changes(
+            lambda sql: self.execute(sql, fetch=True)[1],
+            str(subscription_relation),
+            subscription.position_path(self._target_path(), name),
+            subscription.cursor_name(name),
+            batch_size=batch_size,
+            start=start,
+        )
+
+    @available
+    def apply_changelog_snapshot(
+        self,
+        target_relation,
+        changelog_relation,
+        subscription_relation,
+        unique_key,
+        column_names,
+        meta_columns,
+        hard_deletes="ignore",
+        batch_size=1000,
+        rebuild=False,
+        reload=False,
+        fingerprint=None,
+        retention=None,
+    ):
+        """Apply the changes since the last snapshot run to a `changelog` snapshot table.
+
+        The position is read from and written to the comment of `changelog_relation`,
+        together with the query `fingerprint`. `rebuild` ignores it and loads a new,
+        empty snapshot table from a full cursor; `reload` does the same for an existing
+        table, closing its current versions first. A position older than the
+        subscription `retention` is reloaded the same way, because the changes after it
+        are gone. Returns the number of changes applied.
+        """
+        if hard_deletes not in snapshot.HARD_DELETE_BEHAVIORS:
+            raise DbtRuntimeError(
+                "The `changelog` snapshot strategy supports `hard_deletes` values {}, "
+                "got '{}'.".format(sorted(snapshot.HARD_DELETE_BEHAVIORS), hard_deletes)
+            )
+        key_columns = [unique_key] if isinstance(unique_key, str) else list(unique_key)
+
+        def save_position(position):
+            self.execute(
+                self.execute_macro(
+                    "risingwave__alter_relation_comment",
+                    kwargs={
+                        "relation": changelog_relation,
+                        "comment": snapshot.format_position(position, fingerprint),
+                    },
+                )
+            )
+
+        position = None
+        if not (rebuild or reload):
+            position = snapshot.parse_position(
+                self.execute_macro(
+                    "risingwave__get_relation_comment", kwargs={"relation": changelog_relation}
+                )
+            )
+        if position is not None and retention is not None:
+            _, cutoff = self.execute(snapshot.retention_cutoff_sql(retention), fetch=True)
+            if position.rw_timestamp < int(cutoff.rows[0][0]):
+                logger.warning(
+                    f"The changelog position of {target_relation} is older than the "
+                    f"subscription retention '{retention}'; reloading a full snapshot."
+                )
+                position = None
+                reload = True
+        array_types = {
+            column.name: column.dtype
+            for column in self.get_columns_in_relation(changelog_relation)
+            if column.dtype.endswith("[]")
+        }
+        return snapshot.apply_changes(
+            lambda sql: self.execute(sql, fetch=True)[1],
+            save_position,
+            str(target_relation),
+            str(subscription_relation),
+            subscription.cursor_name(str(target_relation).replace('"', "")),
+            self.quote,
+            key_columns,
+            list(column_names),
+            meta_columns,
+            position=position,
+            hard_deletes=hard_deletes,
+            batch_size=batch_size,
+            array_types=array_types,
+            close_current=reload,
+        )
+
+    def _target_path(self) -> Path:
+        target_path = getattr(self.config, "project_target_path", None)
+        if target_path is None:
+            target_path = Path(self.config.project_root) / self.config.target_path
+        return Path(target_path)
+
+    @available
+    def track_stream_plan(self, unique_id, relation, explain_sql, thresholds=None, accept=True):
+        """EXPLAIN a streaming job, store its plan summary and compare it to the last run.
+
+        Returns one message per exceeded `plan_tracking` threshold. The stored plan
+        becomes the new baseline unless there are violations and `accept` is false.
+        """
+        try:
+            _, table = self.execute(explain_sql, fetch=True)
+        except DbtDatabaseError as exc:
+            logger.debug(f"Skipping stream plan tracking for {relation}: {exc}")
+            return []
+
+        path = stream_plan.plan_path(self._target_path(), unique_id)
+        previous = stream_plan.load_plan(path)
+        plan = stream_plan.StreamPlan.from_explain_lines(row[0] for row in table)
+        violations = stream_plan.check_plan(plan, previous, thresholds or {})
+
+        if not violations or accept:
+            stream_plan.save_plan(path, str(relation), plan)
+
+        changes = stream_plan.operator_changes(plan, previous)
+        if violations and changes:
+            violations.append("operator changes: " + ", ".join(changes))
+        return violations
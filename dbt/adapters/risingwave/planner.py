@@ -0,0 +1,338 @@
+"""Dry-run rebuild planning for dbt-risingwave materializations.
+
+The planner mirrors the branch each materialization takes (`full_refresh_mode`,
+`zero_downtime_mode`, `replace_mode` and `configuration_changes`) against a
+single catalog snapshot, so a deploy can be reviewed before anything runs.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+# Materializations that backfill their upstream relations when (re)created.
+BACKFILLING_MATERIALIZATIONS = frozenset(
+    {"materialized_view", "materializedview", "table", "incremental", "sink"}
+)
+
+# Materializations that support the swap-based zero-downtime path.
+ZERO_DOWNTIME_MATERIALIZATIONS = frozenset({"materialized_view", "view", "table"})
+
+# Materializations that compare index configuration on existing relations.
+INDEX_CHANGE_MATERIALIZATIONS = frozenset(
+    {"materialized_view", "materializedview", "table_with_connector"}
+)
+
+PLANNED_RESOURCE_TYPES = frozenset({"model", "snapshot", "seed"})
+
+# Uncompiled sink bodies that render to a single relation, once `config()` calls are removed.
+_CONFIG_CALL = re.compile(r"\{\{\s*config\s*\(.*?\)\s*\}\}", re.DOTALL)
+_SINGLE_RELATION_CODE = re.compile(r"^\{\{\s*(?:ref|source)\s*\([^{}]*\)\s*\}\}$")
+
+RelationKey = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class CatalogRelation:
+    schema: str
+    name: str
+    relation_type: str
+    parent_name: Optional[str] = None
+    row_count: Optional[int] = None
+
+
+@dataclass
+class CatalogSnapshot:
+    relations: Dict[RelationKey, CatalogRelation] = field(default_factory=dict)
+    indexes: Dict[RelationKey, Set[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Any]) -> "CatalogSnapshot":
+        """Build a snapshot from `risingwave__get_rebuild_plan_snapshot` rows.
+
+        Each row is `(schema_name, relation_name, relation_type, parent_name, row_count)`.
+        """
+        snapshot = cls()
+        for schema_name, relation_name, relation_type, parent_name, row_count in rows:
+            relation = CatalogRelation(
+                schema=schema_name,
+                name=relation_name,
+                relation_type=relation_type,
+                parent_name=parent_name,
+                row_count=None if row_count is None else int(row_count),
+            )
+            if relation_type == "index" and parent_name is not None:
+                snapshot.indexes.setdefault((schema_name, parent_name), set()).add(relation_name)
+            else:
+                snapshot.relations[(schema_name, relation_name)] = relation
+        return snapshot
+
+    def get(self, key: RelationKey) -> Optional[CatalogRelation]:
+        return self.relations.get(key)
+
+    def row_count(self, key: RelationKey) -> Optional[int]:
+        relation = self.relations.get(key)
+        return None if relation is None else relation.row_count
+
+    def with_row_counts(self, counts: Iterable[Any]) -> "CatalogSnapshot":
+        """Fill missing row counts from `(schema_name, relation_name, row_count)` rows."""
+        for schema_name, relation_name, row_count in counts:
+            key = (schema_name, relation_name)
+            relation = self.relations.get(key)
+            if relation is not None and relation.row_count is None and row_count is not None:
+                self.relations[key] = CatalogRelation(
+                    schema=relation.schema,
+                    name=relation.name,
+                    relation_type=relation.relation_type,
+                    parent_name=relation.parent_name,
+                    row_count=int(row_count),
+                )
+        return self
+
+
+@dataclass
+class PlannedModel:
+    unique_id: str
+    name: str
+    relation: str
+    materialized: str
+    action: str
+    reason: str
+    backfill_rows: Optional[int] = None
+    unknown_upstreams: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "unique_id": self.unique_id,
+            "name": self.name,
+            "relation": self.relation,
+            "materialized": self.materialized,
+            "action": self.action,
+            "reason": self.reason,
+            "backfill_rows": self.backfill_rows,
+            "unknown_upstreams": list(self.unknown_upstreams),
+        }
+
+
+def relation_key(node: Mapping[str, Any]) -> RelationKey:
+    identifier = node.get("alias") or node.get("identifier") or node.get("name") or ""
+    return node.get("schema") or "", identifier
+
+
+def get_index_name(identifier: str, columns: Iterable[str]) -> str:
+    # Keep in sync with `risingwave__get_index_name`.
+    return "__dbt_index_{}_{}".format(identifier, "_".join(columns))
+
+
+def select_nodes(
+    nodes: Mapping[str, Mapping[str, Any]], select: Optional[Iterable[str]] = None
+) -> List[Mapping[str, Any]]:
+    """Return plannable nodes matching `select`.
+
+    `select` entries are node names, unique IDs or `tag:<tag>` selectors. When
+    no selector is given every model, seed and snapshot in the graph is planned.
+    """
+    if isinstance(select, str):
+        select = select.split()
+    selectors = list(select or [])
+
+    selected = []
+    for node in nodes.values():
+        if node.get("resource_type") not in PLANNED_RESOURCE_TYPES:
+            continue
+        if _config(node).get("materialized") == "ephemeral":
+            continue
+        if selectors and not any(_matches(node, selector) for selector in selectors):
+            continue
+        selected.append(node)
+    return selected
+
+
+def snapshot_schemas(
+    selected: Iterable[Mapping[str, Any]],
+    nodes: Mapping[str, Mapping[str, Any]],
+    sources: Mapping[str, Mapping[str, Any]],
+) -> List[str]:
+    """Return every schema needed to plan `selected`, including upstream schemas."""
+    schemas = set()
+    for node in selected:
+        schemas.add(node.get("schema"))
+        for upstream in upstream_nodes(node, nodes, sources):
+            schemas.add(upstream.get("schema"))
+    return sorted(schema for schema in schemas if schema)
+
+
+def relations_missing_row_counts(
+    selected: Iterable[Mapping[str, Any]],
+    nodes: Mapping[str, Mapping[str, Any]],
+    sources: Mapping[str, Mapping[str, Any]],
+    snapshot: CatalogSnapshot,
+) -> List[RelationKey]:
+    """Return existing upstream tables and MVs whose catalog stats are missing."""
+    missing = set()
+    for node in selected:
+        for upstream in upstream_nodes(node, nodes, sources):
+            key = relation_key(upstream)
+            relation = snapshot.get(key)
+            if (
+                relation is not None
+                and relation.row_count is None
+                and relation.relation_type in ("table", "materialized view")
+            ):
+                missing.add(key)
+    return sorted(missing)
+
+
+def plan_rebuilds(
+    nodes: Mapping[str, Mapping[str, Any]],
+    sources: Mapping[str, Mapping[str, Any]],
+    snapshot: CatalogSnapshot,
+    select: Optional[Iterable[str]] = None,
+    full_refresh: bool = False,
+    zero_downtime: bool = False,
+) -> List[PlannedModel]:
+    """Plan the action for every selected node, sorted by expected backfill volume."""
+    plan = [
+        plan_node(node, nodes, sources, snapshot, full_refresh, zero_downtime)
+        for node in select_nodes(nodes, select)
+    ]
+    return sorted(plan, key=lambda item: (-(item.backfill_rows or 0), item.unique_id))
+
+
+def plan_node(
+    node: Mapping[str, Any],
+    nodes: Mapping[str, Mapping[str, Any]],
+    sources: Mapping[str, Mapping[str, Any]],
+    snapshot: CatalogSnapshot,
+    full_refresh: bool = False,
+    zero_downtime: bool = False,
+) -> PlannedModel:
+    config = _config(node)
+    materialized = config.get("materialized") or node.get("resource_type") or ""
+    key = relation_key(node)
+    existing = snapshot.get(key)
+
+    node_full_refresh = config.get("full_refresh")
+    full_refresh_mode = full_refresh if node_full_refresh is None else bool(node_full_refresh)
+    zero_downtime_config = config.get("zero_downtime") or {}
+    zero_downtime_mode = bool(zero_downtime_config.get("enabled", False)) and zero_downtime
+
+    action, reason = _choose_action(
+        node, materialized, config, key, existing, snapshot, full_refresh_mode, zero_downtime_mode
+    )
+
+    planned = PlannedModel(
+        unique_id=node.get("unique_id", ""),
+        name=node.get("name", ""),
+        relation="{}.{}".format(*key),
+        materialized=materialized,
+        action=action,
+        reason=reason,
+    )
+
+    if action == "apply_indexes":
+        planned.backfill_rows = snapshot.row_count(key)
+        if planned.backfill_rows is None:
+            planned.unknown_upstreams.append(planned.relation)
+    elif action in ("create", "rebuild", "swap", "incremental") and (
+        materialized in BACKFILLING_MATERIALIZATIONS
+    ):
+        planned.backfill_rows, planned.unknown_upstreams = _upstream_rows(
+            node, nodes, sources, snapshot
+        )
+    else:
+        planned.backfill_rows = 0
+    return planned
+
+
+def _choose_action(
+    node, materialized, config, key, existing, snapshot, full_refresh_mode, zero_downtime_mode
+) -> Tuple[str, str]:
+    if existing is None:
+        return "create", "relation does not exist"
+    if full_refresh_mode:
+        return "rebuild", "full refresh drops and recreates the relation"
+
+    if materialized in ZERO_DOWNTIME_MATERIALIZATIONS and zero_downtime_mode:
+        return "swap", "zero-downtime rebuild creates a temporary relation and swaps it in"
+    if materialized == "sink":
+        if not zero_downtime_mode:
+            return "no-op", "existing sink is left unchanged"
+        if not config.get("connector"):
+            return "fail", "zero-downtime sink replacement requires `connector`"
+        if not _reads_single_relation(node):
+            return "rebuild", "sink query is staged as a new materialized view for REPLACE SINK"
+        return "replace", "REPLACE SINK cut-over without historical backfill"
+    if materialized == "incremental":
+        return "incremental", "incremental run builds a temporary table from the model SQL"
+    if materialized in INDEX_CHANGE_MATERIALIZATIONS:
+        expected = {
+            get_index_name(key[1], index.get("columns", []))
+            for index in (config.get("indexes") or [])
+        }
+        if expected != snapshot.indexes.get(key, set()):
+            on_configuration_change = config.get("on_configuration_change") or "continue"
+            if on_configuration_change == "apply":
+                return "apply_indexes", "index configuration changed"
+            if on_configuration_change == "fail":
+                return "fail", "index configuration changed and on_configuration_change=fail"
+            return "no-op", "index configuration changed but on_configuration_change=continue"
+    return "no-op", "relation exists and no rebuild is required"
+
+
+def _upstream_rows(node, nodes, sources, snapshot) -> Tuple[Optional[int], List[str]]:
+    total = 0
+    unknown = []
+    for upstream in upstream_nodes(node, nodes, sources):
+        key = relation_key(upstream)
+        rows = snapshot.row_count(key)
+        if rows is None:
+            unknown.append("{}.{}".format(*key))
+        else:
+            total += rows
+    return total, unknown
+
+
+def upstream_nodes(
+    node: Mapping[str, Any],
+    nodes: Mapping[str, Mapping[str, Any]],
+    sources: Mapping[str, Mapping[str, Any]],
+    seen: Optional[Set[str]] = None,
+) -> List[Mapping[str, Any]]:
+    """Resolve direct upstream relations, looking through ephemeral models."""
+    seen = set() if seen is None else seen
+    upstream = []
+    for unique_id in (node.get("depends_on") or {}).get("nodes", []):
+        if unique_id in seen:
+            continue
+        seen.add(unique_id)
+        parent = nodes.get(unique_id) or sources.get(unique_id)
+        if parent is None:
+            continue
+        if _config(parent).get("materialized") == "ephemeral":
+            upstream.extend(upstream_nodes(parent, nodes, sources, seen))
+        elif parent.get("resource_type") in ("model", "seed", "snapshot", "source"):
+            upstream.append(parent)
+    return upstream
+
+
+def _reads_single_relation(node: Mapping[str, Any]) -> bool:
+    """Whether the model SQL is a single relation that REPLACE SINK can read FROM.
+
+    Keep in sync with `risingwave__replace_sink_from_relation`; any other body is
+    staged as a materialized view, which backfills.
+    """
+    compiled = node.get("compiled_code")
+    if compiled:
+        return len(compiled.split()) == 1
+    code = _CONFIG_CALL.sub("", node.get("raw_code") or "").strip()
+    return bool(_SINGLE_RELATION_CODE.match(code))
+
+
+def _matches(node: Mapping[str, Any], selector: str) -> bool:
+    if selector.startswith("tag:"):
+        return selector[len("tag:") :] in (node.get("tags") or [])
+    return selector in (node.get("name"), node.get("unique_id"))
+
+
+def _config(node: Mapping[str, Any]) -> Mapping[str, Any]:
+    return node.get("config") or {}
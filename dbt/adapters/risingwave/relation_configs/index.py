@@ -1,46 +1,49 @@
 from dataclasses import dataclass, field
-from typing import Set
+from functools import cached_property
+from typing import Any, ClassVar, Iterable, Mapping, Optional, Tuple
 
 import agate
 from dbt.adapters.relation_configs import (
     RelationConfigBase,
-    RelationConfigValidationMixin,
-    RelationConfigValidationRule,
     RelationConfigChangeAction,
 )
-from dbt_common.exceptions import DbtRuntimeError
 
 from dbt.adapters.postgres.relation_configs.index import PostgresIndexConfigChange
+from dbt.adapters.risingwave.relation_configs.validation import (
+    LazyValidationMixin,
+    ValidationCheck,
+)
 
 
-@dataclass(frozen=True, eq=True, unsafe_hash=True)
-class RisingWaveIndexConfig(RelationConfigBase, RelationConfigValidationMixin):
+@dataclass(frozen=True, eq=True)
+class RisingWaveIndexConfig(RelationConfigBase, LazyValidationMixin):
     """
     This config is an adaptation of the PostgresIndexConfig for RisingWave.
     """
 
-    name: str = field(default="", hash=False, compare=False)
+    name: Optional[str] = field(default="", hash=False, compare=False)
     column_names: tuple[str, ...] = field(default_factory=tuple, hash=True)
     include_columns: tuple[str, ...] = field(default_factory=tuple, hash=True)
     distributed_by_columns: tuple[str, ...] = field(default_factory=tuple, hash=True)
 
-    @property
-    def validation_rules(self) -> Set[RelationConfigValidationRule]:
-        return {
-            RelationConfigValidationRule(
-                validation_check=self.column_names is not None
-                and len(self.column_names) > 0,
-                validation_error=DbtRuntimeError(
-                    "Indexes require at least one column, but none were provided"
-                ),
-            ),
-            RelationConfigValidationRule(
-                validation_check=len(self.column_names) == len(set(self.column_names)),
-                validation_error=DbtRuntimeError(
-                    "Indexes require unique column names, but some are duplicated."
-                ),
-            ),
-        }
+    validation_checks: ClassVar[Tuple[ValidationCheck["RisingWaveIndexConfig"], ...]] = (
+        (
+            lambda index: index.column_names is not None and len(index.column_names) > 0,
+            "Indexes require at least one column, but none were provided",
+        ),
+        (
+            lambda index: len(index.column_names) == len(set(index.column_names)),
+            "Indexes require unique column names, but some are duplicated.",
+        ),
+    )
+
+    # Index configs are compared as sets for every materialized view on every run.
+    @cached_property
+    def _hash(self) -> int:
+        return hash((self.column_names, self.include_columns, self.distributed_by_columns))
+
+    def __hash__(self) -> int:
+        return self._hash
 
     @classmethod
     def from_dict(cls, config_dict) -> "RisingWaveIndexConfig":
@@ -68,6 +71,41 @@ class RisingWaveIndexConfig(RelationConfigBase, RelationConfigValidationMixin):
         }
         return config_dict
 
+    @classmethod
+    def from_model_node_entries(
+        cls, model_node_entries: Iterable[Mapping[str, Any]]
+    ) -> Tuple["RisingWaveIndexConfig", ...]:
+        """Build index configs from `indexes` model config entries in one pass."""
+        return tuple(
+            cls(
+                name=entry.get("name"),
+                column_names=_lower(entry.get("columns", [])),
+                include_columns=_lower(entry.get("include", [])),
+                distributed_by_columns=_lower(entry.get("distributed_by", [])),
+            )
+            for entry in model_node_entries
+        )
+
+    @classmethod
+    def from_relation_results_table(
+        cls, relation_results_table: agate.Table
+    ) -> Tuple["RisingWaveIndexConfig", ...]:
+        """Build index configs from every row of a `get_show_indexes_sql` result in one pass."""
+        column_names = list(relation_results_table.column_names)
+        name_index = column_names.index("name") if "name" in column_names else None
+        columns_index = (
+            column_names.index("column_names") if "column_names" in column_names else None
+        )
+        return tuple(
+            cls(
+                name=row[name_index] if name_index is not None else None,
+                column_names=_lower(
+                    ((row[columns_index] if columns_index is not None else None) or "").split(",")
+                ),
+            )
+            for row in relation_results_table.rows
+        )
+
     @classmethod
     def parse_relation_results(cls, relation_results_entry: agate.Row) -> dict:
         config_dict = {
@@ -89,35 +127,30 @@ class RisingWaveIndexConfig(RelationConfigBase, RelationConfigValidationMixin):
 
 
 @dataclass(frozen=True, eq=True, unsafe_hash=True)
-class RisingWaveIndexConfigChange(PostgresIndexConfigChange):
-    context: RisingWaveIndexConfig
+class RisingWaveIndexConfigChange(LazyValidationMixin, PostgresIndexConfigChange):
+    context: RisingWaveIndexConfig  # type: ignore[assignment]
 
-    @property
-    def validation_rules(self) -> Set[RelationConfigValidationRule]:
-        return {
-            RelationConfigValidationRule(
-                validation_check=self.action
-                in {RelationConfigChangeAction.create, RelationConfigChangeAction.drop},
-                validation_error=DbtRuntimeError(
-                    "Invalid operation, only `drop` and `create` changes are supported for indexes."
-                ),
-            ),
-            RelationConfigValidationRule(
-                validation_check=not (
-                    self.action == RelationConfigChangeAction.drop
-                    and self.context.name is None
-                ),
-                validation_error=DbtRuntimeError(
-                    "Invalid operation, attempting to drop an index with no name."
-                ),
+    validation_checks: ClassVar[Tuple[ValidationCheck["RisingWaveIndexConfigChange"], ...]] = (
+        (
+            lambda change: change.action
+            in {RelationConfigChangeAction.create, RelationConfigChangeAction.drop},
+            "Invalid operation, only `drop` and `create` changes are supported for indexes.",
+        ),
+        (
+            lambda change: not (
+                change.action == RelationConfigChangeAction.drop and change.context.name is None
             ),
-            RelationConfigValidationRule(
-                validation_check=not (
-                    self.action == RelationConfigChangeAction.create
-                    and self.context.column_names == list()
-                ),
-                validation_error=DbtRuntimeError(
-                    "Invalid operations, attempting to create an index with no columns."
-                ),
+            "Invalid operation, attempting to drop an index with no name.",
+        ),
+        (
+            lambda change: not (
+                change.action == RelationConfigChangeAction.create
+                and change.context.column_names == list()
             ),
-        }
+            "Invalid operations, attempting to create an index with no columns.",
+        ),
+    )
+
+
+def _lower(columns: Iterable[str]) -> tuple[str, ...]:
+    return tuple(column.lower() for column in columns)
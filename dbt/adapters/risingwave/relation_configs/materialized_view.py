@@ -1,21 +1,22 @@
 from dataclasses import dataclass, field
-from typing import Any, Set, List, Dict
+from typing import Any, ClassVar, List, Dict, Tuple
 from typing_extensions import Self
 
 import agate
 from dbt.adapters.contracts.relation import RelationConfig
 from dbt.adapters.relation_configs import (
     RelationConfigBase,
-    RelationConfigValidationMixin,
-    RelationConfigValidationRule,
     RelationResults,
 )
-from dbt_common.exceptions import DbtRuntimeError
 
 from dbt.adapters.risingwave.relation_configs.index import (
     RisingWaveIndexConfig,
     RisingWaveIndexConfigChange,
 )
+from dbt.adapters.risingwave.relation_configs.validation import (
+    LazyValidationMixin,
+    ValidationCheck,
+)
 
 from dbt.adapters.postgres.relation_configs.constants import (
     MAX_CHARACTERS_IN_IDENTIFIER,
@@ -26,9 +27,7 @@ from dbt.adapters.postgres.relation_configs.materialized_view import (
 
 
 @dataclass(frozen=True, eq=True, unsafe_hash=True)
-class RisingWaveMaterializedViewConfig(
-    RelationConfigBase, RelationConfigValidationMixin
-):
+class RisingWaveMaterializedViewConfig(RelationConfigBase, LazyValidationMixin):
     """
     This config is an adaptation of the PostgresMaterializedViewConfig for RisingWave.
     """
@@ -37,19 +36,17 @@ class RisingWaveMaterializedViewConfig(
     query: str = ""
     indexes: List[RisingWaveIndexConfig] = field(default_factory=list)
 
-    @property
-    def validation_rules(self) -> Set[RelationConfigValidationRule]:
-        # index rules get run by default with the mixin
-        return {
-            RelationConfigValidationRule(
-                validation_check=self.table_name is None
-                or len(self.table_name) <= MAX_CHARACTERS_IN_IDENTIFIER,
-                validation_error=DbtRuntimeError(
-                    f"The materialized view name is more than {MAX_CHARACTERS_IN_IDENTIFIER} "
-                    f"characters: {self.table_name}"
-                ),
-            ),
-        }
+    # index rules get run by default with the mixin
+    validation_checks: ClassVar[
+        Tuple[ValidationCheck["RisingWaveMaterializedViewConfig"], ...]
+    ] = (
+        (
+            lambda materialized_view: materialized_view.table_name is None
+            or len(materialized_view.table_name) <= MAX_CHARACTERS_IN_IDENTIFIER,
+            f"The materialized view name is more than {MAX_CHARACTERS_IN_IDENTIFIER} "
+            "characters: {config.table_name}",
+        ),
+    )
 
     @classmethod
     def from_dict(cls, config_dict: dict) -> Self:
@@ -66,9 +63,12 @@ class RisingWaveMaterializedViewConfig(
 
     @classmethod
     def from_config(cls, relation_config: RelationConfig) -> Self:
-        materialized_view_config = cls.parse_config(relation_config)
-        materialized_view = cls.from_dict(materialized_view_config)
-        return materialized_view
+        indexes: List[Dict[Any, Any]] = relation_config.config.get("indexes", [])  # type: ignore
+        return cls(
+            table_name=relation_config.identifier or "",
+            query=getattr(relation_config, "compiled_code", None) or "",
+            indexes=list(RisingWaveIndexConfig.from_model_node_entries(indexes)),
+        )
 
     @classmethod
     def parse_config(cls, relation_config: RelationConfig) -> Dict:
@@ -84,9 +84,12 @@ class RisingWaveMaterializedViewConfig(
 
     @classmethod
     def from_relation_results(cls, relation_results: RelationResults) -> Self:
-        materialized_view_config = cls.parse_relation_results(relation_results)
-        materialized_view = cls.from_dict(materialized_view_config)
-        return materialized_view
+        # Building an empty `agate.Table` as a `.get` default costs more than the whole
+        # parse, so only convert when indexes were actually fetched.
+        indexes = relation_results.get("indexes")
+        if indexes is None:
+            return cls()
+        return cls(indexes=list(RisingWaveIndexConfig.from_relation_results_table(indexes)))
 
     @classmethod
     def parse_relation_results(cls, relation_results: RelationResults) -> dict:
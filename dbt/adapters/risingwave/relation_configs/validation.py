@@ -0,0 +1,42 @@
+from typing import Any, Callable, ClassVar, Set, Tuple, TypeVar
+
+from dbt.adapters.relation_configs import (
+    RelationConfigValidationMixin,
+    RelationConfigValidationRule,
+)
+from dbt_common.exceptions import DbtRuntimeError
+
+ConfigT = TypeVar("ConfigT")
+
+# `(check, message)`: `check` receives the config object being validated.
+ValidationCheck = Tuple[Callable[[ConfigT], bool], str]
+
+
+class LazyValidationMixin(RelationConfigValidationMixin):
+    """
+    Run validation checks without building a `DbtRuntimeError` per rule.
+
+    `DbtRuntimeError.__init__` scrubs secrets from the environment on every call, so
+    eagerly building `validation_rules` for each config object dominates parsing large
+    projects. Subclasses declare `validation_checks` as `(check, message)` pairs; an
+    error is only created for the first check that fails. `message` is formatted with
+    `config=self`.
+    """
+
+    validation_checks: ClassVar[Tuple[ValidationCheck[Any], ...]] = ()
+
+    @property
+    def validation_rules(self) -> Set[RelationConfigValidationRule]:
+        return {
+            RelationConfigValidationRule(
+                validation_check=check(self),
+                validation_error=DbtRuntimeError(message.format(config=self)),
+            )
+            for check, message in self.validation_checks
+        }
+
+    def run_validation_rules(self):
+        for check, message in self.validation_checks:
+            if not check(self):
+                raise DbtRuntimeError(message.format(config=self))
+        self.run_child_validation_rules()
@@ -0,0 +1,314 @@
+"""SCD2 snapshots derived from a subscription on the snapshot query.
+
+The `changelog` snapshot strategy keeps the snapshot query as a materialized view
+with a subscription. Each snapshot run reads only the changes committed since the
+previous run from a subscription cursor and turns them into SCD2 rows: an insert
+or update closes the current version of its key and opens a new one, and a delete
+closes the current version when hard deletes are invalidated.
+
+The position of the last applied change is stored as the comment of the changelog
+materialized view, so it travels with the snapshot data instead of the dbt target
+directory. A first
+run stores it once the initial snapshot is complete; later runs store it after
+every batch. The comment also holds a fingerprint of the snapshot query, so a
+changed query rebuilds the changelog instead of streaming the old one.
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from dbt.adapters.risingwave.subscription import (
+    CursorPosition,
+    declare_cursor_sql,
+    fetch_batches,
+    row_timestamp,
+)
+
+POSITION_PREFIX = "dbt_changelog_position="
+FINGERPRINT_PREFIX = "dbt_changelog_sql="
+_POSITION_PATTERN = re.compile(
+    r"^{}(\d+):(\d+)(?: {}(\w+))?$".format(
+        re.escape(POSITION_PREFIX), re.escape(FINGERPRINT_PREFIX)
+    )
+)
+
+OPENING_OPS = frozenset({"Insert", "UpdateInsert"})
+DELETE_OP = "Delete"
+HARD_DELETE_BEHAVIORS = frozenset({"ignore", "invalidate"})
+
+# Commit time of the latest checkpoint, used as the position of a first run that
+# sees no changes after the snapshot.
+COMMITTED_TIMESTAMP_SQL = (
+    "select (max(max_committed_epoch) >> 16) + 1617235200000 as rw_timestamp "
+    "from rw_catalog.rw_hummock_current_version"
+)
+
+Key = Tuple[Any, ...]
+
+
+@dataclass
+class SnapshotVersion:
+    key: Key
+    values: List[Any]
+    valid_from: int
+    valid_to: Optional[int] = None
+
+
+@dataclass
+class SnapshotBatch:
+    # Current versions already in the snapshot table, closed at the given timestamp.
+    closes: Dict[Key, int] = field(default_factory=dict)
+    inserts: List[SnapshotVersion] = field(default_factory=list)
+
+
+def parse_position(comment: Optional[str]) -> Optional[CursorPosition]:
+    match = _POSITION_PATTERN.match((comment or "").strip())
+    return None if match is None else CursorPosition(int(match.group(1)), int(match.group(2)))
+
+
+def parse_fingerprint(comment: Optional[str]) -> Optional[str]:
+    match = _POSITION_PATTERN.match((comment or "").strip())
+    return None if match is None else match.group(3)
+
+
+def format_position(position: CursorPosition, fingerprint: Optional[str] = None) -> str:
+    comment = "{}{}:{}".format(POSITION_PREFIX, position.rw_timestamp, position.rows)
+    if fingerprint is not None:
+        comment += " {}{}".format(FINGERPRINT_PREFIX, fingerprint)
+    return comment
+
+
+def retention_cutoff_sql(retention: str) -> str:
+    """Oldest `rw_timestamp` a subscription with `retention` still holds changes for.
+
+    The retention is parsed by RisingWave, like the subscription's own option.
+    """
+    return (
+        "select (extract(epoch from now() - interval {}) * 1000)::bigint as rw_timestamp"
+    ).format(render_literal(str(retention)))
+
+
+def plan_batch(
+    rows: Iterable[Any],
+    key_columns: Sequence[str],
+    value_columns: Sequence[str],
+    hard_deletes: str = "ignore",
+    default_timestamp: int = 0,
+) -> SnapshotBatch:
+    """Turn one batch of cursor rows into closed and inserted versions.
+
+    Rows without `rw_timestamp`, such as the initial snapshot of a `full` cursor,
+    are stamped with `default_timestamp`, and earlier timestamps are raised to it so
+    versions never start before the snapshot they follow. A version opened and
+    closed within the batch is inserted with its `valid_to` already set.
+    """
+    batch = SnapshotBatch()
+    opened: Dict[Key, SnapshotVersion] = {}
+
+    def close(key, timestamp):
+        version = opened.pop(key, None)
+        if version is not None:
+            version.valid_to = timestamp
+        elif key not in batch.closes:
+            batch.closes[key] = timestamp
+
+    for row in rows:
+        op = row["op"]
+        timestamp = row_timestamp(row)
+        timestamp = default_timestamp if timestamp is None else max(timestamp, default_timestamp)
+        key = tuple(row[column] for column in key_columns)
+        if op in OPENING_OPS:
+            close(key, timestamp)
+            version = SnapshotVersion(key, [row[column] for column in value_columns], timestamp)
+            batch.inserts.append(version)
+            opened[key] = version
+        elif op == DELETE_OP and hard_deletes == "invalidate":
+            close(key, timestamp)
+    return batch
+
+
+def render_literal(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, (list, tuple)):
+        # `ARRAY[]` has no element type; the untyped `'{}'` is cast by the target column.
+        if not value:
+            return "'{}'"
+        return "ARRAY[{}]".format(", ".join(render_literal(item) for item in value))
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float, Decimal)):
+        return str(value)
+    if isinstance(value, (datetime, date, time)):
+        value = value.isoformat(sep=" ") if isinstance(value, datetime) else value.isoformat()
+    return "'{}'".format(str(value).replace("'", "''"))
+
+
+def render_timestamp(timestamp: int) -> str:
+    moment = datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc).replace(tzinfo=None)
+    return "'{}'::timestamp".format(moment.isoformat(sep=" ", timespec="milliseconds"))
+
+
+def scd_id(key: Key, valid_from: int) -> str:
+    parts = ["" if part is None else str(part) for part in key] + [str(valid_from)]
+    return hashlib.md5("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def close_versions_sql(
+    target: str,
+    quote: Callable[[str], str],
+    key_columns: Sequence[str],
+    valid_to_column: str,
+    closes: Mapping[Key, int],
+) -> str:
+    conditions = [
+        " and ".join(
+            "{} = {}".format(quote(column), render_literal(part))
+            for column, part in zip(key_columns, key)
+        )
+        for key in closes
+    ]
+    cases = "\n".join(
+        "    when {} then {}".format(condition, render_timestamp(timestamp))
+        for condition, timestamp in zip(conditions, closes.values())
+    )
+    return (
+        "update {target}\n"
+        "set {valid_to} = case\n{cases}\n  end\n"
+        "where {valid_to} is null\n"
+        "  and (\n    {keys}\n  )"
+    ).format(
+        target=target,
+        valid_to=quote(valid_to_column),
+        cases=cases,
+        keys="\n    or ".join("({})".format(condition) for condition in conditions),
+    )
+
+
+def close_current_versions_sql(
+    target: str, quote: Callable[[str], str], valid_to_column: str, timestamp: int
+) -> str:
+    return "update {target}\nset {valid_to} = {timestamp}\nwhere {valid_to} is null".format(
+        target=target, valid_to=quote(valid_to_column), timestamp=render_timestamp(timestamp)
+    )
+
+
+def render_value(value: Any, array_type: Optional[str] = None) -> str:
+    """Render a fetched value, casting arrays to their column type.
+
+    dbt result tables carry arrays as JSON text, which is decoded before rendering.
+    """
+    if array_type is None or value is None:
+        return render_literal(value)
+    if isinstance(value, str):
+        value = json.loads(value)
+    return "{}::{}".format(render_literal(value), array_type)
+
+
+def insert_versions_sql(
+    target: str,
+    quote: Callable[[str], str],
+    value_columns: Sequence[str],
+    meta_columns: Mapping[str, str],
+    versions: Sequence[SnapshotVersion],
+    array_types: Optional[Mapping[str, str]] = None,
+) -> str:
+    value_types = [(array_types or {}).get(column) for column in value_columns]
+    columns = list(value_columns) + [
+        meta_columns["dbt_scd_id"],
+        meta_columns["dbt_updated_at"],
+        meta_columns["dbt_valid_from"],
+        meta_columns["dbt_valid_to"],
+    ]
+    rows = [
+        "({})".format(
+            ", ".join(
+                [
+                    render_value(value, array_type)
+                    for value, array_type in zip(version.values, value_types)
+                ]
+                + [
+                    render_literal(scd_id(version.key, version.valid_from)),
+                    render_timestamp(version.valid_from),
+                    render_timestamp(version.valid_from),
+                    "null" if version.valid_to is None else render_timestamp(version.valid_to),
+                ]
+            )
+        )
+        for version in versions
+    ]
+    return "insert into {} ({})\nvalues\n  {}".format(
+        target, ", ".join(quote(column) for column in columns), ",\n  ".join(rows)
+    )
+
+
+def apply_changes(
+    execute: Callable[[str], Any],
+    save_position: Callable[[CursorPosition], None],
+    target: str,
+    subscription: str,
+    cursor: str,
+    quote: Callable[[str], str],
+    key_columns: Sequence[str],
+    value_columns: Sequence[str],
+    meta_columns: Mapping[str, str],
+    position: Optional[CursorPosition] = None,
+    hard_deletes: str = "ignore",
+    batch_size: int = 1000,
+    array_types: Optional[Mapping[str, str]] = None,
+    close_current: bool = False,
+) -> int:
+    """Apply every change after `position` to the snapshot table.
+
+    Without a position the cursor starts with a full snapshot of the subscribed
+    relation; `close_current` first closes every current version of an existing
+    snapshot table at the time of that snapshot. `array_types` maps array value
+    columns to their data type. Returns the number of changes applied.
+    """
+    first_run = position is None
+    unseen = (lambda row: True) if position is None else position.unseen()
+    execute(declare_cursor_sql(cursor, subscription, position))
+    try:
+        if position is None:
+            # Read after the cursor is declared: every change up to this checkpoint
+            # is visible to the cursor, so it is a safe position for an idle source.
+            committed = execute(COMMITTED_TIMESTAMP_SQL)
+            position = CursorPosition(int(committed.rows[0][0]))
+            if close_current:
+                execute(
+                    close_current_versions_sql(
+                        target, quote, meta_columns["dbt_valid_to"], position.rw_timestamp
+                    )
+                )
+        default_timestamp = position.rw_timestamp
+
+        applied = 0
+        for table in fetch_batches(execute, cursor, batch_size):
+            rows = [row for row in table if unseen(row)]
+            batch = plan_batch(rows, key_columns, value_columns, hard_deletes, default_timestamp)
+            if batch.closes:
+                execute(
+                    close_versions_sql(
+                        target, quote, key_columns, meta_columns["dbt_valid_to"], batch.closes
+                    )
+                )
+            if batch.inserts:
+                execute(
+                    insert_versions_sql(
+                        target, quote, value_columns, meta_columns, batch.inserts, array_types
+                    )
+                )
+            position.advance_past(rows)
+            applied += len(rows)
+            if not first_run:
+                save_position(position)
+        if first_run:
+            save_position(position)
+        return applied
+    finally:
+        execute("close {}".format(cursor))
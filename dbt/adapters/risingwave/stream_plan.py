@@ -0,0 +1,152 @@
+"""Stream plan capture and regression tracking for materialized views.
+
+`EXPLAIN (DISTSQL) CREATE MATERIALIZED VIEW ...` prints one `Fragment <id>` block
+per streaming fragment and one `Table <id>` block per state table. The summary of
+that output is stored under the dbt target directory so the next run can report
+plans that grew.
+"""
+
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+PLAN_DIRECTORY = Path("risingwave") / "stream_plans"
+
+_FRAGMENT_PATTERN = re.compile(r"^Fragment \d+\s*$")
+_STATE_TABLE_PATTERN = re.compile(r"^Table \d+\s*$")
+# Operators start a plan-tree node; `tables: [ StreamScan: 1 ]` lines are not operators.
+_OPERATOR_PATTERN = re.compile(r"^[\s│├└─]*(Stream[A-Z][A-Za-z]*)")
+
+# Plan metrics and the `plan_tracking` keys that bound them.
+METRICS = ("fragments", "exchanges", "state_tables")
+ABSOLUTE_LIMITS = {
+    "fragments": "max_fragments",
+    "exchanges": "max_exchanges",
+    "state_tables": "max_state_tables",
+}
+INCREASE_LIMITS = {
+    "fragments": "max_fragment_increase",
+    "exchanges": "max_exchange_increase",
+    "state_tables": "max_state_table_increase",
+}
+
+
+@dataclass
+class StreamPlan:
+    fragments: int = 0
+    exchanges: int = 0
+    state_tables: int = 0
+    operators: Dict[str, int] = field(default_factory=dict)
+    plan: str = ""
+
+    @classmethod
+    def from_explain_lines(cls, lines: Iterable[str]) -> "StreamPlan":
+        lines = [line.rstrip() for line in lines]
+        operators: Counter = Counter()
+        plan = cls(plan="\n".join(lines))
+        for line in lines:
+            if _FRAGMENT_PATTERN.match(line):
+                plan.fragments += 1
+            elif _STATE_TABLE_PATTERN.match(line):
+                plan.state_tables += 1
+            operator = _OPERATOR_PATTERN.match(line)
+            if operator is None:
+                continue
+            operators[operator.group(1)] += 1
+            if operator.group(1) == "StreamExchange" and "NoShuffle" not in line:
+                # No-shuffle exchanges only forward between co-located actors.
+                plan.exchanges += 1
+        plan.operators = dict(sorted(operators.items()))
+        return plan
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "StreamPlan":
+        return cls(
+            fragments=int(data.get("fragments", 0)),
+            exchanges=int(data.get("exchanges", 0)),
+            state_tables=int(data.get("state_tables", 0)),
+            operators=dict(data.get("operators") or {}),
+            plan=data.get("plan", ""),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fragments": self.fragments,
+            "exchanges": self.exchanges,
+            "state_tables": self.state_tables,
+            "operators": dict(self.operators),
+            "plan": self.plan,
+        }
+
+
+def plan_path(target_path: Path, unique_id: str) -> Path:
+    return Path(target_path) / PLAN_DIRECTORY / "{}.json".format(unique_id)
+
+
+def load_plan(path: Path) -> Optional[StreamPlan]:
+    try:
+        with open(path) as handle:
+            return StreamPlan.from_dict(json.load(handle))
+    except (OSError, ValueError):
+        return None
+
+
+def save_plan(path: Path, relation: str, plan: StreamPlan) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as handle:
+        json.dump({"relation": relation, **plan.to_dict()}, handle, indent=2, sort_keys=True)
+
+
+def check_plan(
+    plan: StreamPlan,
+    previous: Optional[StreamPlan],
+    thresholds: Mapping[str, Any],
+) -> List[str]:
+    """Return one message per threshold the plan exceeds.
+
+    Absolute limits (`max_fragments`, ...) apply on every run. Increase limits
+    (`max_fragment_increase`, ...) default to 0 and only apply when a previous
+    plan was recorded.
+    """
+    violations = []
+    for metric in METRICS:
+        value = getattr(plan, metric)
+        limit = thresholds.get(ABSOLUTE_LIMITS[metric])
+        if limit is not None and value > int(limit):
+            violations.append(
+                "{} {} exceeds `{}` = {}".format(
+                    value, metric.replace("_", " "), ABSOLUTE_LIMITS[metric], limit
+                )
+            )
+
+        if previous is None:
+            continue
+        increase = value - getattr(previous, metric)
+        allowed = thresholds.get(INCREASE_LIMITS[metric])
+        allowed = 0 if allowed is None else int(allowed)
+        if increase > allowed:
+            violations.append(
+                "{} grew from {} to {} (`{}` = {})".format(
+                    metric.replace("_", " "),
+                    getattr(previous, metric),
+                    value,
+                    INCREASE_LIMITS[metric],
+                    allowed,
+                )
+            )
+    return violations
+
+
+def operator_changes(plan: StreamPlan, previous: Optional[StreamPlan]) -> List[str]:
+    """Describe operators added or removed since the previous plan, e.g. `+1 StreamHashJoin`."""
+    if previous is None:
+        return []
+    changes = []
+    for operator in sorted(set(plan.operators) | set(previous.operators)):
+        delta = plan.operators.get(operator, 0) - previous.operators.get(operator, 0)
+        if delta:
+            changes.append("{:+d} {}".format(delta, operator))
+    return changes
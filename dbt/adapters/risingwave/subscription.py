@@ -0,0 +1,145 @@
+"""Incremental consumption of RisingWave subscriptions through subscription cursors.
+
+`FETCH n FROM <cursor>` returns the subscribed columns plus `op` and `rw_timestamp`,
+the commit time of the change in milliseconds. Every change committed together
+shares one `rw_timestamp`, so the position is stored as that timestamp and the
+number of rows already consumed at it. A resumed cursor starts just before the
+stored timestamp and skips those rows.
+"""
+
+import json
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+POSITION_DIRECTORY = Path("risingwave") / "subscription_cursors"
+
+# `since` clauses used when no position has been stored yet.
+START_CLAUSES = {
+    "full": "full",
+    "begin": "since begin()",
+    "now": "since now()",
+}
+
+
+@dataclass
+class CursorPosition:
+    rw_timestamp: int
+    rows: int = 0
+
+    def advance(self, rw_timestamp: int) -> None:
+        if rw_timestamp == self.rw_timestamp:
+            self.rows += 1
+        elif rw_timestamp > self.rw_timestamp:
+            self.rw_timestamp, self.rows = rw_timestamp, 1
+
+    def advance_past(self, rows: Iterable[Any]) -> None:
+        for row in rows:
+            rw_timestamp = row_timestamp(row)
+            if rw_timestamp is not None:
+                self.advance(rw_timestamp)
+
+    def unseen(self) -> Callable[[Any], bool]:
+        """Return a row filter that drops the changes this position has consumed."""
+        consumed_at, remaining = self.rw_timestamp, self.rows
+
+        def unseen(row) -> bool:
+            nonlocal remaining
+            rw_timestamp = row_timestamp(row)
+            if rw_timestamp is None or rw_timestamp > consumed_at:
+                return True
+            if rw_timestamp == consumed_at and remaining > 0:
+                remaining -= 1
+                return False
+            return rw_timestamp == consumed_at
+
+        return unseen
+
+
+def position_path(target_path: Path, name: str) -> Path:
+    return Path(target_path) / POSITION_DIRECTORY / "{}.json".format(name)
+
+
+def load_position(path: Path) -> Optional[CursorPosition]:
+    try:
+        with open(path) as handle:
+            data = json.load(handle)
+        return CursorPosition(int(data["rw_timestamp"]), int(data.get("rows", 0)))
+    except (OSError, KeyError, TypeError, ValueError):
+        return None
+
+
+def save_position(path: Path, subscription: str, position: CursorPosition) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as handle:
+        json.dump({"subscription": subscription, **asdict(position)}, handle, indent=2)
+
+
+def cursor_name(name: str) -> str:
+    return "dbt_cursor_" + re.sub(r"[^a-z0-9_]", "_", name.lower())
+
+
+def declare_cursor_sql(
+    cursor: str, subscription: str, position: Optional[CursorPosition], start: str = "full"
+) -> str:
+    if position is not None:
+        # Start one millisecond early so the stored timestamp is replayed whether
+        # `since` is inclusive or not; already consumed rows are skipped.
+        since = "since {}".format(position.rw_timestamp - 1)
+    elif start in START_CLAUSES:
+        since = START_CLAUSES[start]
+    else:
+        raise ValueError(
+            "`start` must be one of {}, got {!r}".format(", ".join(START_CLAUSES), start)
+        )
+    return "declare {} subscription cursor for {} {}".format(cursor, subscription, since)
+
+
+def iter_changes(
+    execute: Callable[[str], Any],
+    subscription: str,
+    path: Path,
+    cursor: str,
+    batch_size: int = 1000,
+    start: str = "full",
+) -> Iterator[Any]:
+    """Yield batches of at most `batch_size` changes until the cursor is drained.
+
+    `execute(sql)` returns an agate table. The position advances past a batch once
+    the consumer asks for the next one, so a batch that fails to process is
+    fetched again on the next run.
+    """
+    position = load_position(path)
+    unseen = (lambda row: True) if position is None else position.unseen()
+
+    execute(declare_cursor_sql(cursor, subscription, position, start))
+    try:
+        for table in fetch_batches(execute, cursor, batch_size):
+            batch = table.where(unseen)
+            if len(batch.rows) == 0:
+                continue
+
+            yield batch
+
+            if position is None:
+                position = CursorPosition(0)
+            position.advance_past(batch)
+            if position.rw_timestamp:
+                save_position(path, subscription, position)
+    finally:
+        execute("close {}".format(cursor))
+
+
+def fetch_batches(execute: Callable[[str], Any], cursor: str, batch_size: int) -> Iterator[Any]:
+    """Fetch from a declared cursor until it returns no rows."""
+    while True:
+        table = execute("fetch {} from {}".format(int(batch_size), cursor))
+        if len(table.rows) == 0:
+            return
+        yield table
+
+
+def row_timestamp(row) -> Optional[int]:
+    value = row["rw_timestamp"]
+    return None if value is None else int(value)
@@ -36,40 +36,162 @@
   ]) }}
 {%- endmacro %}
 
-{% macro risingwave__render_sql_header() -%}
+{% macro risingwave__render_sql_header(backfill_settings={}) -%}
   {%- set header_parts = [] -%}
   {%- set user_header = config.get("sql_header", none) -%}
   {%- if user_header is not none -%}
     {%- do header_parts.append(user_header) -%}
   {%- endif -%}
 
+  {%- set session_settings = {} -%}
   {%- set background_ddl = config.get("background_ddl", none) -%}
   {%- if background_ddl is not none -%}
-    {%- do header_parts.append("set background_ddl = " ~ risingwave__render_session_config_value(background_ddl) ~ ";") -%}
+    {%- do session_settings.update({"background_ddl": background_ddl}) -%}
   {%- endif -%}
 
   {%- for setting in risingwave__native_model_session_settings() -%}
     {%- set value = config.get(setting, none) -%}
     {%- if value is not none -%}
-      {%- do header_parts.append("set " ~ setting ~ " = " ~ risingwave__render_session_config_value(value) ~ ";") -%}
+      {%- do session_settings.update({setting: value}) -%}
     {%- endif -%}
   {%- endfor -%}
 
+  {#-- Backfill tuning is computed once by the materialization and passed only to its MV DDL. --#}
+  {%- for setting, value in backfill_settings.items() -%}
+    {%- if config.get(setting, none) is none -%}
+      {%- do session_settings.update({setting: value}) -%}
+    {%- endif -%}
+  {%- endfor -%}
+
+  {%- if execute -%}
+    {#-- `query_mode` and `statement_timeout` for DDL are chosen at execution time. --#}
+    {%- for setting, value in adapter.statement_class_settings("ddl", config).items() -%}
+      {%- do session_settings.setdefault(setting, value) -%}
+    {%- endfor -%}
+    {#-- The connection tracks its session state; only SETs that change it go out with the DDL. --#}
+    {%- for statement in adapter.session_setting_statements(session_settings) -%}
+      {%- do header_parts.append(statement ~ ";") -%}
+    {%- endfor -%}
+  {%- else -%}
+    {%- for setting, value in session_settings.items() -%}
+      {%- do header_parts.append("set " ~ setting ~ " = " ~ risingwave__render_session_config_value(value) ~ ";") -%}
+    {%- endfor -%}
+  {%- endif -%}
+
   {{- header_parts | join("\n") -}}
 {%- endmacro %}
 
+{% macro risingwave__auto_parallelism_enabled() -%}
+  {%- set tuning = config.get("streaming_parallelism_auto", none) -%}
+  {{ return(
+    execute
+    and tuning is mapping
+    and tuning.get("enabled", false)
+    and config.get("materialized") == "materialized_view"
+  ) }}
+{%- endmacro %}
+
+{% macro risingwave__auto_parallelism_settings() -%}
+  {%- if not risingwave__auto_parallelism_enabled() -%}
+    {{ return({}) }}
+  {%- endif -%}
+
+  {%- set row_counts = risingwave__get_relation_row_counts(risingwave__get_upstream_relations()) -%}
+  {{ return(adapter.tune_backfill_settings(
+    model.unique_id, row_counts, config.get("streaming_parallelism_auto")
+  )) }}
+{%- endmacro %}
+
+{% macro risingwave__record_backfill(relation) -%}
+  {%- if not risingwave__auto_parallelism_enabled() -%}
+    {{ return("") }}
+  {%- endif -%}
+
+  {%- set parallelism_sql -%}
+    select max(rw_fragments.parallelism) as parallelism
+    from rw_catalog.rw_fragments
+    join rw_catalog.rw_relations
+      on rw_fragments.table_id = rw_relations.id
+    join rw_catalog.rw_schemas
+      on rw_relations.schema_id = rw_schemas.id
+    where rw_schemas.name = '{{ relation.schema | replace("'", "''") }}'
+      and rw_relations.name = '{{ relation.identifier | replace("'", "''") }}'
+  {%- endset -%}
+  {% do adapter.record_backfill(model.unique_id, relation, run_query(parallelism_sql)) %}
+{%- endmacro %}
+
+{% macro risingwave__get_upstream_relations() -%}
+  {#-- Backfill options cannot reference relations in other databases. --#}
+  {%- set relations = [] -%}
+  {%- for relation in adapter.upstream_relations(graph, model) -%}
+    {%- if relation.database is none or relation.database == model.database -%}
+      {%- do relations.append(relation) -%}
+    {%- endif -%}
+  {%- endfor -%}
+  {{ return(relations) }}
+{%- endmacro %}
+
+{% macro risingwave__get_relation_row_counts(relations) -%}
+  {%- set relation_filters = [] -%}
+  {%- for relation in relations -%}
+    {%- do relation_filters.append(
+      "(rw_schemas.name = '" ~ (relation.schema | replace("'", "''"))
+      ~ "' and rw_relations.name = '" ~ (relation.identifier | replace("'", "''")) ~ "')"
+    ) -%}
+  {%- endfor -%}
+  {%- if relation_filters | length == 0 -%}
+    {{ return([]) }}
+  {%- endif -%}
+
+  {% call statement('get_relation_row_counts', fetch_result=True) -%}
+    select
+      rw_schemas.name as schema_name,
+      rw_relations.name as relation_name,
+      rw_relations.relation_type as relation_type,
+      rw_table_stats.total_key_count as row_count
+    from rw_catalog.rw_relations
+    join rw_catalog.rw_schemas
+      on rw_relations.schema_id = rw_schemas.id
+    left join rw_catalog.rw_table_stats
+      on rw_table_stats.id = rw_relations.id
+    where {{ relation_filters | join(' or ') }}
+  {%- endcall %}
+  {{ return(load_result('get_relation_row_counts').table) }}
+{%- endmacro %}
+
+{% macro risingwave__auto_backfill_order() -%}
+  {%- if not execute -%}
+    {{ return([]) }}
+  {%- endif -%}
+
+  {%- set upstream_relations = risingwave__get_upstream_relations() -%}
+  {%- if upstream_relations | length < 2 -%}
+    {{ return([]) }}
+  {%- endif -%}
+
+  {{ return(adapter.auto_backfill_order(risingwave__get_relation_row_counts(upstream_relations))) }}
+{%- endmacro %}
+
 {% macro risingwave__render_materialized_view_options() -%}
   {%- set backfill_order = config.get("backfill_order", none) -%}
   {%- if backfill_order is none -%}
     {{- return("") -}}
   {%- endif -%}
 
+  {%- if backfill_order is string and backfill_order | trim | lower == "auto" -%}
+    {%- set edges = risingwave__auto_backfill_order() -%}
+    {%- if edges | length == 0 -%}
+      {{- return("") -}}
+    {%- endif -%}
+    {{- return("with (backfill_order = FIXED(" ~ edges | join(", ") ~ "))") -}}
+  {%- endif -%}
+
   {%- if backfill_order is string
       or backfill_order is mapping
       or backfill_order is not sequence
       or backfill_order | length == 0 -%}
     {{ exceptions.raise_compiler_error(
-      "`backfill_order` must be a non-empty list of RisingWave FIXED backfill edges, "
+      "`backfill_order` must be `auto` or a non-empty list of RisingWave FIXED backfill edges, "
       ~ "for example [`schema.dim -> schema.fact`]."
     ) }}
   {%- endif -%}
@@ -89,10 +211,19 @@
 {%- endmacro %}
 
 {% macro risingwave__list_relations_without_caching(schema_relation) %}
+  {{ return(risingwave__list_relations_in_schemas(schema_relation.database, [schema_relation.schema])) }}
+{% endmacro %}
+
+{% macro risingwave__list_relations_in_schemas(database, schemas) %}
+  {%- set schema_literals = [] -%}
+  {%- for schema_name in schemas -%}
+    {%- do schema_literals.append("'" ~ (schema_name | replace("'", "''")) ~ "'") -%}
+  {%- endfor -%}
+
   {% call statement('list_relations_without_caching', fetch_result=True) -%}
     with rw_schema_relations as (
       select
-        '{{ schema_relation.database }}' as database,
+        '{{ database }}' as database,
         rw_relations.name as name,
         rw_schemas.name as schema,
         case
@@ -103,18 +234,18 @@
       join rw_schemas on schema_id = rw_schemas.id
       where rw_schemas.name not in ('rw_catalog', 'information_schema', 'pg_catalog')
         and relation_type in ('table', 'view', 'source', 'sink', 'subscription', 'materialized view', 'index')
-        and rw_schemas.name = '{{ schema_relation.schema }}'
+        and rw_schemas.name in ({{ schema_literals | join(', ') }})
     ),
     rw_schema_functions as (
       select
-        '{{ schema_relation.database }}' as database,
+        '{{ database }}' as database,
         rw_functions.name as name,
         rw_schemas.name as schema,
         'function' as type
       from rw_functions
       join rw_schemas on rw_functions.schema_id = rw_schemas.id
       where rw_schemas.name not in ('rw_catalog', 'information_schema', 'pg_catalog')
-        and rw_schemas.name = '{{ schema_relation.schema }}'
+        and rw_schemas.name in ({{ schema_literals | join(', ') }})
       group by database, name, schema
       having count(*) = 1
     )
@@ -166,13 +297,26 @@
 {% macro risingwave__ensure_schema_authorization(relation) -%}
   {%- set configured_owner = config.get("schema_authorization", none) -%}
   {%- if configured_owner is not none and configured_owner | trim != "" -%}
-    {%- call statement('alter_schema_owner') -%}
-      alter schema {{ relation.without_identifier().include(database=False) }}
-      owner to {{ adapter.quote(configured_owner) }}
-    {%- endcall -%}
+    {%- do adapter.ensure_schema_owner(relation, configured_owner) -%}
   {%- endif -%}
 {% endmacro %}
 
+{% macro risingwave__alter_schema_owner(relation, owner) -%}
+  {%- call statement('alter_schema_owner') -%}
+    alter schema {{ relation.without_identifier().include(database=False) }}
+    owner to {{ adapter.quote(owner) }}
+  {%- endcall -%}
+{% endmacro %}
+
+{% macro risingwave__get_schema_owners(database) -%}
+  {% call statement('get_schema_owners', fetch_result=True) %}
+    select rw_schemas.name, rw_users.name
+    from rw_catalog.rw_schemas
+    join rw_catalog.rw_users on rw_users.id = rw_schemas.owner
+  {% endcall %}
+  {{ return(load_result('get_schema_owners').table) }}
+{% endmacro %}
+
 {% macro risingwave__get_columns_in_relation(relation) -%}
   {% call statement('get_columns_in_relation', fetch_result=True) %}
       select
@@ -194,6 +338,33 @@
   {{ return(sql_convert_columns_in_relation(table)) }}
 {% endmacro %}
 
+{% macro risingwave__get_columns_in_schema(database, schema) -%}
+  {% call statement('get_columns_in_schema', fetch_result=True) %}
+    select
+        rw_relations.name as table_name,
+        rw_columns.name as column_name,
+        rw_columns.data_type
+    from rw_catalog.rw_columns
+    join rw_catalog.rw_relations on rw_relations.id = rw_columns.relation_id
+    join rw_catalog.rw_schemas on rw_schemas.id = rw_relations.schema_id
+    where rw_schemas.name = '{{ schema | replace("'", "''") }}'
+      and not rw_columns.is_hidden
+    order by rw_relations.name, rw_columns.position
+  {% endcall %}
+  {{ return(load_result('get_columns_in_schema').table) }}
+{% endmacro %}
+
+{#-- Column changes from `on_schema_change` must not be hidden by the column cache. --#}
+{% macro risingwave__alter_relation_add_remove_columns(relation, add_columns, remove_columns) %}
+  {% do default__alter_relation_add_remove_columns(relation, add_columns, remove_columns) %}
+  {% do adapter.invalidate_column_cache(relation) %}
+{% endmacro %}
+
+{% macro risingwave__alter_column_type(relation, column_name, new_column_type) -%}
+  {% do default__alter_column_type(relation, column_name, new_column_type) %}
+  {% do adapter.invalidate_column_cache(relation) %}
+{% endmacro %}
+
 {% macro risingwave__alter_relation_comment(relation, comment) %}
   {# RisingWave uses COMMENT ON TABLE for all relation types including materialized views.
      RisingWave does not support dollar-quoting, so we use single-quote escaping. #}
@@ -210,6 +381,64 @@
   {% endfor %}
 {% endmacro %}
 
+{% macro risingwave__get_relation_comments(relation) -%}
+  {#-- The relation comment has no column name; column comments are keyed by `attnum`. --#}
+  {%- set comments_sql -%}
+    select col.attname as column_name, pg_description.description
+    from pg_catalog.pg_description
+    join pg_catalog.pg_class tbl on tbl.oid = pg_description.objoid
+    join pg_catalog.pg_namespace sch on sch.oid = tbl.relnamespace
+    left join pg_catalog.pg_attribute col
+      on col.attrelid = tbl.oid and col.attnum = pg_description.objsubid
+    where sch.nspname = '{{ relation.schema | replace("'", "''") }}'
+      and tbl.relname = '{{ relation.identifier | replace("'", "''") }}'
+  {%- endset -%}
+  {{ return(run_query(comments_sql)) }}
+{%- endmacro %}
+
+{% macro risingwave__persist_docs(relation, model, for_relation=true, for_columns=true) -%}
+  {#-- Only comments that differ from the catalog are issued, in one execution per relation. --#}
+  {%- set persist_relation = for_relation and config.persist_relation_docs() and model.description -%}
+  {%- set persist_columns = for_columns and config.persist_column_docs() and model.columns -%}
+  {%- if not (persist_relation or persist_columns) -%}
+    {{ return("") }}
+  {%- endif -%}
+
+  {%- set current = namespace(relation_comment=none) -%}
+  {%- set column_comments = {} -%}
+  {%- for column_name, description in risingwave__get_relation_comments(relation) -%}
+    {%- if column_name is none -%}
+      {%- set current.relation_comment = description -%}
+    {%- else -%}
+      {%- do column_comments.update({column_name: description}) -%}
+    {%- endif -%}
+  {%- endfor -%}
+
+  {%- set statements = [] -%}
+  {%- if persist_relation and (current.relation_comment or '') != model.description -%}
+    {%- do statements.append(risingwave__alter_relation_comment(relation, model.description)) -%}
+  {%- endif -%}
+  {%- if persist_columns -%}
+    {%- set changed_columns = {} -%}
+    {%- for column_name, column in model.columns.items() -%}
+      {%- set catalog_name = column_name if column['quote'] else column_name | lower -%}
+      {%- if (column_comments.get(catalog_name) or '') != (column['description'] or '') -%}
+        {%- do changed_columns.update({column_name: column}) -%}
+      {%- endif -%}
+    {%- endfor -%}
+    {%- if changed_columns -%}
+      {%- set column_sql = risingwave__alter_column_comment(relation, changed_columns) -%}
+      {%- if column_sql | trim -%}
+        {%- do statements.append(column_sql) -%}
+      {%- endif -%}
+    {%- endif -%}
+  {%- endif -%}
+
+  {%- if statements -%}
+    {% do run_query(statements | join('\n')) %}
+  {%- endif -%}
+{%- endmacro %}
+
 {% macro risingwave__get_index_name(name, columns) -%}
     {{ return("__dbt_index_{}_{}".format(name, "_".join(columns))) }}
 {% endmacro %}
@@ -361,8 +590,37 @@
     {{ risingwave__create_table_as(temporary, relation, compiled_code) }}
 {%- endmacro %}
 
-{% macro risingwave__create_materialized_view_as(relation, sql) -%}
-    {{ risingwave__render_sql_header() }}
+{% macro risingwave__track_stream_plan(relation, sql) -%}
+  {%- set plan_tracking = config.get('plan_tracking', none) -%}
+  {%- if not execute or plan_tracking is none or not plan_tracking.get('enabled', false) -%}
+    {{ return("") }}
+  {%- endif -%}
+
+  {%- set explain_sql -%}
+    explain (distsql) create materialized view {{ relation }}
+      {{ risingwave__render_materialized_view_options() }}
+    as {{ sql }}
+  {%- endset -%}
+
+  {%- set violations = adapter.track_stream_plan(
+      model.unique_id,
+      relation,
+      explain_sql,
+      plan_tracking,
+      accept=risingwave__validation_mode() != 'error'
+  ) -%}
+  {%- if violations | length > 0 -%}
+    {{ risingwave__validation_report(
+      'RW011',
+      "Stream plan for `" ~ relation ~ "` exceeds `plan_tracking` thresholds: "
+      ~ violations | join('; ') ~ "."
+    ) }}
+  {%- endif -%}
+{%- endmacro %}
+
+{% macro risingwave__create_materialized_view_as(relation, sql, backfill_settings={}) -%}
+    {{ risingwave__track_stream_plan(relation, sql) }}
+    {{ risingwave__render_sql_header(backfill_settings) }}
 
   create materialized view if not exists {{ relation }}
     {% set contract_config = config.get('contract') %}
@@ -388,16 +646,54 @@
     {%- endif -%}
 
     {%- set from_relation = (sql | default('', true)) | trim -%}
-    {%- if from_relation == '' or from_relation.split() | length != 1 -%}
+    {%- if from_relation == '' -%}
         {{ exceptions.raise_compiler_error(
-            "Zero downtime sink replacement currently requires model SQL that renders to one upstream relation, "
-            ~ "for example `{{ ref('orders_mv') }}`. RisingWave REPLACE SINK does not support AS query yet."
+            "Zero downtime sink replacement requires model SQL that renders to an upstream relation or a query."
         ) }}
     {%- endif -%}
+    {%- if from_relation.split() | length != 1 -%}
+        {#-- RisingWave REPLACE SINK does not support AS query yet; the query is staged instead. --#}
+        {{ return(none) }}
+    {%- endif -%}
 
     {{ return(from_relation) }}
 {%- endmacro %}
 
+{% macro risingwave__stage_sink_query(target_relation, sql) -%}
+    {#-- REPLACE SINK only reads FROM a relation, so a query-bodied sink is cut over to a
+         materialized view of its query, named like other zero-downtime temporary objects. --#}
+    {%- set temp_suffix = modules.datetime.datetime.now(modules.pytz.timezone('UTC')).isoformat().replace('-', '').replace(':', '').replace('.', '_') -%}
+    {%- set staged_relation = api.Relation.create(
+        identifier=target_relation.identifier ~ "_dbt_zero_down_tmp_" ~ temp_suffix,
+        schema=target_relation.schema,
+        database=target_relation.database,
+        type='materialized_view'
+    ) -%}
+
+    {% call statement('stage_sink_query') -%}
+        {{ risingwave__create_materialized_view_with_temp_name(staged_relation, sql) }}
+    {%- endcall %}
+    {{ risingwave__wait_for_background_ddl(staged_relation, 'materialized_view') }}
+
+    {{ return(staged_relation) }}
+{%- endmacro %}
+
+{% macro risingwave__drop_previous_sink_stages(target_relation, staged_relation=none) -%}
+    {#-- Earlier staged queries of this sink lose their last dependent once the sink is replaced. --#}
+    {%- set stage_prefix = target_relation.identifier ~ "_dbt_zero_down_tmp_" -%}
+    {% for temp_obj in risingwave__list_temp_objects(target_relation.schema, ['materialized view']) %}
+        {% if temp_obj[1].startswith(stage_prefix) and (staged_relation is none or temp_obj[1] != staged_relation.identifier) %}
+            {%- set previous_relation = api.Relation.create(
+                identifier=temp_obj[1],
+                schema=temp_obj[0],
+                database=target_relation.database,
+                type='materialized_view'
+            ) -%}
+            {% do risingwave__drop_zero_downtime_temp_relation(previous_relation) %}
+        {% endif %}
+    {% endfor %}
+{%- endmacro %}
+
 
 {% macro risingwave__sink_ddl(relation, sql, replace_existing=false, from_relation=none) -%}
     {{ risingwave__render_sql_header() }}
@@ -532,6 +828,14 @@
     order by name;
 {% endmacro %}
 
+{#-- `dbt show` previews run with the `show` statement class settings. --#}
+{% macro risingwave__get_limit_sql(sql, limit) %}
+  {%- if execute -%}
+    {%- do adapter.apply_session_settings(adapter.statement_class_settings("show", config)) -%}
+  {%- endif -%}
+  {{ default__get_limit_sql(sql, limit) }}
+{% endmacro %}
+
 {% macro risingwave__execute_no_op(target_relation) %}
     {% do store_raw_result(
         name="main",
@@ -758,6 +1062,7 @@
         alter table {{ target_relation }} add column {{ risingwave__render_table_with_connector_add_column(column_config) }};
       {% endfor %}
     {%- endcall %}
+    {% do adapter.invalidate_column_cache(target_relation) %}
     {{ return(true) }}
   {% endif %}
 {% endmacro %}
@@ -768,8 +1073,78 @@
   {%- endcall %}
 {% endmacro %}
 
-{%- macro risingwave__create_materialized_view_with_temp_name(temp_relation, sql) -%}
-    {{ risingwave__render_sql_header() }}
+{% macro risingwave__get_incremental_microbatch_sql(arg_dict) %}
+  {%- set event_time = config.get('event_time') -%}
+  {%- if event_time is none -%}
+    {{ exceptions.raise_compiler_error("The `microbatch` incremental strategy requires `event_time`.") }}
+  {%- endif -%}
+  {%- set dest_cols_csv = get_quoted_csv(arg_dict["dest_columns"] | map(attribute="name")) -%}
+
+  delete from {{ arg_dict["target_relation"] }}
+  where {{ event_time }} >= '{{ model.batch.event_time_start }}'
+    and {{ event_time }} < '{{ model.batch.event_time_end }}';
+
+  insert into {{ arg_dict["target_relation"] }} ({{ dest_cols_csv }})
+  select {{ dest_cols_csv }}
+  from {{ arg_dict["temp_relation"] }}
+{% endmacro %}
+
+{#-- dbt runs the last batch on its own after every other batch has finished. Its range
+     ends at `--event-time-end`, or covers the current time when that flag is unset. --#}
+{% macro risingwave__microbatch_is_last_batch() %}
+  {%- set run_end = invocation_args_dict.get('event_time_end') -%}
+  {%- if run_end is none -%}
+    {{ return(model.batch.event_time_end > modules.datetime.datetime.now(modules.pytz.utc)) }}
+  {%- endif -%}
+  {%- set run_end = run_end if run_end is not string else modules.datetime.datetime.fromisoformat(run_end) -%}
+  {%- if run_end.tzinfo is none -%}
+    {%- set run_end = run_end.replace(tzinfo=modules.pytz.utc) -%}
+  {%- endif -%}
+  {{ return(model.batch.event_time_end >= run_end) }}
+{% endmacro %}
+
+{% macro risingwave__maintained_test_sql(sql, fail_calc) -%}
+  select {{ fail_calc }} as failures
+  from (
+    {{ sql }}
+  ) dbt_internal_test
+{%- endmacro %}
+
+{% macro risingwave__maintained_test_fingerprint(maintained_sql) -%}
+  {{ return("dbt_maintained_test:" ~ local_md5(maintained_sql | trim)) }}
+{%- endmacro %}
+
+{% macro risingwave__get_relation_comment(relation) -%}
+  {% call statement('get_relation_comment', fetch_result=True) -%}
+    select description
+    from pg_catalog.pg_description
+    join pg_catalog.pg_class on pg_class.oid = pg_description.objoid
+    join pg_catalog.pg_namespace on pg_namespace.oid = pg_class.relnamespace
+    where pg_namespace.nspname = '{{ relation.schema | replace("'", "''") }}'
+      and pg_class.relname = '{{ relation.identifier | replace("'", "''") }}'
+      and pg_description.objsubid = 0
+  {%- endcall %}
+  {%- set result_table = load_result('get_relation_comment').table -%}
+  {%- if result_table is none or result_table.rows | length == 0 -%}
+    {{ return(none) }}
+  {%- endif -%}
+  {{ return(result_table.rows[0][0]) }}
+{%- endmacro %}
+
+{% macro risingwave__maintained_test_result_sql(relation, warn_if, error_if) -%}
+  {# An aggregate over no rows may not have emitted its first row yet. #}
+  select
+    failures,
+    failures {{ warn_if }} as should_warn,
+    failures {{ error_if }} as should_error
+  from (
+    select coalesce((select failures from {{ relation }}), 0) as failures
+  ) dbt_internal_test
+{%- endmacro %}
+
+{%- macro risingwave__create_materialized_view_with_temp_name(temp_relation, sql, backfill_settings={}) -%}
+    {{ risingwave__track_stream_plan(temp_relation, sql) }}
+    {{ risingwave__render_sql_header(backfill_settings) }}
 
   create materialized view {{ temp_relation }}
     {% set contract_config = config.get('contract') %}
@@ -781,6 +1156,40 @@
   ;
 {%- endmacro %}
 
+{% macro risingwave__zero_downtime_fingerprint(sql) -%}
+  {{ return("dbt_zero_downtime:" ~ local_md5((risingwave__render_materialized_view_options() ~ sql) | trim)) }}
+{%- endmacro %}
+
+{%- macro risingwave__find_resumable_temp_relation(target_relation, fingerprint) -%}
+  {#-- A temporary MV left by an interrupted rebuild of the same SQL carries the same
+       fingerprint comment and can be swapped in instead of backfilling a new one. --#}
+  {%- set temp_prefix = target_relation.identifier ~ "_dbt_zero_down_tmp_" -%}
+  {% call statement('find_resumable_temp_relation', fetch_result=True) -%}
+    select rw_relations.name
+    from rw_catalog.rw_relations
+    join rw_catalog.rw_schemas
+      on rw_relations.schema_id = rw_schemas.id
+    join pg_catalog.pg_description
+      on pg_description.objoid = rw_relations.id
+      and pg_description.objsubid = 0
+    where rw_schemas.name = '{{ target_relation.schema | replace("'", "''") }}'
+      and rw_relations.relation_type = 'materialized view'
+      and pg_description.description = '{{ fingerprint | replace("'", "''") }}'
+    order by rw_relations.name desc
+  {%- endcall %}
+
+  {%- set result_table = load_result('find_resumable_temp_relation').table -%}
+  {%- for row in (result_table.rows if result_table is not none else []) if row[0].startswith(temp_prefix) -%}
+    {{ return(api.Relation.create(
+        identifier=row[0],
+        schema=target_relation.schema,
+        database=target_relation.database,
+        type='materialized_view'
+    )) }}
+  {%- endfor -%}
+  {{ return(none) }}
+{%- endmacro %}
+
 {%- macro risingwave__create_view_with_temp_name(temp_relation, sql) -%}
     {{ risingwave__render_sql_header() }}
 
@@ -801,6 +1210,10 @@
   alter materialized view {{ old_relation }} swap with {{ new_relation }}
 {%- endmacro %}
 
+{%- macro risingwave__swap_tables(old_relation, new_relation) -%}
+  alter table {{ old_relation }} swap with {{ new_relation }}
+{%- endmacro %}
+
 {%- macro risingwave__relation_has_dependents(relation) -%}
   {%- set relation_schema = relation.schema | replace("'", "''") -%}
   {%- set relation_identifier = relation.identifier | replace("'", "''") -%}
@@ -844,10 +1257,13 @@
       drop view if exists {{ relation }}
     {% elif relation.type == 'materializedview' or relation.type == 'materialized_view' %}
       drop materialized view if exists {{ relation }}
+    {% elif relation.type == 'table' %}
+      drop table if exists {{ relation }}
     {% else %}
       {{ exceptions.raise_compiler_error("Unsupported zero-downtime temporary relation type: " ~ relation.type) }}
     {% endif %}
   {%- endcall %}
+  {% do adapter.invalidate_column_cache(relation) %}
 
   {{ return(true) }}
 {%- endmacro %}
@@ -867,7 +1283,7 @@
 
   {# Default to all supported object types if none specified #}
   {%- if object_types is none -%}
-    {%- set object_types = ['materialized view', 'view'] -%}
+    {%- set object_types = ['materialized view', 'view', 'table'] -%}
   {%- endif -%}
   
   {# Build the type filter #}
@@ -900,6 +1316,7 @@
   {%- set obj_type_mapping = {
       'materialized view': 'materialized_view',
       'view': 'view',
+      'table': 'table',
       'sink': 'sink'
   } -%}
 
@@ -947,7 +1364,7 @@
           ) -%}
 
           {%- set dropped = false -%}
-          {% if temp_obj[3] == 'materialized view' or temp_obj[3] == 'view' %}
+          {% if temp_obj[3] in ['materialized view', 'view', 'table'] %}
             {%- set dropped = risingwave__drop_zero_downtime_temp_relation(obj_relation) -%}
           {% elif temp_obj[3] == 'sink' %}
             {{ print("Dropping temporary " ~ temp_obj[3] ~ ": " ~ obj_relation) }}
@@ -1001,7 +1418,7 @@
   {%- if object_types -%}
     {{ print("Object Types: " ~ (object_types | join(', '))) }}
   {%- else -%}
-    {{ print("Object Types: All supported types (materialized views, views)") }}
+    {{ print("Object Types: All supported types (materialized views, views, tables)") }}
   {%- endif -%}
   {{ print("") }}
   
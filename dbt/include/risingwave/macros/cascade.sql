@@ -0,0 +1,140 @@
+{#-- Relations that a full refresh drops through `DROP ... CASCADE`. --#}
+
+{%- macro risingwave__get_relation_dependencies() -%}
+  {%- do adapter.apply_session_settings(adapter.statement_class_settings('catalog')) -%}
+  {% call statement('relation_dependencies', fetch_result=True) -%}
+    select
+      dependent_relation.id as dependent_id,
+      dependent_schema.name as dependent_schema,
+      dependent_relation.name as dependent_name,
+      dependent_relation.relation_type as dependent_type,
+      coalesce(
+        rw_materialized_views.definition,
+        rw_views.definition,
+        rw_sinks.definition,
+        rw_indexes.definition,
+        rw_tables.definition,
+        rw_subscriptions.definition
+      ) as definition,
+      referenced_relation.id as referenced_id,
+      referenced_schema.name as referenced_schema,
+      referenced_relation.name as referenced_name
+    from rw_catalog.rw_depend
+    join rw_catalog.rw_relations dependent_relation
+      on rw_depend.objid = dependent_relation.id
+    join rw_catalog.rw_schemas dependent_schema
+      on dependent_relation.schema_id = dependent_schema.id
+    join rw_catalog.rw_relations referenced_relation
+      on rw_depend.refobjid = referenced_relation.id
+    join rw_catalog.rw_schemas referenced_schema
+      on referenced_relation.schema_id = referenced_schema.id
+    left join rw_catalog.rw_materialized_views
+      on rw_materialized_views.id = dependent_relation.id
+    left join rw_catalog.rw_views
+      on rw_views.id = dependent_relation.id
+    left join rw_catalog.rw_sinks
+      on rw_sinks.id = dependent_relation.id
+    left join rw_catalog.rw_indexes
+      on rw_indexes.id = dependent_relation.id
+    left join rw_catalog.rw_tables
+      on rw_tables.id = dependent_relation.id
+    left join rw_catalog.rw_subscriptions
+      on rw_subscriptions.id = dependent_relation.id
+  {%- endcall %}
+
+  {{ return(load_result('relation_dependencies').table) }}
+{%- endmacro %}
+
+{#-- Apply `on_cascade_drop` before a full refresh drops `relation`.
+     Returns the dependents to pass to `risingwave__rebuild_cascade_dependents`. --#}
+
+{%- macro risingwave__prepare_cascade_drop(relation) -%}
+  {%- set on_cascade_drop = config.get('on_cascade_drop', 'drop') -%}
+  {%- if on_cascade_drop not in ['drop', 'error', 'rebuild'] -%}
+    {{ exceptions.raise_compiler_error(
+      "Invalid on_cascade_drop '" ~ on_cascade_drop ~ "'. Expected one of: drop, error, rebuild"
+    ) }}
+  {%- endif -%}
+  {%- if not execute -%}
+    {{ return([]) }}
+  {%- endif -%}
+
+  {#-- Dependents selected in this run are recreated by their own models. --#}
+  {%- set selected_nodes = [] -%}
+  {%- for unique_id in (selected_resources if selected_resources is defined else []) -%}
+    {%- if unique_id in graph.nodes -%}
+      {%- do selected_nodes.append(graph.nodes[unique_id]) -%}
+    {%- endif -%}
+  {%- endfor -%}
+  {%- set dependents = adapter.cascade_dependents(
+      risingwave__get_relation_dependencies(), relation, selected_nodes
+  ) -%}
+  {%- if dependents | length == 0 -%}
+    {{ return([]) }}
+  {%- endif -%}
+
+  {%- set dependent_names = [] -%}
+  {%- for dependent in dependents -%}
+    {%- do dependent_names.append(dependent.relation_type ~ " " ~ dependent.schema ~ "." ~ dependent.name) -%}
+  {%- endfor -%}
+
+  {%- if on_cascade_drop == 'error' -%}
+    {{ exceptions.raise_compiler_error(
+      "Full refresh of " ~ relation ~ " would drop " ~ dependents | length ~ " dependent relations: "
+      ~ dependent_names | join(", ")
+      ~ ". Select them in the same run, or set on_cascade_drop: rebuild to recreate them."
+    ) }}
+  {%- elif on_cascade_drop == 'rebuild' -%}
+    {%- for dependent in dependents if dependent.definition is none -%}
+      {{ exceptions.raise_compiler_error(
+        "Full refresh of " ~ relation ~ " cannot rebuild " ~ dependent.relation_type ~ " "
+        ~ dependent.schema ~ "." ~ dependent.name ~ ": its definition is not in the catalog"
+      ) }}
+    {%- endfor -%}
+    {%- for dependent in dependents if dependent.reads_selected -%}
+      {{ exceptions.raise_compiler_error(
+        "Full refresh of " ~ relation ~ " cannot rebuild " ~ dependent.relation_type ~ " "
+        ~ dependent.schema ~ "." ~ dependent.name ~ ": it reads " ~ dependent.reads_selected | join(", ")
+        ~ ", which this run rebuilds later. Select it in the same run as well."
+      ) }}
+    {%- endfor -%}
+    {{- log("Full refresh of " ~ relation ~ " drops and will rebuild: " ~ dependent_names | join(", "), info=True) -}}
+    {{ return(dependents) }}
+  {%- endif -%}
+
+  {{- log("Full refresh of " ~ relation ~ " also drops: " ~ dependent_names | join(", "), info=True) -}}
+  {{ return([]) }}
+{%- endmacro %}
+
+{#-- Recreate dropped dependents from their catalog definitions. Each level is
+     created in the background and waited for before the next level starts. --#}
+
+{%- macro risingwave__rebuild_cascade_dependents(dependents) -%}
+  {%- if dependents | length == 0 -%}
+    {{ return("") }}
+  {%- endif -%}
+
+  {#-- The profile's search_path is set when connecting and is not in the tracked
+       session state, so it is read back to be restored afterwards. --#}
+  {%- set search_path = run_query('show search_path').columns[0].values()[0] -%}
+
+  {%- for level in dependents | groupby('level') -%}
+    {%- for dependent in level.list -%}
+      {{- log("Rebuilding " ~ dependent.relation_type ~ " " ~ dependent.schema ~ "." ~ dependent.name, info=True) -}}
+      {#-- Catalog definitions may use names relative to the dependent's schema. --#}
+      {%- do adapter.apply_session_settings({'background_ddl': true, 'search_path': dependent.schema}) -%}
+      {%- do run_query(dependent.definition) -%}
+    {%- endfor -%}
+    {%- for dependent in level.list if dependent.wait_keyword is not none -%}
+      {%- set dependent_relation = api.Relation.create(
+          identifier=dependent.name, schema=dependent.schema, database=database
+      ) -%}
+      {%- do run_query('WAIT ' ~ dependent.wait_keyword ~ ' ' ~ dependent_relation.include(database=False)) -%}
+    {%- endfor -%}
+  {%- endfor -%}
+
+  {%- do adapter.apply_session_settings({
+      'background_ddl': config.get('background_ddl', none),
+      'search_path': search_path
+  }) -%}
+{%- endmacro %}
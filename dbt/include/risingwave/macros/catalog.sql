@@ -2,6 +2,7 @@
 -- todo: filter out temporary table when `tbl.relpersistence` is done in rw
 -- todo: add sink support when it's shown in `pg_catalog.pg_class`
 {% macro risingwave__get_catalog_relations(information_schema, relations) -%}
+  {%- do adapter.apply_session_settings(adapter.statement_class_settings('catalog')) -%}
   {%- call statement('catalog', fetch_result=True) -%}
     {% set database = information_schema.database %}
     {{ adapter.verify_database(database) }}
@@ -0,0 +1,96 @@
+{#-- Storage and streaming state footprint of dbt-managed relations. --#}
+
+{%- macro risingwave__get_relation_footprints(schemas, relation_name=none) -%}
+  {%- if schemas | length == 0 -%}
+    {{ return([]) }}
+  {%- endif -%}
+
+  {%- set schema_literals = [] -%}
+  {%- for schema_name in schemas -%}
+    {%- do schema_literals.append("'" ~ (schema_name | replace("'", "''")) ~ "'") -%}
+  {%- endfor -%}
+
+  {%- do adapter.apply_session_settings(adapter.statement_class_settings('catalog')) -%}
+  {% call statement('relation_footprints', fetch_result=True) -%}
+    with job_state as (
+      select
+        rw_internal_tables.job_id,
+        count(*) as state_tables,
+        sum(coalesce(rw_table_stats.total_key_size, 0) + coalesce(rw_table_stats.total_value_size, 0)) as state_bytes
+      from rw_catalog.rw_internal_tables
+      left join rw_catalog.rw_table_stats
+        on rw_table_stats.id = rw_internal_tables.id
+      group by rw_internal_tables.job_id
+    )
+    select
+      rw_schemas.name as schema_name,
+      rw_relations.name as relation_name,
+      rw_relations.relation_type as relation_type,
+      parent_relation.name as parent_name,
+      rw_table_stats.total_key_count as row_count,
+      coalesce(rw_table_stats.total_key_size + rw_table_stats.total_value_size, 0)
+        + coalesce(job_state.state_bytes, 0) as storage_bytes,
+      coalesce(job_state.state_bytes, 0) as state_bytes,
+      coalesce(job_state.state_tables, 0) as state_tables
+    from rw_catalog.rw_relations
+    join rw_catalog.rw_schemas
+      on rw_relations.schema_id = rw_schemas.id
+    left join rw_catalog.rw_indexes
+      on rw_indexes.id = rw_relations.id
+    left join rw_catalog.rw_relations parent_relation
+      on parent_relation.id = rw_indexes.primary_table_id
+    left join rw_catalog.rw_table_stats
+      on rw_table_stats.id = rw_relations.id
+    left join job_state
+      on job_state.job_id = rw_relations.id
+    where rw_schemas.name in ({{ schema_literals | join(', ') }})
+      and rw_relations.relation_type in ('table', 'materialized view', 'index', 'sink')
+    {%- if relation_name is not none %}
+      and (rw_relations.name = '{{ relation_name | replace("'", "''") }}'
+        or parent_relation.name = '{{ relation_name | replace("'", "''") }}')
+    {%- endif %}
+  {%- endcall %}
+
+  {{ return(load_result('relation_footprints').table) }}
+{%- endmacro %}
+
+{#-- Add the footprint of a freshly built relation to the `main` adapter response. --#}
+
+{%- macro risingwave__record_footprint(relation) -%}
+  {%- if not execute or not config.get('collect_footprint', false) -%}
+    {{ return("") }}
+  {%- endif -%}
+
+  {%- set main_result = load_result('main') -%}
+  {%- if main_result is none -%}
+    {{ return("") }}
+  {%- endif -%}
+
+  {%- set footprints = risingwave__get_relation_footprints([relation.schema], relation.identifier) -%}
+  {% do store_result(
+      'main',
+      response=adapter.attach_footprint(main_result.response, footprints, relation),
+      agate_table=main_result.table
+  ) %}
+{%- endmacro %}
+
+{#-- User-friendly wrapper macro --#}
+
+{%- macro footprint_report(select=none, limit=none) -%}
+  {%- set schemas = adapter.footprint_schemas(graph, select) -%}
+  {%- set ranked = adapter.rank_footprints(graph, risingwave__get_relation_footprints(schemas), select) -%}
+
+  {{ print("=== State Footprint ===") }}
+  {% if ranked | length == 0 %}
+    {{ print("No built streaming models selected.") }}
+    {{ return(ranked) }}
+  {% endif %}
+
+  {% for item in (ranked if limit is none else ranked[:limit | int]) %}
+    {{ print(loop.index ~ ". " ~ item.relation ~ " (" ~ item.materialized ~ ", " ~ item.unique_id ~ "): "
+             ~ adapter.format_bytes(item.state_bytes) ~ " state in " ~ item.state_tables ~ " state tables, "
+             ~ adapter.format_bytes(item.storage_bytes) ~ " total, "
+             ~ (item.row_count if item.row_count is not none else "unknown") ~ " rows") }}
+  {% endfor %}
+  {{ return(ranked) }}
+{%- endmacro %}
@@ -0,0 +1,52 @@
+{#-- `dbt source freshness` with a `loaded_at_field` reads `max(loaded_at_field)` from a
+     materialized view that RisingWave keeps up to date, instead of scanning the source
+     on every check. The view lives in the target schema and is rebuilt when the
+     freshness query changes, detected through its comment. --#}
+
+{% macro risingwave__collect_freshness(source, loaded_at_field, filter) %}
+  {#-- A filter is usually relative to the current time and cannot be maintained. --#}
+  {%- if filter -%}
+    {{ return(default__collect_freshness(source, loaded_at_field, filter)) }}
+  {%- endif -%}
+
+  {%- set freshness_sql -%}
+    select max({{ loaded_at_field }}) as max_loaded_at from {{ source }}
+  {%- endset -%}
+  {%- set fingerprint = "dbt_freshness:" ~ local_md5(freshness_sql | trim) -%}
+  {%- set freshness_relation = api.Relation.create(
+      identifier="__dbt_freshness_" ~ source.schema ~ "_" ~ source.identifier,
+      schema=target.schema,
+      database=source.database,
+      type='materialized_view'
+  ) -%}
+
+  {%- set existing_relation = risingwave__get_relation_without_caching(freshness_relation) -%}
+  {%- if existing_relation is not none
+        and risingwave__get_relation_comment(existing_relation) != fingerprint -%}
+    {% do adapter.drop_relation(existing_relation) %}
+    {%- set existing_relation = none -%}
+  {%- endif -%}
+
+  {%- if existing_relation is none -%}
+    {% do adapter.create_schema(freshness_relation) %}
+    {#-- Created in the foreground: the check below reads it right away. --#}
+    {% call statement('create_freshness_relation', auto_begin=False) -%}
+      {% for statement in adapter.session_setting_statements({'background_ddl': false}) -%}
+        {{ statement }};
+      {% endfor -%}
+      create materialized view {{ freshness_relation }} as {{ freshness_sql }}
+    {%- endcall %}
+    {% call statement('comment_freshness_relation', auto_begin=False) -%}
+      {{ risingwave__alter_relation_comment(freshness_relation, fingerprint) }}
+    {%- endcall %}
+  {%- endif -%}
+
+  {%- do adapter.apply_session_settings(adapter.statement_class_settings('catalog')) -%}
+  {% call statement('collect_freshness', fetch_result=True, auto_begin=False) -%}
+    select
+      max_loaded_at,
+      {{ current_timestamp() }} as snapshotted_at
+    from {{ freshness_relation }}
+  {%- endcall %}
+  {{ return(load_result('collect_freshness')) }}
+{% endmacro %}
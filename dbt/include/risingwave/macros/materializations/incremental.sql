@@ -32,12 +32,29 @@
   {{ run_hooks(pre_hooks, inside_transaction=True) }}
 
   {% set to_drop = [] %}
+  {% set cascade_dependents = [] %}
+
+  {% set incremental_strategy = config.get('incremental_strategy') or 'default' %}
 
   {% if existing_relation is none %}
       {% set build_sql = risingwave__create_table_as(False, target_relation, sql) %}
   {% elif full_refresh_mode %}
       {% set build_sql = risingwave__create_table_as(False, intermediate_relation, sql) %}
+      {#-- Dropping the swapped-out backup cascades to everything that read the old table. --#}
+      {% set cascade_dependents = risingwave__prepare_cascade_drop(existing_relation) %}
       {% set need_swap = true %}
+  {% elif incremental_strategy == 'microbatch' %}
+    {#-- Each batch replaces its event-time range with a direct INSERT ... SELECT, so
+         batches can run concurrently and a retried batch is idempotent. --#}
+    {% do adapter.apply_session_settings({'rw_implicit_flush': 'false'}) %}
+    {% set build_sql = risingwave__get_incremental_microbatch_sql({
+        'target_relation': target_relation,
+        'temp_relation': '(' ~ sql ~ ') as dbt_microbatch_source',
+        'unique_key': unique_key,
+        'dest_columns': adapter.get_columns_in_relation(existing_relation),
+        'incremental_predicates': none,
+    }) %}
+    {% set flush_after_build = risingwave__microbatch_is_last_batch() %}
   {% else %}
     {% do run_query(risingwave__create_table_as(False, temp_relation, sql)) %}
     {% do to_drop.append(temp_relation) %}
@@ -50,8 +67,7 @@
       {% set dest_columns = adapter.get_columns_in_relation(existing_relation) %}
     {% endif %}
 
-    {#-- Get the incremental_strategy, the macro to use for the strategy, and build the sql --#}
-    {% set incremental_strategy = config.get('incremental_strategy') or 'default' %}
+    {#-- Get the macro to use for the incremental_strategy and build the sql --#}
     {% set incremental_predicates = config.get('predicates', none) or config.get('incremental_predicates', none) %}
     {% set strategy_sql_macro_func = adapter.get_incremental_strategy_macro(context, incremental_strategy) %}
     {% set strategy_arg_dict = ({'target_relation': target_relation, 'temp_relation': temp_relation, 'unique_key': unique_key, 'dest_columns': dest_columns, 'incremental_predicates': incremental_predicates }) %}
@@ -63,6 +79,13 @@
       {{ build_sql }}
   {% endcall %}
 
+  {% if flush_after_build %}
+    {#-- Batches skip implicit flushes; one FLUSH after the last batch makes them all visible. --#}
+    {% call statement("flush") %}
+      flush
+    {% endcall %}
+  {% endif %}
+
   {% if need_swap %}
       {% do adapter.rename_relation(target_relation, backup_relation) %}
       {% do adapter.rename_relation(intermediate_relation, target_relation) %}
@@ -72,6 +95,8 @@
   {% set should_revoke = should_revoke(existing_relation, full_refresh_mode) %}
   {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
 
+  {{ risingwave__record_footprint(target_relation) }}
+
   {% do persist_docs(target_relation, model) %}
 
   {% if existing_relation is none or existing_relation.is_view or should_full_refresh() %}
@@ -87,8 +112,11 @@
       {% do adapter.drop_relation(rel) %}
   {% endfor %}
 
+  {{ risingwave__rebuild_cascade_dependents(cascade_dependents) }}
+
   {{ run_hooks(post_hooks, inside_transaction=False) }}
 
   {{ return({'relations': [target_relation]}) }}
 
 {%- endmaterialization %}
+
@@ -17,7 +17,9 @@
 
   {{ risingwave__validate_model_sql(sql, 'materialized_view', true) }}
 
+  {%- set cascade_dependents = [] -%}
   {% if full_refresh_mode and old_relation %}
+    {%- set cascade_dependents = risingwave__prepare_cascade_drop(old_relation) -%}
     {{ adapter.drop_relation(old_relation) }}
   {% endif %}
 
@@ -28,10 +30,12 @@
 
   {% if old_relation is none %}
     {# First time creation #}
+    {%- set backfill_settings = risingwave__auto_parallelism_settings() -%}
     {% call statement('main') -%}
-      {{ risingwave__create_materialized_view_as(target_relation, sql) }}
+      {{ risingwave__create_materialized_view_as(target_relation, sql, backfill_settings) }}
     {%- endcall %}
     {{ risingwave__wait_for_background_ddl(target_relation, 'materialized_view') }}
+    {{ risingwave__record_backfill(target_relation) }}
 
     {% set should_revoke = should_revoke(existing_relation=none, full_refresh_mode=true) %}
     {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
@@ -40,10 +44,12 @@
     {{ risingwave__wait_for_background_indexes(target_relation) }}
   {% elif full_refresh_mode and old_relation %}
     {# Full refresh mode - already dropped above, create new #}
+    {%- set backfill_settings = risingwave__auto_parallelism_settings() -%}
     {% call statement('main') -%}
-      {{ risingwave__create_materialized_view_as(target_relation, sql) }}
+      {{ risingwave__create_materialized_view_as(target_relation, sql, backfill_settings) }}
     {%- endcall %}
     {{ risingwave__wait_for_background_ddl(target_relation, 'materialized_view') }}
+    {{ risingwave__record_backfill(target_relation) }}
 
     {% set should_revoke = should_revoke(existing_relation=old_relation, full_refresh_mode=true) %}
     {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
@@ -56,29 +62,56 @@
       {# Use zero downtime rebuild - both model config and user flag are enabled #}
       {{- log("Using zero downtime rebuild with SWAP for materialized view update.") -}}
 
-      {%- set temp_suffix = modules.datetime.datetime.now(modules.pytz.timezone('UTC')).isoformat().replace('-', '').replace(':', '').replace('.', '_') -%}
-      {%- set temp_identifier = target_relation.identifier ~ "_dbt_zero_down_tmp_" ~ temp_suffix -%}
-      {%- set temp_relation = api.Relation.create(
-          identifier=temp_identifier,
-          schema=target_relation.schema,
-          database=target_relation.database,
-          type='materialized_view'
-      ) -%}
-
-      {# Step 1: Create temporary materialized view #}
-      {% call statement('main') -%}
-        {{ risingwave__create_materialized_view_with_temp_name(temp_relation, sql) }}
-      {%- endcall %}
-      {{ risingwave__wait_for_background_ddl(temp_relation, 'materialized_view') }}
+      {%- set fingerprint = risingwave__zero_downtime_fingerprint(sql) -%}
+      {%- set temp_relation = risingwave__find_resumable_temp_relation(target_relation, fingerprint) -%}
+
+      {% if temp_relation is not none %}
+        {# Step 1: Resume from the temporary materialized view of an interrupted run #}
+        {{- log("Resuming zero downtime rebuild from existing temporary materialized view: " ~ temp_relation) -}}
+        {% do run_query('WAIT MATERIALIZED VIEW ' ~ temp_relation.include(database=False)) %}
+        {% do store_raw_result(
+            name="main",
+            message="resume " ~ temp_relation,
+            code="resume",
+            rows_affected="-1"
+        ) %}
+      {% else %}
+        {%- set temp_suffix = modules.datetime.datetime.now(modules.pytz.timezone('UTC')).isoformat().replace('-', '').replace(':', '').replace('.', '_') -%}
+        {%- set temp_identifier = target_relation.identifier ~ "_dbt_zero_down_tmp_" ~ temp_suffix -%}
+        {%- set temp_relation = api.Relation.create(
+            identifier=temp_identifier,
+            schema=target_relation.schema,
+            database=target_relation.database,
+            type='materialized_view'
+        ) -%}
+
+        {# Step 1: Create temporary materialized view, marked so a retry can resume from it #}
+        {%- set backfill_settings = risingwave__auto_parallelism_settings() -%}
+        {% call statement('main') -%}
+          {{ risingwave__create_materialized_view_with_temp_name(temp_relation, sql, backfill_settings) }}
+        {%- endcall %}
+        {#-- Marked once the backfill has finished, so only a complete temporary is resumed. --#}
+        {{ risingwave__wait_for_background_ddl(temp_relation, 'materialized_view') }}
+        {% call statement('zero_downtime_fingerprint') -%}
+          {{ risingwave__alter_relation_comment(temp_relation, fingerprint) }}
+        {%- endcall %}
+        {{ risingwave__record_backfill(temp_relation) }}
+      {% endif %}
 
       {# Step 2: Build indexes before cut-over so the new MV is fully indexed at swap time #}
       {{ create_indexes(temp_relation) }}
       {{ risingwave__wait_for_background_indexes(temp_relation) }}
 
-      {# Step 3: Swap the materialized views #}
+      {# Step 3: Swap the materialized views. The fingerprint marks only unswapped
+         temporaries, so it is cleared from both sides in the same execution: the
+         swapped-out MV must never be resumed. #}
       {% call statement('swap') -%}
-        {{ risingwave__swap_materialized_views(old_relation, temp_relation) }}
+        {{ risingwave__swap_materialized_views(old_relation, temp_relation) }};
+        {{ risingwave__alter_relation_comment(target_relation, "") }}
+        {{ risingwave__alter_relation_comment(temp_relation, "") }}
       {%- endcall %}
+      {% do adapter.invalidate_column_cache(old_relation) %}
+      {% do adapter.invalidate_column_cache(temp_relation) %}
 
       {# Step 4: Free canonical names on old indexes and promote the prebuilt indexes #}
       {{ risingwave__handoff_zero_downtime_indexes(temp_relation, target_relation) }}
@@ -104,6 +137,10 @@
     {% endif %}
   {% endif %}
 
+  {{ risingwave__rebuild_cascade_dependents(cascade_dependents) }}
+
+  {{ risingwave__record_footprint(target_relation) }}
+
   {% do persist_docs(target_relation, model) %}
 
   {{ run_hooks(post_hooks, inside_transaction=False) }}
@@ -11,7 +11,9 @@
 
   {{ risingwave__validate_model_sql(sql, 'materializedview', true) }}
 
+  {%- set cascade_dependents = [] -%}
   {% if full_refresh_mode and old_relation %}
+    {%- set cascade_dependents = risingwave__prepare_cascade_drop(old_relation) -%}
     {{ adapter.drop_relation(old_relation) }}
   {% endif %}
 
@@ -37,6 +39,10 @@
     {{ risingwave__handle_on_configuration_change(old_relation, target_relation) }}
   {% endif %}
 
+  {{ risingwave__rebuild_cascade_dependents(cascade_dependents) }}
+
+  {{ risingwave__record_footprint(target_relation) }}
+
   {% do persist_docs(target_relation, model) %}
 
   {{ run_hooks(post_hooks, inside_transaction=False) }}
@@ -42,10 +42,18 @@
         {{ risingwave__wait_for_background_ddl(target_relation, "sink") }}
     {% elif replace_mode %}
         {{- log("Using REPLACE SINK for zero downtime sink cut-over.") -}}
+        {%- set staged_relation = none -%}
+        {% if replace_from_relation is none %}
+            {%- set staged_relation = risingwave__stage_sink_query(target_relation, sql) -%}
+            {{- log("Staged the sink query as materialized view " ~ staged_relation ~ ".") -}}
+            {%- set replace_from_relation = staged_relation -%}
+        {% endif %}
         {% call statement("main") -%}
             {{ risingwave__replace_sink(target_relation, replace_from_relation) }}
         {%- endcall %}
         {{ risingwave__wait_for_replace_sink(target_relation) }}
+        {#-- The replaced sink was the only reader of an earlier stage; do not leave it running. --#}
+        {{ risingwave__drop_previous_sink_stages(target_relation, staged_relation) }}
     {% else %} {{ risingwave__execute_no_op(target_relation) }}
     {% endif %}
 
@@ -53,6 +61,8 @@
     {% set should_revoke = should_revoke(existing_relation=old_relation, full_refresh_mode=relation_recreated) %}
     {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
 
+    {{ risingwave__record_footprint(target_relation) }}
+
     {% do persist_docs(target_relation, model) %}
 
     {{ run_hooks(post_hooks, inside_transaction=False) }}
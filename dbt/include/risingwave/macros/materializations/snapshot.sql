@@ -0,0 +1,115 @@
+{#-- The `changelog` strategy derives SCD2 rows from a subscription instead of diffing
+     the whole snapshot table; every other strategy uses dbt's snapshot materialization. --#}
+{% materialization snapshot, adapter='risingwave' %}
+  {%- if config.get('strategy') != 'changelog' -%}
+    {{ return(materialization_snapshot_default()) }}
+  {%- endif -%}
+
+  {%- set identifier = model.get('alias', model.get('name')) -%}
+  {%- set unique_key = config.get('unique_key') -%}
+  {%- set grant_config = config.get('grants') -%}
+  {%- set meta_columns = config.get('snapshot_table_column_names') or get_snapshot_table_column_names() -%}
+  {%- set hard_deletes = adapter.get_hard_deletes_behavior(config) -%}
+  {%- set target_relation = api.Relation.create(
+      identifier=identifier, schema=model.schema, database=model.database, type='table') -%}
+  {%- set changelog_relation = api.Relation.create(
+      identifier=identifier ~ '__dbt_changelog',
+      schema=model.schema,
+      database=model.database,
+      type='materialized_view') -%}
+  {%- set subscription_relation = api.Relation.create(
+      identifier=identifier ~ '__dbt_changelog_sub',
+      schema=model.schema,
+      database=model.database,
+      type='subscription') -%}
+
+  {%- if unique_key is none -%}
+    {{ exceptions.raise_compiler_error("The `changelog` snapshot strategy requires `unique_key`.") }}
+  {%- endif -%}
+
+  {{ run_hooks(pre_hooks, inside_transaction=False) }}
+  {{ run_hooks(pre_hooks, inside_transaction=True) }}
+
+  {%- set old_relation = risingwave__get_relation_without_caching(target_relation) -%}
+  {%- if old_relation is not none and not old_relation.is_table -%}
+    {% do exceptions.relation_wrong_type(old_relation, 'table') %}
+  {%- endif -%}
+
+  {#-- The changelog comment ends with a fingerprint of the query it streams; a changed
+       query rebuilds the changelog and reloads the snapshot table from it. --#}
+  {%- set changelog_fingerprint = local_md5(sql | trim) -%}
+  {%- set existing_changelog = risingwave__get_relation_without_caching(changelog_relation) -%}
+  {%- set changelog_changed = existing_changelog is not none and not (
+      risingwave__get_relation_comment(existing_changelog) or ''
+  ).endswith(' dbt_changelog_sql=' ~ changelog_fingerprint) -%}
+  {%- if changelog_changed -%}
+    {% do adapter.drop_relation(subscription_relation) %}
+    {% do adapter.drop_relation(existing_changelog) %}
+    {%- set existing_changelog = none -%}
+  {%- endif -%}
+
+  {%- if existing_changelog is none -%}
+    {% call statement('create_changelog') -%}
+      {{ risingwave__create_materialized_view_as(changelog_relation, sql) }}
+    {%- endcall %}
+    {{ risingwave__wait_for_background_ddl(changelog_relation, 'materialized_view') }}
+  {%- endif -%}
+  {%- if risingwave__get_relation_without_caching(subscription_relation) is none -%}
+    {% call statement('create_changelog_subscription') -%}
+      {{ risingwave__create_subscription(subscription_relation, changelog_relation | string) }}
+    {%- endcall %}
+  {%- endif -%}
+
+  {%- set column_names = adapter.get_columns_in_relation(changelog_relation) | map(attribute='name') | list -%}
+  {%- set has_position = risingwave__get_relation_comment(changelog_relation) is not none -%}
+
+  {%- if old_relation is none -%}
+    {% call statement('create_snapshot_table') -%}
+      create table if not exists {{ target_relation }} as
+      select
+        *,
+        null::varchar as {{ adapter.quote(meta_columns.dbt_scd_id) }},
+        null::timestamp as {{ adapter.quote(meta_columns.dbt_updated_at) }},
+        null::timestamp as {{ adapter.quote(meta_columns.dbt_valid_from) }},
+        null::timestamp as {{ adapter.quote(meta_columns.dbt_valid_to) }}
+      from {{ changelog_relation }}
+      where false
+    {%- endcall %}
+  {%- elif not (has_position or changelog_changed) -%}
+    {{ exceptions.raise_compiler_error(
+        target_relation ~ " exists but " ~ changelog_relation ~ " has no changelog position. "
+        "The table was not built by the `changelog` strategy or its first run did not complete; "
+        "drop it to rebuild it from the changelog.") }}
+  {%- endif -%}
+
+  {%- set applied = adapter.apply_changelog_snapshot(
+      target_relation,
+      changelog_relation,
+      subscription_relation,
+      unique_key,
+      column_names,
+      meta_columns,
+      hard_deletes,
+      config.get('changelog_batch_size', 1000),
+      rebuild=old_relation is none,
+      reload=changelog_changed and old_relation is not none,
+      fingerprint=changelog_fingerprint,
+      retention=config.get('retention', '1D')
+  ) -%}
+  {% do store_raw_result(
+      name="main",
+      message="SNAPSHOT " ~ applied,
+      code="SNAPSHOT",
+      rows_affected=applied | string
+  ) %}
+
+  {% set should_revoke = should_revoke(existing_relation=old_relation, full_refresh_mode=false) %}
+  {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
+
+  {% do persist_docs(target_relation, model) %}
+
+  {{ run_hooks(post_hooks, inside_transaction=False) }}
+  {{ run_hooks(post_hooks, inside_transaction=True) }}
+
+  {{ return({'relations': [target_relation]}) }}
+{% endmaterialization %}
@@ -9,7 +9,11 @@
 
     {{ risingwave__validate_model_sql(sql, "source", false) }}
 
-    {% if full_refresh_mode and old_relation %} {{ adapter.drop_relation(old_relation) }} {% endif %}
+    {%- set cascade_dependents = [] -%}
+    {% if full_refresh_mode and old_relation %}
+        {%- set cascade_dependents = risingwave__prepare_cascade_drop(old_relation) -%}
+        {{ adapter.drop_relation(old_relation) }}
+    {% endif %}
 
     {{ run_hooks(pre_hooks, inside_transaction=False) }}
     {{ run_hooks(pre_hooks, inside_transaction=True) }}
@@ -22,6 +26,8 @@
     {% set should_revoke = should_revoke(existing_relation=old_relation, full_refresh_mode=full_refresh_mode) %}
     {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
 
+    {{ risingwave__rebuild_cascade_dependents(cascade_dependents) }}
+
     {% do persist_docs(target_relation, model) %}
 
     {{ run_hooks(post_hooks, inside_transaction=False) }}
@@ -9,10 +9,18 @@
                                                 database=database,
                                                 type='table') -%}
   {%- set grant_config = config.get('grants') -%}
+  {# Check both model config AND command line flag for zero downtime #}
+  {%- set zero_downtime_config = config.get('zero_downtime', {}) -%}
+  {%- set model_has_zero_downtime = zero_downtime_config.get('enabled', false) -%}
+  {%- set user_requested_zero_downtime = var('zero_downtime', false) -%}
+  {%- set zero_downtime_mode = model_has_zero_downtime and user_requested_zero_downtime -%}
+  {%- set immediate_cleanup = zero_downtime_config.get('immediate_cleanup', false) -%}
 
   {{ risingwave__validate_model_sql(sql, 'table', true) }}
 
+  {%- set cascade_dependents = [] -%}
   {% if full_refresh_mode and old_relation %}
+    {%- set cascade_dependents = risingwave__prepare_cascade_drop(old_relation) -%}
     {{ adapter.drop_relation(old_relation) }}
   {% endif %}
 
@@ -29,13 +37,61 @@
 
     {{ create_indexes(target_relation) }}
     {{ risingwave__wait_for_background_indexes(target_relation) }}
+  {% elif zero_downtime_mode %}
+    {# Use zero downtime rebuild - both model config and user flag are enabled #}
+    {{- log("Using zero downtime rebuild with SWAP for table update.") -}}
+
+    {%- set temp_suffix = modules.datetime.datetime.now(modules.pytz.timezone('UTC')).isoformat().replace('-', '').replace(':', '').replace('.', '_') -%}
+    {%- set temp_identifier = target_relation.identifier ~ "_dbt_zero_down_tmp_" ~ temp_suffix -%}
+    {%- set temp_relation = api.Relation.create(
+        identifier=temp_identifier,
+        schema=target_relation.schema,
+        database=target_relation.database,
+        type='table'
+    ) -%}
+
+    {# Step 1: Create and fill the staged table #}
+    {% call statement('main') -%}
+      {{ risingwave__create_table_as(False, temp_relation, sql) }}
+    {%- endcall %}
+    {{ risingwave__wait_for_background_ddl(temp_relation, 'table') }}
+
+    {# Step 2: Build indexes before cut-over so the new table is fully indexed at swap time #}
+    {{ create_indexes(temp_relation) }}
+    {{ risingwave__wait_for_background_indexes(temp_relation) }}
+
+    {# Step 3: Swap the tables #}
+    {% call statement('swap') -%}
+      {{ risingwave__swap_tables(old_relation, temp_relation) }}
+    {%- endcall %}
+    {% do adapter.invalidate_column_cache(old_relation) %}
+    {% do adapter.invalidate_column_cache(temp_relation) %}
+
+    {# Step 4: Free canonical names on old indexes and promote the prebuilt indexes #}
+    {{ risingwave__handoff_zero_downtime_indexes(temp_relation, target_relation) }}
+
+    {# Step 5: Conditionally drop the old table (now with temp name) #}
+    {% if immediate_cleanup %}
+      {{- log("Attempting immediate cleanup of temporary table: " ~ temp_relation) -}}
+      {{ risingwave__drop_zero_downtime_temp_relation(temp_relation) }}
+    {% else %}
+      {{- log("Preserving temporary table for downstream dependencies: " ~ temp_relation) -}}
+      {{- log("Manual cleanup required: DROP TABLE IF EXISTS " ~ temp_relation ~ ";") -}}
+    {% endif %}
   {% else %}
+    {% if model_has_zero_downtime and not user_requested_zero_downtime %}
+      {{- log("Model is configured for zero downtime, but --vars 'zero_downtime: true' was not provided. Skipping the existing table.") -}}
+    {% endif %}
     {{ risingwave__execute_no_op(target_relation) }}
   {% endif %}
 
-  {% set should_revoke = should_revoke(existing_relation=old_relation, full_refresh_mode=full_refresh_mode) %}
+  {% set should_revoke = should_revoke(existing_relation=old_relation, full_refresh_mode=full_refresh_mode or zero_downtime_mode) %}
   {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
 
+  {{ risingwave__rebuild_cascade_dependents(cascade_dependents) }}
+
+  {{ risingwave__record_footprint(target_relation) }}
+
   {% do persist_docs(target_relation, model) %}
 
   {{ run_hooks(post_hooks, inside_transaction=False) }}
@@ -2,6 +2,10 @@
 
   {% set relations = [] %}
 
+  {% if config.get('maintained', false) %}
+    {{ return(risingwave__materialize_maintained_test()) }}
+  {% endif %}
+
   {% if should_store_failures() %}
 
     {% set identifier = model['alias'] %}
@@ -57,6 +61,9 @@
   {% set warn_if = config.get('warn_if') %}
   {% set error_if = config.get('error_if') %}
 
+  {#-- After any store_failures DDL, which runs with the `ddl` statement class. --#}
+  {% do adapter.apply_session_settings(adapter.statement_class_settings('test', config)) %}
+
   {% call statement('main', fetch_result=True) -%}
 
     {{ get_test_sql(main_sql, fail_calc, warn_if, error_if, limit)}}
@@ -66,3 +73,48 @@
   {{ return({'relations': relations}) }}
 
 {%- endmaterialization -%}
+
+
+{#-- A maintained test is deployed once as a materialized view that keeps `fail_calc`
+     up to date; each `dbt test` only reads the maintained value. The MV is rebuilt
+     when the test SQL or `fail_calc` changes, detected through its comment. --#}
+{%- macro risingwave__materialize_maintained_test() -%}
+  {% set fail_calc = config.get('fail_calc') %}
+  {% set target_relation = api.Relation.create(
+      identifier=model['alias'], schema=schema, database=database, type='materialized_view') %}
+  {% set maintained_sql = risingwave__maintained_test_sql(sql, fail_calc) %}
+  {% set fingerprint = risingwave__maintained_test_fingerprint(maintained_sql) %}
+
+  {% if config.get('limit') is not none %}
+    {{ exceptions.warn("`limit` is ignored by maintained test " ~ target_relation ~ ".") }}
+  {% endif %}
+
+  {% set old_relation = adapter.get_relation(
+      database=database, schema=schema, identifier=model['alias']) %}
+  {% if old_relation and (
+      should_full_refresh()
+      or old_relation.type != 'materialized_view'
+      or risingwave__get_relation_comment(old_relation) != fingerprint) %}
+    {% do adapter.drop_relation(old_relation) %}
+    {% set old_relation = none %}
+  {% endif %}
+
+  {% if old_relation is none %}
+    {% do adapter.create_schema(target_relation) %}
+    {% call statement('create_maintained_test') -%}
+      {{ risingwave__create_materialized_view_as(target_relation, maintained_sql) }}
+    {%- endcall %}
+    {{ risingwave__wait_for_background_ddl(target_relation, 'materialized_view') }}
+    {% call statement('comment_maintained_test') -%}
+      {{ risingwave__alter_relation_comment(target_relation, fingerprint) }}
+    {%- endcall %}
+  {% endif %}
+
+  {% do adapter.apply_session_settings(adapter.statement_class_settings('test', config)) %}
+  {% call statement('main', fetch_result=True) -%}
+    {{ risingwave__maintained_test_result_sql(
+        target_relation, config.get('warn_if'), config.get('error_if')) }}
+  {%- endcall %}
+
+  {{ return({'relations': [target_relation]}) }}
+{%- endmacro -%}
@@ -17,7 +17,9 @@
 
   {{ risingwave__validate_model_sql(sql, 'view', true) }}
 
+  {%- set cascade_dependents = [] -%}
   {% if full_refresh_mode and old_relation %}
+    {%- set cascade_dependents = risingwave__prepare_cascade_drop(old_relation) -%}
     {{ adapter.drop_relation(old_relation) }}
   {% endif %}
 
@@ -60,6 +62,8 @@
       {% call statement('swap') -%}
         {{ risingwave__swap_views(old_relation, temp_relation) }}
       {%- endcall %}
+      {% do adapter.invalidate_column_cache(old_relation) %}
+      {% do adapter.invalidate_column_cache(temp_relation) %}
 
       {# Step 3: Conditionally drop the old view (now with temp name) #}
       {% if immediate_cleanup %}
@@ -80,6 +84,8 @@
   {% set should_revoke = should_revoke(existing_relation=old_relation, full_refresh_mode=full_refresh_mode) %}
   {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
 
+  {{ risingwave__rebuild_cascade_dependents(cascade_dependents) }}
+
   {% do persist_docs(target_relation, model) %}
 
   {{ run_hooks(post_hooks, inside_transaction=False) }}
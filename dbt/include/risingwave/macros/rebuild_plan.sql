@@ -0,0 +1,120 @@
+{#-- Dry-run planning: what would each materialization do, and how much would it backfill? --#}
+
+{%- macro risingwave__get_rebuild_plan_snapshot(schemas) -%}
+  {%- if schemas | length == 0 -%}
+    {{ return([]) }}
+  {%- endif -%}
+
+  {%- set schema_literals = [] -%}
+  {%- for schema_name in schemas -%}
+    {%- do schema_literals.append("'" ~ (schema_name | replace("'", "''")) ~ "'") -%}
+  {%- endfor -%}
+
+  {% call statement('rebuild_plan_snapshot', fetch_result=True) -%}
+    select
+      rw_schemas.name as schema_name,
+      rw_relations.name as relation_name,
+      rw_relations.relation_type as relation_type,
+      parent_relation.name as parent_name,
+      rw_table_stats.total_key_count as row_count
+    from rw_catalog.rw_relations
+    join rw_catalog.rw_schemas
+      on rw_relations.schema_id = rw_schemas.id
+    left join rw_catalog.rw_indexes
+      on rw_indexes.id = rw_relations.id
+    left join rw_catalog.rw_relations parent_relation
+      on parent_relation.id = rw_indexes.primary_table_id
+    left join rw_catalog.rw_table_stats
+      on rw_table_stats.id = rw_relations.id
+    where rw_schemas.name in ({{ schema_literals | join(', ') }})
+  {%- endcall %}
+
+  {{ return(load_result('rebuild_plan_snapshot').table) }}
+{%- endmacro %}
+
+{%- macro risingwave__count_relation_rows(relation_keys) -%}
+  {%- if relation_keys | length == 0 -%}
+    {{ return([]) }}
+  {%- endif -%}
+
+  {% call statement('rebuild_plan_row_counts', fetch_result=True) -%}
+    {% for schema_name, relation_name in relation_keys -%}
+      select
+        '{{ schema_name | replace("'", "''") }}' as schema_name,
+        '{{ relation_name | replace("'", "''") }}' as relation_name,
+        count(*) as row_count
+      from {{ adapter.quote(schema_name) }}.{{ adapter.quote(relation_name) }}
+      {%- if not loop.last %}
+      union all
+      {% endif -%}
+    {%- endfor %}
+  {%- endcall %}
+
+  {{ return(load_result('rebuild_plan_row_counts').table) }}
+{%- endmacro %}
+
+{%- macro risingwave__plan_rebuilds(select=none, full_refresh=false, zero_downtime=none, count_missing=false) -%}
+  {%- if zero_downtime is none -%}
+    {%- set zero_downtime = var('zero_downtime', false) -%}
+  {%- endif -%}
+
+  {%- set schemas = adapter.rebuild_plan_schemas(graph, select) -%}
+  {%- set snapshot = risingwave__get_rebuild_plan_snapshot(schemas) -%}
+
+  {%- set row_counts = none -%}
+  {%- if count_missing -%}
+    {%- set missing = adapter.rebuild_plan_missing_row_counts(graph, snapshot, select) -%}
+    {%- set row_counts = risingwave__count_relation_rows(missing) -%}
+  {%- endif -%}
+
+  {{ return(adapter.plan_rebuilds(
+      graph,
+      snapshot,
+      select=select,
+      full_refresh=full_refresh,
+      zero_downtime=zero_downtime,
+      row_counts=row_counts
+  )) }}
+{%- endmacro %}
+
+{#-- User-friendly wrapper macro --#}
+
+{%- macro plan_rebuilds(select=none, full_refresh=false, zero_downtime=none, count_missing=false) -%}
+  {{ print("=== Rebuild Plan ===") }}
+  {{ print("Mode: " ~ ("FULL REFRESH" if full_refresh else "RUN")
+           ~ (", ZERO DOWNTIME" if (zero_downtime if zero_downtime is not none else var('zero_downtime', false)) else "")) }}
+  {{ print("") }}
+
+  {%- set plan = risingwave__plan_rebuilds(
+      select=select,
+      full_refresh=full_refresh,
+      zero_downtime=zero_downtime,
+      count_missing=count_missing
+  ) -%}
+
+  {% if plan | length == 0 %}
+    {{ print("No models selected.") }}
+    {{ return(plan) }}
+  {% endif %}
+
+  {%- set totals = namespace(rows=0, rebuilds=0) -%}
+  {% for planned in plan %}
+    {%- set rows = planned.backfill_rows if planned.backfill_rows is not none else 0 -%}
+    {%- set totals.rows = totals.rows + rows -%}
+    {%- if planned.action != 'no-op' -%}
+      {%- set totals.rebuilds = totals.rebuilds + 1 -%}
+    {%- endif -%}
+    {%- set estimate = rows ~ " rows" -%}
+    {%- if planned.unknown_upstreams | length > 0 -%}
+      {%- set estimate = estimate ~ " (+ unknown: " ~ (planned.unknown_upstreams | join(', ')) ~ ")" -%}
+    {%- endif -%}
+    {{ print(loop.index ~ ". [" ~ planned.action ~ "] " ~ planned.relation
+             ~ " (" ~ planned.materialized ~ "): " ~ estimate) }}
+    {{ print("     " ~ planned.reason) }}
+  {% endfor %}
+
+  {{ print("") }}
+  {{ print(totals.rebuilds ~ " of " ~ plan | length ~ " models would change; estimated backfill "
+           ~ totals.rows ~ " rows") }}
+  {{ return(plan) }}
+{%- endmacro %}
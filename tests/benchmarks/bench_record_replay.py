@@ -0,0 +1,382 @@
+"""Adapter overhead benchmark that replays a recorded `dbt build`.
+
+Record a session once against a running RisingWave. dbt writes every cursor call
+of the run through `PostgresRecordReplayHandle`:
+
+    python tests/benchmarks/bench_record_replay.py record recording.json \\
+        --project-dir tests/e2e/basic_models --profiles-dir ~/.dbt
+
+Replay it offline, as often as needed, against the same project:
+
+    python tests/benchmarks/bench_record_replay.py replay recording.json \\
+        --project-dir tests/e2e/basic_models --profiles-dir ~/.dbt --latency-ms 1
+
+Replay runs `dbt build` in process with a single thread. `psycopg2.connect` returns
+a connection that answers each statement from the recording after a simulated
+latency, so the adapter and its macros run unchanged but no cluster is needed. The
+adapter overhead is the wall time not spent waiting on those statements. Statements
+are matched by their SQL without query comments; a statement the recording does not
+contain is answered with the next recorded result of the same node and reported as
+substituted, which usually means the adapter now issues different SQL.
+
+This file is not collected by pytest.
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+ADAPTER_NODE = "(adapter)"
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_NODE_ID = re.compile(r'"node_id"\s*:\s*"([^"]+)"')
+
+# Statement kinds that change the catalog and are given `--ddl-latency-ms`.
+DDL_KINDS = frozenset({"create", "drop", "alter", "comment", "grant", "revoke"})
+
+
+@dataclass
+class RecordedStatement:
+    node: str
+    sql: str
+    description: Optional[List[Tuple[str, Any]]] = None
+    rowcount: int = -1
+    rows: List[Tuple[Any, ...]] = field(default_factory=list)
+
+
+def normalize_sql(sql: str) -> str:
+    return " ".join(_COMMENT.sub(" ", sql).split())
+
+
+def statement_node(sql: str) -> str:
+    match = _NODE_ID.search(sql)
+    return match.group(1) if match else ADAPTER_NODE
+
+
+def statement_kind(sql: str) -> str:
+    words = normalize_sql(sql).lower().split()
+    return words[0].rstrip(";") if words else "empty"
+
+
+def load_recording(path: Path) -> List[RecordedStatement]:
+    """Group cursor records into statements with the results read after them."""
+    with open(path) as handle:
+        records = sorted(json.load(handle), key=lambda record: record.get("seq") or 0)
+
+    statements: List[RecordedStatement] = []
+    current: Dict[str, RecordedStatement] = {}
+    for record in records:
+        record_type = record.get("type")
+        connection_name = (record.get("params") or {}).get("connection_name")
+        result = record.get("result") or {}
+        if record_type == "CursorExecuteRecord":
+            sql = record["params"]["operation"]
+            statement = RecordedStatement(statement_node(sql), sql)
+            statements.append(statement)
+            current[connection_name] = statement
+            continue
+
+        statement = current.get(connection_name)
+        if statement is None:
+            continue
+        if record_type == "CursorGetDescriptionRecord":
+            statement.description = [tuple(column) for column in result.get("columns") or []]
+        elif record_type == "CursorGetRowCountRecord":
+            statement.rowcount = result.get("rowcount", -1)
+        elif record_type == "CursorFetchAllRecord":
+            statement.rows.extend(_rows(result.get("results")))
+        elif record_type == "CursorFetchManyRecord":
+            statement.rows.extend(_rows(result.get("results")))
+        elif record_type == "CursorFetchOneRecord" and result.get("result") is not None:
+            statement.rows.append(tuple(result["result"]))
+    return statements
+
+
+def _rows(results) -> List[Tuple[Any, ...]]:
+    from dbt.adapters.record.cursor.fetchall import CursorFetchAllResult
+
+    return list(CursorFetchAllResult._from_dict({"results": results or []}).results)
+
+
+class Replay:
+    """Answers statements from a recording and accounts for their simulated latency."""
+
+    def __init__(self, statements, latency_seconds, ddl_latency_seconds):
+        self.latency_seconds = latency_seconds
+        self.ddl_latency_seconds = ddl_latency_seconds
+        self.by_sql: Dict[str, Deque[RecordedStatement]] = defaultdict(deque)
+        self.by_node: Dict[str, Deque[RecordedStatement]] = defaultdict(deque)
+        for statement in statements:
+            self.by_sql[normalize_sql(statement.sql)].append(statement)
+            self.by_node[statement.node].append(statement)
+
+        self.round_trips: Counter = Counter()
+        self.kinds: Dict[str, Counter] = defaultdict(Counter)
+        self.latency: Counter = Counter()
+        self.substituted: Counter = Counter()
+
+    def answer(self, sql: str) -> RecordedStatement:
+        node, kind = statement_node(sql), statement_kind(sql)
+        self.round_trips[node] += 1
+        self.kinds[node][kind] += 1
+
+        delay = self.ddl_latency_seconds if kind in DDL_KINDS else self.latency_seconds
+        self.latency[node] += delay
+        time.sleep(delay)
+
+        recorded = self.by_sql.get(normalize_sql(sql))
+        if recorded:
+            statement = recorded.popleft()
+            self._forget(self.by_node[statement.node], statement)
+            return statement
+
+        self.substituted[node] += 1
+        pending = self.by_node.get(node)
+        if pending:
+            statement = pending.popleft()
+            self._forget(self.by_sql[normalize_sql(statement.sql)], statement)
+            return statement
+        return RecordedStatement(node, sql)
+
+    @staticmethod
+    def _forget(queue, statement) -> None:
+        try:
+            queue.remove(statement)
+        except ValueError:
+            pass
+
+
+class ReplayCursor:
+    def __init__(self, replay: Replay, connection):
+        self.replay = replay
+        self.connection = connection
+        self.result: Optional[RecordedStatement] = None
+        self.position = 0
+        self.closed = False
+
+    def execute(self, sql, bindings=None):
+        # The recording stores the operation without its bindings, like dbt passes it.
+        self.result = self.replay.answer(sql)
+        self.position = 0
+
+    @property
+    def description(self):
+        return None if self.result is None else self.result.description
+
+    @property
+    def rowcount(self):
+        return -1 if self.result is None else self.result.rowcount
+
+    @property
+    def statusmessage(self):
+        if self.result is None:
+            return None
+        rows = self.result.rowcount if self.result.rowcount >= 0 else len(self.result.rows)
+        return "{} {}".format(statement_kind(self.result.sql).upper(), rows)
+
+    def fetchall(self):
+        rows = self.result.rows[self.position :] if self.result else []
+        self.position += len(rows)
+        return rows
+
+    def fetchmany(self, size=1):
+        rows = self.result.rows[self.position : self.position + size] if self.result else []
+        self.position += len(rows)
+        return rows
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def close(self):
+        self.closed = True
+
+
+class ReplayConnection:
+    def __init__(self, replay: Replay):
+        self.replay = replay
+        self.autocommit = False
+        self.closed = 0
+        self.status = 1
+
+    def cursor(self):
+        return ReplayCursor(self.replay, self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def get_backend_pid(self):
+        return 0
+
+    def close(self):
+        self.closed = 1
+
+
+def materializations(manifest_path: Path) -> Dict[str, str]:
+    try:
+        with open(manifest_path) as handle:
+            nodes = json.load(handle).get("nodes", {})
+    except (OSError, ValueError):
+        return {}
+    return {
+        unique_id: node.get("config", {}).get("materialized") or node.get("resource_type")
+        for unique_id, node in nodes.items()
+    }
+
+
+def execution_times(run_results_path: Path) -> Tuple[Optional[float], Dict[str, float]]:
+    """Elapsed time of the run's execution phase and execution time per node."""
+    try:
+        with open(run_results_path) as handle:
+            run_results = json.load(handle)
+    except (OSError, ValueError):
+        return None, {}
+    return run_results.get("elapsed_time"), {
+        result["unique_id"]: result.get("execution_time") or 0.0
+        for result in run_results.get("results", [])
+    }
+
+
+def dbt_args(command: str, args, output_dir: Path) -> List[str]:
+    # Absolute paths: `record` runs dbt from a temporary working directory. Targets and
+    # logs go to `output_dir` so the project is left untouched.
+    argv = [command, "--project-dir", str(args.project_dir.expanduser().resolve())]
+    if args.profiles_dir:
+        argv += ["--profiles-dir", str(args.profiles_dir.expanduser().resolve())]
+    argv += ["--target-path", str(output_dir), "--log-path", str(output_dir)]
+    if args.target:
+        argv += ["--target", args.target]
+    return argv + list(args.dbt_args)
+
+
+def record(args) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(os.environ, DBT_RECORDER_MODE="RECORD", DBT_RECORDER_TYPES="Database")
+        subprocess.run(
+            [sys.executable, "-m", "dbt.cli.main"] + dbt_args("build", args, Path(workdir)),
+            cwd=workdir,
+            env=env,
+            check=True,
+        )
+        shutil.move(str(Path(workdir) / "recording.json"), args.recording)
+    print(f"recorded {len(load_recording(args.recording))} statements to {args.recording}")
+
+
+def replay(args) -> Dict[str, Any]:
+    from dbt.adapters.risingwave import connections
+    from dbt.cli.main import dbtRunner
+
+    for variable in ("DBT_RECORDER_MODE", "DBT_ENGINE_RECORDER_MODE"):
+        os.environ.pop(variable, None)
+
+    session = Replay(
+        load_recording(args.recording), args.latency_ms / 1000, args.ddl_latency_ms / 1000
+    )
+    target_path = Path(tempfile.mkdtemp(prefix="dbt_replay_"))
+    argv = dbt_args("build", args, target_path) + ["--threads", "1"]
+
+    started = time.perf_counter()
+    with patch.object(
+        connections.psycopg2, "connect", side_effect=lambda **_: ReplayConnection(session)
+    ):
+        dbtRunner().invoke(argv)
+    wall_seconds = time.perf_counter() - started
+
+    kinds = materializations(target_path / "manifest.json")
+    elapsed_seconds, times = execution_times(target_path / "run_results.json")
+    shutil.rmtree(target_path, ignore_errors=True)
+
+    per_materialization: Dict[str, Dict[str, Any]] = {}
+    for node in session.round_trips:
+        name = kinds.get(node, ADAPTER_NODE)
+        stats = per_materialization.setdefault(
+            name,
+            {
+                "nodes": 0,
+                "round_trips": 0,
+                "overhead_ms": 0.0,
+                "substituted": 0,
+                "statements": Counter(),
+            },
+        )
+        stats["nodes"] += 1
+        stats["round_trips"] += session.round_trips[node]
+        stats["substituted"] += session.substituted[node]
+        stats["statements"].update(session.kinds[node])
+        if node in times:
+            stats["overhead_ms"] += max(times[node] - session.latency[node], 0) * 1000
+
+    # Parsing is not adapter work; measure overhead over the execution phase when known.
+    latency_seconds = sum(session.latency.values())
+    execution_seconds = wall_seconds if elapsed_seconds is None else elapsed_seconds
+    return {
+        "wall_ms": wall_seconds * 1000,
+        "execution_ms": execution_seconds * 1000,
+        "simulated_latency_ms": latency_seconds * 1000,
+        "adapter_overhead_ms": max(execution_seconds - latency_seconds, 0) * 1000,
+        "round_trips": sum(session.round_trips.values()),
+        "substituted": sum(session.substituted.values()),
+        "materializations": {
+            name: dict(stats, statements=dict(stats["statements"].most_common()))
+            for name, stats in sorted(per_materialization.items())
+        },
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"wall {report['wall_ms']:.1f} ms, execution {report['execution_ms']:.1f} ms, "
+        f"simulated latency "
+        f"{report['simulated_latency_ms']:.1f} ms, adapter overhead "
+        f"{report['adapter_overhead_ms']:.1f} ms"
+    )
+    print(f"{report['round_trips']} round trips, {report['substituted']} substituted")
+    print()
+    print(f"{'materialization':<22} {'nodes':>6} {'trips':>7} {'overhead ms':>12}  statements")
+    for name, stats in report["materializations"].items():
+        statements = ", ".join(f"{kind} {count}" for kind, count in stats["statements"].items())
+        print(
+            f"{name:<22} {stats['nodes']:>6} {stats['round_trips']:>7} "
+            f"{stats['overhead_ms']:>12.1f}  {statements}"
+        )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("mode", choices=("record", "replay"))
+    parser.add_argument("recording", type=Path)
+    parser.add_argument("--project-dir", type=Path, required=True)
+    parser.add_argument("--profiles-dir", type=Path)
+    parser.add_argument("--target")
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    parser.add_argument("--ddl-latency-ms", type=float, default=20.0)
+    parser.add_argument("--output", type=Path, help="also write the replay report as JSON")
+    parser.add_argument("dbt_args", nargs="*", help="extra `dbt build` arguments after `--`")
+    args = parser.parse_args(argv)
+
+    if args.mode == "record":
+        record(args)
+        return
+
+    report = replay(args)
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
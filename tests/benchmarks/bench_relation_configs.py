@@ -0,0 +1,89 @@
+"""Microbenchmark for index and materialized view config construction.
+
+Run with `python tests/benchmarks/bench_relation_configs.py [models]`. This file is
+not collected by pytest.
+"""
+
+import sys
+import timeit
+import tracemalloc
+from types import SimpleNamespace
+
+import agate
+
+from dbt.adapters.risingwave.relation_configs import (
+    RisingWaveIndexConfig,
+    RisingWaveMaterializedViewConfig,
+)
+
+
+def model_index_entries(models):
+    return [
+        [
+            {"columns": [f"id_{model}"]},
+            {"columns": [f"tenant_{model}", "ts"], "include": ["amount"]},
+        ]
+        for model in range(models)
+    ]
+
+
+def relation_index_tables(models):
+    column_names = ["name", "column_names"]
+    return [
+        agate.Table(
+            [
+                (f"__dbt_index_mv_{model}_id_{model}", f"id_{model}"),
+                (f"__dbt_index_mv_{model}_tenant_{model}_ts", f"tenant_{model},ts"),
+            ],
+            column_names,
+        )
+        for model in range(models)
+    ]
+
+
+def per_entry(entries):
+    return [
+        [
+            RisingWaveIndexConfig.from_dict(RisingWaveIndexConfig.parse_model_node(index))
+            for index in indexes
+        ]
+        for indexes in entries
+    ]
+
+
+def materialized_view_configs(entries, tables):
+    configs = []
+    for model, (indexes, table) in enumerate(zip(entries, tables)):
+        relation_config = SimpleNamespace(
+            identifier=f"mv_{model}", compiled_code="select 1", config={"indexes": indexes}
+        )
+        new = RisingWaveMaterializedViewConfig.from_config(relation_config)
+        existing = RisingWaveMaterializedViewConfig.from_relation_results({"indexes": table})
+        configs.append(set(new.indexes) ^ set(existing.indexes))
+    return configs
+
+
+def measure(name, func, *args, number=3):
+    seconds = min(timeit.repeat(lambda: func(*args), number=1, repeat=number))
+    tracemalloc.start()
+    result = func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{name:<36} {seconds * 1000:>10.1f} ms {peak / 1024 / 1024:>10.2f} MiB")
+
+
+def main(models=10_000):
+    entries = model_index_entries(models)
+    tables = relation_index_tables(models)
+    print(f"{models} models, 2 indexes each")
+    measure("index configs, from_dict per entry", per_entry, entries)
+    measure(
+        "index configs, bulk",
+        lambda: [RisingWaveIndexConfig.from_model_node_entries(indexes) for indexes in entries],
+    )
+    measure("materialized view config changes", materialized_view_configs, entries, tables)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""Throughput and latency benchmark for a dbt function resource.
+
+For every candidate set of function options, the function is redeployed through
+the adapter's function materialization from a temporary copy of the project, then
+queried with synthetic input at each rows-per-query and concurrency level:
+
+    python3 scripts/udf_benchmark.py double_price_js \\
+        --options '[{}, {"async": true}]' --rows 1000,100000 --concurrency 1,8
+
+Each configuration reports rows/s and the p50 and p99 latency of one call, which
+is one `SELECT` over `--rows` generated inputs. The winning options are those with
+the best mean rows/s across the grid; `--write-config` stores them in the
+function's YAML config. `batch: true` changes the JavaScript calling convention to
+arrays, so only list it for functions written for it.
+
+Run from `tests/e2e/functions` with the UDF servers from this directory running.
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import psycopg2
+import yaml
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+# Options a function config may set for each language.
+TUNABLE_OPTIONS = {
+    "javascript": ("async", "batch", "always_retry_on_network_error"),
+    "python": ("always_retry_on_network_error",),
+    "sql": (),
+}
+DEFAULT_OPTIONS = {
+    "javascript": [{}, {"async": True}],
+    "python": [{}],
+    "sql": [{}],
+}
+
+
+def find_function(project_dir, name):
+    for path in sorted((project_dir / "functions").glob("*.yml")):
+        with open(path) as handle:
+            document = yaml.safe_load(handle) or {}
+        for function in document.get("functions") or []:
+            if function.get("name") == name:
+                return path, function
+    raise SystemExit(f"function `{name}` not found under {project_dir / 'functions'}")
+
+
+def synthetic_argument(data_type, position):
+    """SQL for one generated argument value of `data_type`, derived from `t.x`."""
+    data_type = data_type.lower()
+    value = "t.x + {}".format(position)
+    if data_type.startswith(("varchar", "text", "character", "string")):
+        return "('v' || ({}))::{}".format(value, data_type)
+    if data_type.startswith("bool"):
+        return "(({}) % 2 = 0)".format(value)
+    return "({})::{}".format(value, data_type)
+
+
+def benchmark_sql(schema, function, rows):
+    arguments = ", ".join(
+        synthetic_argument(argument["data_type"], position)
+        for position, argument in enumerate(function.get("arguments") or [])
+    )
+    return "select count({}.{}({})) from generate_series(1, {}) as t(x)".format(
+        schema, function["name"], arguments, int(rows)
+    )
+
+
+def deploy(args, function_path, function, options):
+    """Build the function from a project copy whose config carries `options`."""
+    with tempfile.TemporaryDirectory() as workdir:
+        project_copy = Path(workdir) / "project"
+        shutil.copytree(
+            args.project_dir,
+            project_copy,
+            ignore=shutil.ignore_patterns("target", "logs", "dbt_packages"),
+        )
+        copy_path = project_copy / function_path.relative_to(args.project_dir)
+        with open(copy_path) as handle:
+            document = yaml.safe_load(handle)
+        for candidate in document["functions"]:
+            if candidate["name"] == function["name"]:
+                config = candidate.setdefault("config", {})
+                for option in TUNABLE_OPTIONS.get(config.get("language", "sql"), ()):
+                    config.pop(option, None)
+                config.update(options)
+        with open(copy_path, "w") as handle:
+            yaml.safe_dump(document, handle, sort_keys=False)
+
+        command = [sys.executable, "-m", "dbt.cli.main", "build", "--select", function["name"]]
+        command += ["--project-dir", str(project_copy)]
+        if args.profiles_dir:
+            command += ["--profiles-dir", str(args.profiles_dir)]
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+
+
+def run_configuration(args, sql, concurrency):
+    """Issue `--queries` calls per worker; returns (rows/s, latencies in seconds)."""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def worker():
+        connection = psycopg2.connect(
+            host=args.host, port=args.port, user=args.user, dbname=args.dbname
+        )
+        connection.autocommit = True
+        try:
+            cursor = connection.cursor()
+            cursor.execute(sql)  # warm up the UDF runtime outside the measurement
+            cursor.fetchall()
+            barrier.wait()
+            for _ in range(args.queries):
+                started = time.perf_counter()
+                cursor.execute(sql)
+                cursor.fetchall()
+                with lock:
+                    latencies.append(time.perf_counter() - started)
+        except Exception as exc:  # reported after all workers finish
+            errors.append(exc)
+            barrier.abort()
+        finally:
+            connection.close()
+
+    barrier = threading.Barrier(concurrency + 1)
+    workers = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in workers:
+        thread.start()
+    try:
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        pass
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if errors:
+        raise errors[0]
+    return len(latencies) * args.rows_value / elapsed, latencies
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def write_config(function_path, name, options):
+    with open(function_path) as handle:
+        document = yaml.safe_load(handle)
+    for function in document["functions"]:
+        if function["name"] == name:
+            config = function.setdefault("config", {})
+            for option in TUNABLE_OPTIONS.get(config.get("language", "sql"), ()):
+                config.pop(option, None)
+            config.update(options)
+    with open(function_path, "w") as handle:
+        yaml.safe_dump(document, handle, sort_keys=False)
+
+
+def parse_ints(value):
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("function")
+    parser.add_argument("--project-dir", type=Path, default=PROJECT_DIR)
+    parser.add_argument("--profiles-dir", type=Path)
+    parser.add_argument("--options", type=json.loads, help="JSON list of option sets")
+    parser.add_argument("--rows", type=parse_ints, default=[1_000, 10_000, 100_000])
+    parser.add_argument("--concurrency", type=parse_ints, default=[1, 4, 8])
+    parser.add_argument("--queries", type=int, default=10, help="calls per worker")
+    parser.add_argument("--schema", default="public")
+    parser.add_argument("--host", default=os.getenv("DBT_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("DBT_PORT", "4566")))
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--dbname", default="dev")
+    parser.add_argument("--write-config", action="store_true")
+    args = parser.parse_args()
+    args.project_dir = args.project_dir.resolve()
+
+    function_path, function = find_function(args.project_dir, args.function)
+    language = (function.get("config") or {}).get("language", "sql")
+    candidates = args.options or DEFAULT_OPTIONS.get(language, [{}])
+    for options in candidates:
+        unknown = set(options) - set(TUNABLE_OPTIONS.get(language, ()))
+        if unknown:
+            raise SystemExit(f"options {sorted(unknown)} do not apply to {language} functions")
+
+    print(f"{'options':<32} {'rows':>8} {'conc':>5} {'rows/s':>12} {'p50 ms':>9} {'p99 ms':>9}")
+    scores = []
+    for options in candidates:
+        # dbt does not replace an existing function, so drop it before redeploying.
+        connection = psycopg2.connect(
+            host=args.host, port=args.port, user=args.user, dbname=args.dbname
+        )
+        connection.autocommit = True
+        try:
+            connection.cursor().execute(
+                f"drop function if exists {args.schema}.{function['name']}"
+            )
+        finally:
+            connection.close()
+        deploy(args, function_path, function, options)
+
+        throughputs = []
+        for rows in args.rows:
+            args.rows_value = rows
+            sql = benchmark_sql(args.schema, function, rows)
+            for concurrency in args.concurrency:
+                rows_per_second, latencies = run_configuration(args, sql, concurrency)
+                throughputs.append(rows_per_second)
+                print(
+                    f"{json.dumps(options):<32} {rows:>8} {concurrency:>5} "
+                    f"{rows_per_second:>12,.0f} {percentile(latencies, 0.5) * 1000:>9.1f} "
+                    f"{percentile(latencies, 0.99) * 1000:>9.1f}"
+                )
+        scores.append((statistics.mean(throughputs), options))
+
+    best_score, best_options = max(scores, key=lambda score: score[0])
+    print(f"\nbest options: {json.dumps(best_options)} ({best_score:,.0f} rows/s mean)")
+    if args.write_config:
+        write_config(function_path, function["name"], best_options)
+        print(f"wrote options to {function_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+from dbt.adapters.risingwave import backfill
+
+
+def quote(name):
+    return '"{}"'.format(name)
+
+
+def test_auto_backfill_order_backfills_smaller_inputs_before_the_largest():
+    rows = [
+        ("analytics", "user_events", "table", 5_000_000),
+        ("analytics", "users", "materialized view", 20_000),
+        ("analytics", "accounts", "table", 300),
+        ("raw", "clicks", "source", None),
+        ("analytics", "recent_users", "view", None),
+        ("analytics", "new_table", "table", None),
+    ]
+
+    assert backfill.auto_backfill_order(rows, quote) == [
+        '"analytics"."accounts" -> "analytics"."user_events"',
+        '"analytics"."users" -> "analytics"."user_events"',
+    ]
+
+
+def test_auto_backfill_order_needs_two_sized_relations_of_different_size():
+    assert backfill.auto_backfill_order([("analytics", "facts", "table", 10)], quote) == []
+    assert (
+        backfill.auto_backfill_order(
+            [("analytics", "a", "table", 10), ("analytics", "b", "table", 10)], quote
+        )
+        == []
+    )
+
+
+def test_choose_settings_scales_parallelism_from_previous_throughput():
+    history = [
+        backfill.BackfillRun(
+            relation="analytics.orders_mv",
+            recorded_at="2026-01-01T00:00:00+00:00",
+            input_rows=1_000_000,
+            duration_seconds=100,
+            parallelism=4,
+        )
+    ]
+    tuning = {"min_parallelism": 2, "max_parallelism": 32, "target_backfill_seconds": 100}
+
+    assert backfill.choose_settings(history, 4_000_000, tuning) == {"streaming_parallelism": 16}
+    assert backfill.choose_settings(history, 100_000_000, tuning) == {"streaming_parallelism": 32}
+    assert backfill.choose_settings(history, 10, tuning) == {"streaming_parallelism": 2}
+    assert backfill.choose_settings([], 10, tuning) == {}
+    assert backfill.choose_settings([], 10, {"serverless_backfill_rows": 10}) == {
+        "enable_serverless_backfill": True
+    }
+
+
+def test_backfill_history_keeps_the_most_recent_runs(tmp_path):
+    path = backfill.history_path(tmp_path, "model.project.orders_mv")
+    for duration in range(3):
+        backfill.append_history(
+            path,
+            backfill.BackfillRun(
+                relation="analytics.orders_mv",
+                recorded_at="2026-01-01T00:00:00+00:00",
+                input_rows=10,
+                duration_seconds=duration,
+            ),
+            limit=2,
+        )
+
+    assert [run.duration_seconds for run in backfill.load_history(path)] == [1, 2]
+    assert backfill.input_rows(
+        [("analytics", "orders", "table", 10), ("raw", "events", "source", None)]
+    ) == 10
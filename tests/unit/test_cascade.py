@@ -0,0 +1,229 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import agate
+import pytest
+from dbt_common.clients.jinja import CallableMacroGenerator, MacroReturn
+
+from dbt.adapters.risingwave import cascade
+from dbt.adapters.risingwave.relation import RisingWaveRelation
+
+MACRO_DIR = Path(__file__).resolve().parents[2] / "dbt" / "include" / "risingwave" / "macros"
+CASCADE_MACROS = MACRO_DIR / "cascade.sql"
+
+
+def edge(dependent_id, name, relation_type, definition, referenced_id, referenced_name):
+    return (
+        dependent_id,
+        "analytics",
+        name,
+        relation_type,
+        definition,
+        referenced_id,
+        "analytics",
+        referenced_name,
+    )
+
+
+# orders <- orders_mv <- (revenue_mv, orders_sink); revenue_mv also reads orders directly.
+ROWS = [
+    edge(
+        2, "orders_mv", "materialized view", "CREATE MATERIALIZED VIEW orders_mv ...", 1, "orders"
+    ),
+    edge(3, "__dbt_index_orders_id", "index", "CREATE INDEX ... ON orders(id)", 1, "orders"),
+    edge(
+        4,
+        "revenue_mv",
+        "materialized view",
+        "CREATE MATERIALIZED VIEW revenue_mv ...",
+        2,
+        "orders_mv",
+    ),
+    edge(
+        4,
+        "revenue_mv",
+        "materialized view",
+        "CREATE MATERIALIZED VIEW revenue_mv ...",
+        1,
+        "orders",
+    ),
+    edge(5, "orders_sink", "sink", "CREATE SINK orders_sink FROM orders_mv ...", 2, "orders_mv"),
+    edge(
+        6,
+        "__dbt_index_revenue_mv_day",
+        "index",
+        "CREATE INDEX ON revenue_mv(day)",
+        4,
+        "revenue_mv",
+    ),
+    edge(8, "unrelated_mv", "materialized view", "CREATE MATERIALIZED VIEW ...", 7, "customers"),
+]
+
+
+def render_cascade_macro(name, config, *args, extra_context=None):
+    def dbt_return(value):
+        raise MacroReturn(value)
+
+    def raise_compiler_error(message):
+        raise ValueError(message)
+
+    macro = SimpleNamespace(name=name, macro_sql=CASCADE_MACROS.read_text())
+    context = {
+        "config": config,
+        "execute": True,
+        "exceptions": SimpleNamespace(raise_compiler_error=raise_compiler_error),
+        "return": dbt_return,
+        "log": lambda message, info=False: "",
+    }
+    context.update(extra_context or {})
+    return CallableMacroGenerator(macro, context)(*args)
+
+
+def test_dependents_are_ordered_after_every_dropped_input():
+    dependents = cascade.cascade_set(ROWS, ("analytics", "orders"))
+
+    assert [(dependent.level, dependent.name) for dependent in dependents] == [
+        (1, "orders_mv"),
+        (2, "orders_sink"),
+        (2, "revenue_mv"),
+        (3, "__dbt_index_revenue_mv_day"),
+    ]
+    assert dependents[1].wait_keyword == "SINK"
+
+
+def test_selected_dependents_and_their_indexes_are_left_to_the_run():
+    dependents = cascade.cascade_set(
+        ROWS, ("analytics", "orders"), selected={("analytics", "revenue_mv")}
+    )
+
+    assert [(dependent.name, dependent.reads_selected) for dependent in dependents] == [
+        ("orders_mv", ()),
+        ("orders_sink", ()),
+    ]
+
+    # A dependent behind a selected one cannot be rebuilt before the run recreates it.
+    dependents = cascade.cascade_set(
+        ROWS, ("analytics", "orders"), selected={("analytics", "orders_mv")}
+    )
+    assert [(dependent.name, dependent.reads_selected) for dependent in dependents] == [
+        ("orders_sink", ("analytics.orders_mv",)),
+        ("revenue_mv", ("analytics.orders_mv",)),
+        ("__dbt_index_revenue_mv_day", ("analytics.orders_mv",)),
+    ]
+
+
+def test_prepare_cascade_drop_refuses_or_returns_dependents_to_rebuild():
+    relation = RisingWaveRelation.create(schema="analytics", identifier="orders", type="table")
+    context = {
+        "adapter": SimpleNamespace(
+            cascade_dependents=lambda rows, relation, selected_nodes: cascade.cascade_set(
+                rows,
+                (relation.schema, relation.identifier),
+                {(node["schema"], node["alias"]) for node in selected_nodes},
+            )
+        ),
+        "risingwave__get_relation_dependencies": lambda: ROWS,
+        "graph": {"nodes": {}},
+    }
+
+    with pytest.raises(ValueError, match="would drop 4 dependent relations"):
+        render_cascade_macro(
+            "risingwave__prepare_cascade_drop",
+            {"on_cascade_drop": "error"},
+            relation,
+            extra_context=context,
+        )
+    dropped = render_cascade_macro(
+        "risingwave__prepare_cascade_drop", {}, relation, extra_context=context
+    )
+    rebuilt = render_cascade_macro(
+        "risingwave__prepare_cascade_drop",
+        {"on_cascade_drop": "rebuild"},
+        relation,
+        extra_context=context,
+    )
+
+    assert dropped == []
+    assert [dependent.name for dependent in rebuilt][:1] == ["orders_mv"]
+    assert len(rebuilt) == 4
+
+    # Dependents selected in the run are neither refused nor rebuilt.
+    context["graph"] = {
+        "nodes": {
+            "model.demo.orders_mv": {"schema": "analytics", "alias": "orders_mv"},
+            "model.demo.orders_sink": {"schema": "analytics", "alias": "orders_sink"},
+            "model.demo.revenue_mv": {"schema": "analytics", "alias": "revenue_mv"},
+        }
+    }
+    context["selected_resources"] = list(context["graph"]["nodes"])
+    assert (
+        render_cascade_macro(
+            "risingwave__prepare_cascade_drop",
+            {"on_cascade_drop": "error"},
+            relation,
+            extra_context=context,
+        )
+        == []
+    )
+
+    context["selected_resources"] = ["model.demo.orders_mv"]
+    with pytest.raises(ValueError, match="reads analytics.orders_mv, which this run rebuilds"):
+        render_cascade_macro(
+            "risingwave__prepare_cascade_drop",
+            {"on_cascade_drop": "rebuild"},
+            relation,
+            extra_context=context,
+        )
+
+
+def test_rebuild_creates_each_level_in_the_background_before_waiting():
+    queries = []
+    settings = []
+
+    def run_query(sql):
+        if sql == "show search_path":
+            return agate.Table([('"$user", public, staging',)], ["search_path"])
+        queries.append(sql)
+
+    context = {
+        "adapter": SimpleNamespace(apply_session_settings=settings.append),
+        "api": SimpleNamespace(Relation=RisingWaveRelation),
+        "database": "dev",
+        "run_query": run_query,
+    }
+
+    render_cascade_macro(
+        "risingwave__rebuild_cascade_dependents",
+        {},
+        cascade.cascade_set(ROWS, ("analytics", "orders")),
+        extra_context=context,
+    )
+
+    assert queries == [
+        ROWS[0][4],
+        'WAIT MATERIALIZED VIEW "analytics"."orders_mv"',
+        ROWS[4][4],
+        ROWS[2][4],
+        'WAIT SINK "analytics"."orders_sink"',
+        'WAIT MATERIALIZED VIEW "analytics"."revenue_mv"',
+        ROWS[5][4],
+        'WAIT INDEX "analytics"."__dbt_index_revenue_mv_day"',
+    ]
+    assert settings[0] == {"background_ddl": True, "search_path": "analytics"}
+    # The profile's search_path is restored, not reset to the server default.
+    assert settings[-1] == {"background_ddl": None, "search_path": '"$user", public, staging'}
+
+
+def test_full_refresh_drops_check_the_cascade_set_first():
+    for name in (
+        "view",
+        "materialized_view",
+        "materializedview",
+        "table",
+        "table_with_connector",
+        "source",
+        "incremental",
+    ):
+        body = (MACRO_DIR / "materializations" / f"{name}.sql").read_text()
+        assert "risingwave__prepare_cascade_drop(" in body, name
+        assert "risingwave__rebuild_cascade_dependents(cascade_dependents)" in body, name
@@ -4,6 +4,8 @@ from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import Mock, call, patch
 
+import pytest
+
 
 CONNECTIONS = (
     Path(__file__).resolve().parents[2]
@@ -139,6 +141,253 @@ def test_cancel_quotes_compound_process_id_with_query_binding():
     ]
 
 
+def test_session_settings_only_send_changes():
+    connections = load_local_connections_module()
+    manager = connections.RisingWaveConnectionManager.__new__(
+        connections.RisingWaveConnectionManager
+    )
+    credentials = connections.RisingWaveCredentials.from_dict(
+        {
+            "host": "127.0.0.1",
+            "user": "root",
+            "password": "",
+            "port": 4566,
+            "dbname": "dev",
+            "schema": "public",
+            "backfill_rate_limit": 1000,
+        }
+    )
+    connection = SimpleNamespace(state="open", credentials=credentials, handle=object())
+    manager.get_thread_connection = Mock(return_value=connection)
+    manager.get_if_exists = Mock(return_value=connection)
+    manager.add_query = Mock()
+    connections.RisingWaveConnectionManager._session_state[id(connection.handle)] = (
+        connections.RisingWaveConnectionManager._profile_session_state(credentials)
+    )
+
+    assert manager.apply_session_settings(
+        {"backfill_rate_limit": 1000, "streaming_parallelism": 4, "background_ddl": True}
+    ) == ["SET streaming_parallelism = 4", "SET background_ddl = true"]
+    assert manager.apply_session_settings({"streaming_parallelism": 4}) == []
+    assert manager.apply_session_settings({"backfill_rate_limit": 10}) == [
+        "SET backfill_rate_limit = 10"
+    ]
+
+    assert manager.session_setting_statements({"backfill_rate_limit": 10}) == []
+    assert manager.session_setting_statements({"backfill_rate_limit": 1000}) == [
+        "SET backfill_rate_limit = 1000"
+    ]
+    assert manager.add_query.call_args_list == [
+        call("SET streaming_parallelism = 4; SET background_ddl = true", auto_begin=False),
+        call("SET backfill_rate_limit = 10", auto_begin=False),
+    ]
+
+
+def test_statement_class_settings_do_not_carry_over_between_classes():
+    connections = load_local_connections_module()
+    manager = connections.RisingWaveConnectionManager.__new__(
+        connections.RisingWaveConnectionManager
+    )
+    connection = SimpleNamespace(state="open", handle=object())
+    manager.get_thread_connection = Mock(return_value=connection)
+    defaults = connections.STATEMENT_CLASS_DEFAULTS
+
+    assert manager.session_setting_statements(
+        {**defaults["catalog"], "statement_timeout": 30000}
+    ) == ["SET query_mode = 'local'", "SET statement_timeout = 30000"]
+    assert manager.session_setting_statements(defaults["ddl"]) == [
+        "SET query_mode = DEFAULT",
+        "SET statement_timeout = DEFAULT",
+    ]
+    assert manager.session_setting_statements(defaults["test"]) == [
+        "SET query_mode = 'distributed'"
+    ]
+
+
+def test_adapter_response_records_the_session_query_mode():
+    connections = load_local_connections_module()
+    handle = object()
+    cursor = SimpleNamespace(statusmessage="SELECT 3", rowcount=3, connection=handle)
+
+    response = connections.RisingWaveConnectionManager.get_response(cursor)
+    assert response.query_mode is None
+
+    connections.RisingWaveConnectionManager._session_state[id(handle)] = {
+        "query_mode": "'local'"
+    }
+    response = connections.RisingWaveConnectionManager.get_response(cursor)
+    assert (response.code, response.rows_affected, response.query_mode) == ("SELECT", 3, "local")
+    assert response.to_dict()["query_mode"] == "local"
+
+
+def test_open_fails_over_to_the_next_frontend_and_balances_connections():
+    connections = load_local_connections_module()
+    credentials = connections.RisingWaveCredentials.from_dict(
+        {
+            "hosts": ["fe-1", "fe-2:4567", "fe-3"],
+            "user": "root",
+            "password": "",
+            "port": 4566,
+            "dbname": "dev",
+            "schema": "public",
+        }
+    )
+    assert credentials.host == "fe-1"
+    assert credentials.unique_field == "fe-1,fe-2:4567,fe-3"
+
+    def retry_connection(connection, connect, **kwargs):
+        connection.handle = connect()
+        connection.state = "open"
+        return connection
+
+    def connect(host, port, **kwargs):
+        if host == "fe-1":
+            raise connections.psycopg2.errors.OperationalError("connection refused")
+        return SimpleNamespace(autocommit=False, host=host, port=port)
+
+    opened = []
+    with (
+        patch.object(connections, "get_record_mode_from_env", return_value=None),
+        patch.object(connections.psycopg2, "connect", side_effect=connect),
+        patch.object(
+            connections.RisingWaveConnectionManager,
+            "retry_connection",
+            side_effect=retry_connection,
+        ),
+    ):
+        for _ in range(3):
+            connection = SimpleNamespace(state="init", credentials=credentials, handle=None)
+            opened.append(connections.RisingWaveConnectionManager._super_open(connection))
+
+    # fe-1 failed once and is skipped while it cools down.
+    assert [(c.handle.host, c.handle.port) for c in opened] == [
+        ("fe-2", 4567),
+        ("fe-3", 4566),
+        ("fe-2", 4567),
+    ]
+    pool = connections.RisingWaveConnectionManager._host_pool(credentials)
+    assert pool.describe() == "fe-1:4566=0, fe-2:4567=2, fe-3:4566=1"
+
+    with patch.object(connections.PostgresConnectionManager, "close"):
+        connections.RisingWaveConnectionManager.close(opened[0])
+    assert pool.describe() == "fe-1:4566=0, fe-2:4567=1, fe-3:4566=1"
+
+    # Record mode wraps the raw handle; the frontend is still released on close.
+    with (
+        patch.object(
+            connections,
+            "get_record_mode_from_env",
+            return_value=connections.RecorderMode.RECORD,
+        ),
+        patch.object(connections.psycopg2, "connect", side_effect=connect),
+        patch.object(
+            connections.RisingWaveConnectionManager,
+            "retry_connection",
+            side_effect=retry_connection,
+        ),
+    ):
+        connection = SimpleNamespace(state="init", credentials=credentials, handle=None)
+        recorded = connections.RisingWaveConnectionManager._super_open(connection)
+    assert isinstance(recorded.handle, connections.PostgresRecordReplayHandle)
+    assert pool.describe() == "fe-1:4566=0, fe-2:4567=1, fe-3:4566=2"
+
+    with patch.object(connections.PostgresConnectionManager, "close"):
+        connections.RisingWaveConnectionManager.close(recorded)
+    assert pool.describe() == "fe-1:4566=0, fe-2:4567=1, fe-3:4566=1"
+
+
+def test_open_releases_the_frontend_when_session_setup_fails():
+    connections = load_local_connections_module()
+    credentials = connections.RisingWaveCredentials.from_dict(
+        {
+            "hosts": ["fe-1", "fe-2"],
+            "user": "root",
+            "password": "",
+            "port": 4566,
+            "dbname": "dev",
+            "schema": "public",
+            "role": "analyst",
+        }
+    )
+    pool = connections.RisingWaveConnectionManager._host_pool(credentials)
+
+    def retry_connection(connection, connect, **kwargs):
+        connection.handle = connect()
+        connection.state = "open"
+        return connection
+
+    def failing_cursor():
+        cursor = Mock()
+        cursor.execute.side_effect = connections.psycopg2.errors.ProgrammingError("denied")
+        return cursor
+
+    def connect(host, port, **kwargs):
+        return SimpleNamespace(autocommit=False, cursor=failing_cursor)
+
+    with (
+        patch.object(connections, "get_record_mode_from_env", return_value=None),
+        patch.object(connections.psycopg2, "connect", side_effect=connect),
+        patch.object(
+            connections.RisingWaveConnectionManager,
+            "retry_connection",
+            side_effect=retry_connection,
+        ),
+    ):
+        # `set role` fails.
+        connection = SimpleNamespace(state="init", credentials=credentials, handle=None)
+        with pytest.raises(connections.psycopg2.errors.ProgrammingError):
+            connections.RisingWaveConnectionManager.open(connection)
+        assert pool.describe() == "fe-1:4566=0, fe-2:4566=0"
+
+        # The session SETs fail.
+        credentials.role = None
+        connection = SimpleNamespace(state="init", credentials=credentials, handle=None)
+        with pytest.raises(connections.psycopg2.errors.ProgrammingError):
+            connections.RisingWaveConnectionManager.open(connection)
+        assert pool.describe() == "fe-1:4566=0, fe-2:4566=0"
+        assert id(connection) not in connections.RisingWaveConnectionManager._handle_hosts
+
+
+def test_adapter_response_reads_the_session_state_of_a_recorded_connection():
+    connections = load_local_connections_module()
+    connection = SimpleNamespace(name="model.orders", handle=None)
+    connection.handle = connections.PostgresRecordReplayHandle(object(), connection)
+    connections.RisingWaveConnectionManager._session_state[id(connection.handle)] = {
+        "query_mode": "'distributed'"
+    }
+    cursor = SimpleNamespace(statusmessage="SELECT 1", rowcount=1, connection=connection)
+
+    response = connections.RisingWaveConnectionManager.get_response(cursor)
+    assert response.query_mode == "distributed"
+
+
+def test_host_pool_least_connections_and_cooldown():
+    from dbt.adapters.risingwave.hosts import HostPool
+
+    now = [0.0]
+    pool = HostPool(
+        [("a", 1), ("b", 1)],
+        strategy="least_connections",
+        cooldown_seconds=10,
+        clock=lambda: now[0],
+    )
+
+    assert pool.acquire() == ("a", 1)
+    assert pool.acquire() == ("b", 1)
+    pool.release(("a", 1))
+    assert pool.acquire() == ("a", 1)
+
+    pool.mark_unhealthy(("a", 1))
+    assert pool.acquire() == ("b", 1)
+    # A frontend cooling down is still used as a last resort.
+    assert pool.acquire(exclude={("b", 1)}) == ("a", 1)
+    now[0] = 11
+    pool.release(("a", 1))
+    pool.release(("a", 1))
+    assert pool.acquire() == ("a", 1)
+    assert pool.describe() == "a:1=1, b:1=2"
+
+
 def load_local_connections_module():
     module_name = "local_risingwave_connections_for_cancel_tests"
     spec = importlib.util.spec_from_file_location(module_name, CONNECTIONS)
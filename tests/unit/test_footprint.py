@@ -0,0 +1,90 @@
+from pathlib import Path
+
+from dbt.adapters.contracts.connection import AdapterResponse
+
+from dbt.adapters.risingwave import footprint
+from dbt.adapters.risingwave.impl import RisingWaveAdapter
+from dbt.adapters.risingwave.relation import RisingWaveRelation
+
+FOOTPRINT_MACROS = (
+    Path(__file__).resolve().parents[2]
+    / "dbt"
+    / "include"
+    / "risingwave"
+    / "macros"
+    / "footprint.sql"
+)
+
+ROWS = [
+    ("analytics", "orders_mv", "materialized view", None, 1000, 9000, 8000, 3),
+    ("analytics", "__dbt_index_orders_mv_id", "index", "orders_mv", 1000, 500, 0, 0),
+    ("analytics", "customers", "table", None, 50, 200, 0, 0),
+    ("analytics", "orders_sink", "sink", None, None, 300, 300, 1),
+    ("analytics", "unmanaged_mv", "materialized view", None, 10, 99999, 99999, 2),
+]
+
+
+def model(name, materialized):
+    return {
+        "unique_id": f"model.project.{name}",
+        "name": name,
+        "alias": name,
+        "schema": "analytics",
+        "resource_type": "model",
+        "config": {"materialized": materialized},
+    }
+
+
+def test_model_footprint_includes_its_indexes():
+    summary = footprint.summarize(footprint.from_rows(ROWS), ("analytics", "orders_mv"))
+
+    assert summary == {
+        "row_count": 1000,
+        "storage_bytes": 9500,
+        "state_bytes": 8000,
+        "state_tables": 3,
+        "indexes": 1,
+    }
+
+
+def test_models_are_ranked_by_state_size_with_their_owner():
+    nodes = {
+        node["unique_id"]: node
+        for node in (
+            model("customers", "table"),
+            model("orders_sink", "sink"),
+            model("orders_mv", "materialized_view"),
+            model("orders_view", "view"),
+            model("missing_mv", "materialized_view"),
+        )
+    }
+
+    ranked = footprint.rank_models(nodes, footprint.from_rows(ROWS))
+
+    assert [(item["unique_id"], item["state_bytes"]) for item in ranked] == [
+        ("model.project.orders_mv", 8000),
+        ("model.project.orders_sink", 300),
+        ("model.project.customers", 0),
+    ]
+    assert ranked[0]["relation"] == "analytics.orders_mv"
+    assert footprint.format_bytes(8000) == "7.8 KiB"
+
+
+def test_footprint_is_attached_to_the_adapter_response():
+    adapter = RisingWaveAdapter.__new__(RisingWaveAdapter)
+    relation = RisingWaveRelation.create(schema="analytics", identifier="customers")
+    response = AdapterResponse(_message="SELECT 50", code="SELECT", rows_affected=50)
+
+    attached = adapter.attach_footprint(response, ROWS, relation)
+
+    assert attached.to_dict(omit_none=True)["footprint"]["storage_bytes"] == 200
+    assert str(attached) == "SELECT 50"
+
+
+def test_footprints_are_read_in_one_catalog_query():
+    macros = FOOTPRINT_MACROS.read_text()
+
+    assert macros.count("call statement('relation_footprints'") == 1
+    assert "rw_catalog.rw_internal_tables" in macros
+    assert "rw_internal_tables.job_id" in macros
+    assert "config.get('collect_footprint', false)" in macros
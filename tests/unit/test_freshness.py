@@ -0,0 +1,103 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+from dbt_common.clients.jinja import CallableMacroGenerator, MacroReturn
+
+from dbt.adapters.risingwave.relation import RisingWaveRelation
+
+FRESHNESS_MACROS = (
+    Path(__file__).resolve().parents[2]
+    / "dbt"
+    / "include"
+    / "risingwave"
+    / "macros"
+    / "freshness.sql"
+)
+
+SOURCE = RisingWaveRelation.create(database="dev", schema="raw", identifier="orders")
+
+
+def collect_freshness(existing_comment, filter=None):
+    queries = []
+    dropped = []
+
+    def dbt_return(value):
+        raise MacroReturn(value)
+
+    def statement(name, fetch_result=False, auto_begin=True, caller=None):
+        queries.append((name, " ".join(caller().split())))
+        return ""
+
+    macro = SimpleNamespace(
+        name="risingwave__collect_freshness", macro_sql=FRESHNESS_MACROS.read_text()
+    )
+    context = {
+        "return": dbt_return,
+        "statement": statement,
+        "load_result": lambda name: name,
+        "local_md5": lambda value: "md5({})".format(value),
+        "current_timestamp": lambda: "now()",
+        "target": SimpleNamespace(schema="analytics"),
+        "api": SimpleNamespace(Relation=RisingWaveRelation),
+        "adapter": SimpleNamespace(
+            apply_session_settings=lambda settings: "",
+            statement_class_settings=lambda statement_class: {},
+            session_setting_statements=lambda settings: ["SET background_ddl = false"],
+            create_schema=lambda relation: None,
+            drop_relation=dropped.append,
+        ),
+        "risingwave__get_relation_without_caching": lambda relation: (
+            None if existing_comment is None else relation
+        ),
+        "risingwave__get_relation_comment": lambda relation: existing_comment,
+        "risingwave__alter_relation_comment": lambda relation, comment: "comment on {} is '{}'".format(
+            relation, comment
+        ),
+        "default__collect_freshness": lambda source, field, filter: "scanned",
+    }
+    result = CallableMacroGenerator(macro, context)(SOURCE, "loaded_at", filter)
+    return result, queries, dropped
+
+
+FINGERPRINT = 'dbt_freshness:md5(select max(loaded_at) as max_loaded_at from "dev"."raw"."orders")'
+FRESHNESS_RELATION = '"dev"."analytics"."__dbt_freshness_raw_orders"'
+
+
+def test_freshness_is_served_from_a_maintained_materialized_view():
+    result, queries, dropped = collect_freshness(existing_comment=None)
+
+    assert result == "collect_freshness"
+    assert dropped == []
+    assert queries == [
+        (
+            "create_freshness_relation",
+            "SET background_ddl = false; create materialized view {} as "
+            'select max(loaded_at) as max_loaded_at from "dev"."raw"."orders"'.format(
+                FRESHNESS_RELATION
+            ),
+        ),
+        (
+            "comment_freshness_relation",
+            "comment on {} is '{}'".format(FRESHNESS_RELATION, FINGERPRINT),
+        ),
+        (
+            "collect_freshness",
+            "select max_loaded_at, now() as snapshotted_at from {}".format(FRESHNESS_RELATION),
+        ),
+    ]
+
+
+def test_freshness_view_is_reused_until_the_query_changes():
+    _, queries, dropped = collect_freshness(existing_comment=FINGERPRINT)
+    assert [name for name, _ in queries] == ["collect_freshness"]
+    assert dropped == []
+
+    _, queries, dropped = collect_freshness(existing_comment="dbt_freshness:stale")
+    assert [str(relation) for relation in dropped] == [FRESHNESS_RELATION]
+    assert [name for name, _ in queries][0] == "create_freshness_relation"
+
+
+def test_filtered_freshness_falls_back_to_a_scan():
+    result, queries, _ = collect_freshness(existing_comment=None, filter="loaded_at > now()")
+    assert result == "scanned"
+    assert queries == []
@@ -0,0 +1,224 @@
+import threading
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from dbt.adapters.cache import RelationsCache
+from dbt.adapters.risingwave.impl import RisingWaveAdapter
+from dbt.adapters.risingwave.relation import RisingWaveRelation
+from dbt_common.exceptions import DbtRuntimeError
+
+
+def make_adapter():
+    adapter = RisingWaveAdapter.__new__(RisingWaveAdapter)
+    adapter.cache = RelationsCache()
+    adapter.execute_macro = Mock()
+    adapter._schema_ddl_lock = threading.Lock()
+    adapter._schema_locks = {}
+    adapter._created_schemas = set()
+    adapter._schema_owners = {}
+    adapter._column_cache_lock = threading.Lock()
+    adapter._column_cache = {}
+    adapter._column_cache_generation = 0
+    return adapter
+
+
+def test_relations_cache_is_populated_with_one_query_per_database():
+    adapter = make_adapter()
+    adapter.execute_macro.return_value = [
+        ("dev", "orders_mv", "analytics", "materialized_view"),
+        ("dev", "orders", "raw", "table"),
+        ("dev", "orders_sink", "raw", "sink"),
+    ]
+    cache_schemas = {
+        RisingWaveRelation.create(database="dev", schema=schema)
+        for schema in ("raw", "analytics", "empty")
+    }
+
+    adapter._relations_cache_for_schemas([], cache_schemas)
+
+    adapter.execute_macro.assert_called_once_with(
+        "risingwave__list_relations_in_schemas",
+        kwargs={"database": "dev", "schemas": ["analytics", "empty", "raw"]},
+    )
+    assert adapter.cache.schemas == {("dev", "analytics"), ("dev", "empty"), ("dev", "raw")}
+    assert sorted(
+        (relation.schema, relation.identifier, relation.type)
+        for relation in adapter.cache.get_relations("dev", "raw")
+    ) == [("raw", "orders", "table"), ("raw", "orders_sink", "sink")]
+
+
+def test_schema_owner_is_altered_at_most_once_per_run():
+    adapter = make_adapter()
+    adapter.execute_macro.return_value = [("analytics", "dbt_owner"), ("raw", "root")]
+    analytics = RisingWaveRelation.create(database="dev", schema="analytics", identifier="a")
+    raw = RisingWaveRelation.create(database="dev", schema="raw", identifier="b")
+
+    adapter.ensure_schema_owner(analytics, "dbt_owner")
+    adapter.ensure_schema_owner(raw, "dbt_owner")
+    adapter.ensure_schema_owner(raw, "dbt_owner")
+    adapter.ensure_schema_owner(raw, "other_owner")
+
+    assert [macro_call.args[0] for macro_call in adapter.execute_macro.call_args_list] == [
+        "risingwave__get_schema_owners",
+        "risingwave__alter_schema_owner",
+        "risingwave__alter_schema_owner",
+    ]
+    assert adapter._schema_owners == {"dev": {"analytics": "dbt_owner", "raw": "other_owner"}}
+
+
+def test_failed_schema_owner_alter_is_not_recorded():
+    adapter = make_adapter()
+    adapter._schema_owners = {"dev": {"raw": "root"}}
+    adapter.execute_macro.side_effect = [DbtRuntimeError("permission denied"), None]
+    raw = RisingWaveRelation.create(database="dev", schema="raw", identifier="b")
+
+    with pytest.raises(DbtRuntimeError):
+        adapter.ensure_schema_owner(raw, "dbt_owner")
+    assert adapter._schema_owners == {"dev": {"raw": "root"}}
+
+    adapter.ensure_schema_owner(raw, "dbt_owner")
+    assert adapter._schema_owners == {"dev": {"raw": "dbt_owner"}}
+
+
+def test_create_schema_runs_once_until_the_schema_is_dropped():
+    adapter = make_adapter()
+    adapter._schema_owners = {"dev": {"analytics": "dbt_owner"}}
+    relation = RisingWaveRelation.create(database="dev", schema="analytics", identifier="a")
+
+    with patch("dbt.adapters.sql.impl.SQLAdapter.create_schema") as create_schema, patch(
+        "dbt.adapters.sql.impl.SQLAdapter.drop_schema"
+    ):
+        adapter.create_schema(relation)
+        adapter.create_schema(relation.without_identifier())
+        assert create_schema.call_count == 1
+
+        adapter.drop_schema(relation)
+        adapter.create_schema(relation)
+        assert create_schema.call_count == 2
+
+    assert adapter._schema_owners == {"dev": {}}
+
+
+def test_concurrent_create_schema_waits_for_the_ddl_and_retries_after_failure():
+    adapter = make_adapter()
+    relation = RisingWaveRelation.create(database="dev", schema="analytics", identifier="a")
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def create_schema(self, relation):
+        calls.append(relation.schema)
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+            raise DbtRuntimeError("create schema failed")
+
+    with patch("dbt.adapters.sql.impl.SQLAdapter.create_schema", create_schema):
+        errors = []
+
+        def first():
+            try:
+                adapter.create_schema(relation)
+            except DbtRuntimeError as exc:
+                errors.append(exc)
+
+        first_thread = threading.Thread(target=first)
+        first_thread.start()
+        started.wait(5)
+        second_thread = threading.Thread(target=adapter.create_schema, args=(relation,))
+        second_thread.start()
+        second_thread.join(0.1)
+        # The second caller waits for the in-flight CREATE instead of returning early.
+        assert second_thread.is_alive()
+
+        release.set()
+        first_thread.join(5)
+        second_thread.join(5)
+
+    assert len(errors) == 1
+    assert calls == ["analytics", "analytics"]
+    assert adapter._created_schemas == {("dev", "analytics")}
+
+
+def test_columns_are_read_once_per_schema_and_invalidated_by_ddl():
+    adapter = make_adapter()
+    adapter.execute_macro.return_value = [
+        ("orders", "id", "integer"),
+        ("orders", "amount", "numeric"),
+        ("customers", "id", "integer"),
+    ]
+    orders = RisingWaveRelation.create(database="dev", schema="analytics", identifier="orders")
+    customers = orders.incorporate(path={"identifier": "customers"})
+    created_later = orders.incorporate(path={"identifier": "created_later"})
+
+    assert [(c.name, c.dtype) for c in adapter.get_columns_in_relation(orders)] == [
+        ("id", "integer"),
+        ("amount", "numeric"),
+    ]
+    assert [c.name for c in adapter.get_columns_in_relation(customers)] == ["id"]
+    adapter.execute_macro.assert_called_once_with(
+        "risingwave__get_columns_in_schema",
+        kwargs={"database": "dev", "schema": "analytics"},
+    )
+
+    with patch("dbt.adapters.sql.impl.SQLAdapter.get_columns_in_relation") as lookup:
+        lookup.return_value = []
+        assert adapter.get_columns_in_relation(created_later) == []
+        assert adapter.get_columns_in_relation(created_later) == []
+        assert lookup.call_count == 2
+
+        adapter.invalidate_column_cache(orders)
+        lookup.return_value = [RisingWaveAdapter.Column("id", "bigint")]
+        assert [c.dtype for c in adapter.get_columns_in_relation(orders)] == ["bigint"]
+        assert [c.dtype for c in adapter.get_columns_in_relation(orders)] == ["bigint"]
+        assert lookup.call_count == 3
+    assert adapter.execute_macro.call_count == 1
+
+
+def test_relation_last_modified_metadata_is_not_claimed():
+    from dbt.adapters.capability import Capability, Support
+
+    # RisingWave has no per-relation modification time, so metadata freshness would
+    # report the same cluster-wide checkpoint for every source.
+    capabilities = RisingWaveAdapter.capabilities()
+    for capability in (
+        Capability.TableLastModifiedMetadata,
+        Capability.TableLastModifiedMetadataBatch,
+    ):
+        assert capabilities[capability].support != Support.Full
+
+
+def test_statement_class_settings_layer_defaults_profile_and_model_config():
+    adapter = make_adapter()
+    adapter.config = SimpleNamespace(
+        credentials=SimpleNamespace(
+            query_settings={
+                "test": {"statement_timeout": 600000},
+                "catalog": {"query_mode": None},
+            }
+        )
+    )
+
+    assert adapter.statement_class_settings("show") == {
+        "query_mode": "local",
+        "statement_timeout": None,
+    }
+    assert adapter.statement_class_settings("catalog") == {
+        "query_mode": None,
+        "statement_timeout": None,
+    }
+    assert adapter.statement_class_settings("test", {"query_mode": "local"}) == {
+        "query_mode": "local",
+        "statement_timeout": 600000,
+    }
+    # DDL resets what other classes set instead of inheriting it.
+    assert adapter.statement_class_settings("ddl") == {
+        "query_mode": None,
+        "statement_timeout": None,
+    }
+
+    with pytest.raises(DbtRuntimeError, match="`query_mode` must be one of"):
+        adapter.statement_class_settings("ddl", {"query_mode": "batch"})
+    with pytest.raises(DbtRuntimeError, match="Unknown statement class"):
+        adapter.statement_class_settings("seed")
@@ -150,6 +150,116 @@ def test_unset_backfill_order_does_not_render_materialized_view_options():
     )
 
 
+def test_auto_backfill_order_renders_fixed_edges():
+    rendered = render_adapter_macro(
+        "risingwave__render_materialized_view_options",
+        {"backfill_order": " AUTO "},
+        extra_context={
+            "risingwave__auto_backfill_order": lambda: [
+                '"analytics"."users" -> "analytics"."user_events"'
+            ],
+        },
+    )
+
+    assert rendered == (
+        'with (backfill_order = FIXED("analytics"."users" -> "analytics"."user_events"))'
+    )
+    assert (
+        render_adapter_macro(
+            "risingwave__render_materialized_view_options",
+            {"backfill_order": "auto"},
+            extra_context={"risingwave__auto_backfill_order": lambda: []},
+        )
+        == ""
+    )
+
+
+def test_auto_backfill_order_looks_up_upstream_row_counts():
+    upstream = [
+        SimpleNamespace(database="dev", schema="analytics", identifier="user_events"),
+        SimpleNamespace(database="dev", schema="analytics", identifier="users"),
+    ]
+    queried = []
+
+    def get_relation_row_counts(relations):
+        queried.extend(relation.identifier for relation in relations)
+        return "row counts"
+
+    edges = render_adapter_macro(
+        "risingwave__auto_backfill_order",
+        {},
+        extra_context={
+            "execute": True,
+            "risingwave__get_upstream_relations": lambda: upstream,
+            "risingwave__get_relation_row_counts": get_relation_row_counts,
+            "adapter": SimpleNamespace(auto_backfill_order=lambda rows: [rows]),
+        },
+    )
+
+    assert queried == ["user_events", "users"]
+    assert edges == ["row counts"]
+
+
+def test_upstream_relations_for_backfill_stay_in_the_model_database():
+    upstream = [
+        SimpleNamespace(database="dev", schema="analytics", identifier="user_events"),
+        SimpleNamespace(database="other", schema="public", identifier="remote"),
+    ]
+
+    relations = render_adapter_macro(
+        "risingwave__get_upstream_relations",
+        {},
+        extra_context={
+            "graph": {},
+            "model": {"database": "dev"},
+            "adapter": SimpleNamespace(upstream_relations=lambda graph, model: upstream),
+        },
+    )
+
+    assert [relation.identifier for relation in relations] == ["user_events"]
+
+
+def test_auto_parallelism_settings_render_after_static_session_settings():
+    rendered = render_adapter_macro(
+        "risingwave__render_sql_header",
+        {"enable_serverless_backfill": False},
+        {"enable_serverless_backfill": True, "streaming_parallelism": 8},
+        extra_context={
+            "risingwave__native_model_session_settings": lambda: ["enable_serverless_backfill"],
+            "risingwave__render_session_config_value": lambda value: render_adapter_macro(
+                "risingwave__render_session_config_value", {}, value
+            ),
+        },
+    )
+
+    assert rendered == (
+        "set enable_serverless_backfill = false;\nset streaming_parallelism = 8;"
+    )
+
+
+def test_auto_parallelism_is_tuned_once_per_create_and_passed_only_to_the_mv_ddl():
+    materialization = (MATERIALIZATION_DIR / "materialized_view.sql").read_text()
+    adapter_macros = ADAPTER_MACROS.read_text()
+
+    assert materialization.count("risingwave__auto_parallelism_settings()") == 3
+    assert materialization.count("(target_relation, sql, backfill_settings)") == 2
+    assert materialization.count("(temp_relation, sql, backfill_settings)") == 1
+    assert "risingwave__auto_parallelism_settings()" not in adapter_macros.replace(
+        "macro risingwave__auto_parallelism_settings()", ""
+    )
+    assert adapter_macros.count("risingwave__render_sql_header(backfill_settings)") == 2
+
+
+def test_auto_parallelism_records_backfill_after_materialized_view_creation():
+    materialization = (MATERIALIZATION_DIR / "materialized_view.sql").read_text()
+
+    assert materialization.count("risingwave__record_backfill(target_relation)") == 2
+    assert materialization.count("risingwave__record_backfill(temp_relation)") == 1
+    assert materialization.index(
+        "risingwave__wait_for_background_ddl(temp_relation, 'materialized_view')"
+    ) < materialization.index("risingwave__record_backfill(temp_relation)")
+
+
 @pytest.mark.parametrize(
     "backfill_order",
     [
@@ -249,7 +359,7 @@ def test_zero_downtime_materialized_view_prebuilds_and_promotes_indexes():
     materialized_view = (MATERIALIZATION_DIR / "materialized_view.sql").read_text()
     adapter_macros = ADAPTER_MACROS.read_text()
 
-    create_temp = "risingwave__create_materialized_view_with_temp_name(temp_relation, sql)"
+    create_temp = "risingwave__create_materialized_view_with_temp_name(temp_relation, sql, backfill_settings)"
     build_indexes = "create_indexes(temp_relation)"
     swap = "risingwave__swap_materialized_views(old_relation, temp_relation)"
     handoff = "risingwave__handoff_zero_downtime_indexes(temp_relation, target_relation)"
@@ -271,6 +381,94 @@ def test_zero_downtime_materialized_view_prebuilds_and_promotes_indexes():
     assert "dependent_relation.relation_type != 'index'" in adapter_macros
 
 
+def test_zero_downtime_materialized_view_resumes_from_a_matching_temp_relation():
+    queries = []
+
+    def statement(name, fetch_result=False, caller=None):
+        queries.append(" ".join(caller().split()))
+        return ""
+
+    rows = [
+        ("orders_mv_v2",),
+        ("orders_mv_dbt_zero_down_tmp_20260101T020000_000000+0000",),
+        ("orders_mv_dbt_zero_down_tmp_20260101T010000_000000+0000",),
+    ]
+    context = {
+        "statement": statement,
+        "load_result": lambda name: SimpleNamespace(table=SimpleNamespace(rows=rows)),
+        "api": SimpleNamespace(Relation=RisingWaveRelation),
+    }
+    target_relation = RisingWaveRelation.create(
+        database="dev", schema="analytics", identifier="orders_mv", type="materialized_view"
+    )
+
+    resumed = render_adapter_macro(
+        "risingwave__find_resumable_temp_relation",
+        {},
+        target_relation,
+        "dbt_zero_downtime:abc",
+        extra_context=context,
+    )
+
+    assert resumed.identifier == "orders_mv_dbt_zero_down_tmp_20260101T020000_000000+0000"
+    assert resumed.type == "materialized_view"
+    assert "pg_description.description = 'dbt_zero_downtime:abc'" in queries[0]
+    assert "rw_relations.relation_type = 'materialized view'" in queries[0]
+
+    rows[1:] = []
+    assert (
+        render_adapter_macro(
+            "risingwave__find_resumable_temp_relation",
+            {},
+            target_relation,
+            "dbt_zero_downtime:abc",
+            extra_context=context,
+        )
+        is None
+    )
+
+    materialized_view = (MATERIALIZATION_DIR / "materialized_view.sql").read_text()
+    find = "risingwave__find_resumable_temp_relation(target_relation, fingerprint)"
+    create_temp = "risingwave__create_materialized_view_with_temp_name(temp_relation, sql, backfill_settings)"
+    mark = "risingwave__alter_relation_comment(temp_relation, fingerprint)"
+    swap = "risingwave__swap_materialized_views(old_relation, temp_relation)"
+    wait = "risingwave__wait_for_background_ddl(temp_relation, 'materialized_view')"
+    clear_target = 'risingwave__alter_relation_comment(target_relation, "")'
+    clear_temp = 'risingwave__alter_relation_comment(temp_relation, "")'
+    assert materialized_view.index(find) < materialized_view.index(create_temp)
+    assert materialized_view.index(create_temp) < materialized_view.index(wait)
+    assert materialized_view.index(wait) < materialized_view.index(mark)
+    assert materialized_view.index(mark) < materialized_view.index(swap)
+    # The swap and clearing the marker on both sides go out in one execution.
+    swap_start = materialized_view.index(swap)
+    swap_call = materialized_view[swap_start : materialized_view.index("endcall", swap_start)]
+    assert clear_target in swap_call and clear_temp in swap_call
+    assert "'WAIT MATERIALIZED VIEW ' ~ temp_relation.include(database=False)" in (
+        materialized_view
+    )
+
+
+def test_zero_downtime_table_stages_a_table_and_swaps_it_in():
+    table = (MATERIALIZATION_DIR / "table.sql").read_text()
+    adapter_macros = ADAPTER_MACROS.read_text()
+
+    create_temp = "risingwave__create_table_as(False, temp_relation, sql)"
+    build_indexes = "create_indexes(temp_relation)"
+    swap = "risingwave__swap_tables(old_relation, temp_relation)"
+    handoff = "risingwave__handoff_zero_downtime_indexes(temp_relation, target_relation)"
+    cleanup = "risingwave__drop_zero_downtime_temp_relation(temp_relation)"
+
+    assert "{% elif zero_downtime_mode %}" in table
+    assert table.index(create_temp) < table.index(build_indexes)
+    assert table.index(build_indexes) < table.index(swap)
+    assert table.index(swap) < table.index(handoff)
+    assert table.index(handoff) < table.index(cleanup)
+    assert "risingwave__drop_relation(temp_relation)" not in table
+
+    assert "alter table {{ old_relation }} swap with {{ new_relation }}" in adapter_macros
+    assert "drop table if exists {{ relation }}\n" in adapter_macros
+
+
 def test_sink_zero_downtime_uses_replace_sink_for_from_relation():
     sink = (MATERIALIZATION_DIR / "sink.sql").read_text()
     adapter_macros = ADAPTER_MACROS.read_text()
@@ -286,9 +484,42 @@ def test_sink_zero_downtime_uses_replace_sink_for_from_relation():
     assert "macro risingwave__wait_for_replace_sink(relation)" in adapter_macros
     assert "forces replacement sinks to background creation" in adapter_macros
     assert "replace sink if not exists" not in adapter_macros
-    assert "RisingWave REPLACE SINK does not support AS query yet" in adapter_macros
     assert "Raw sink DDL cannot be safely rewritten" in adapter_macros
-    assert "['materialized_view', 'view', 'sink']" in validation_macros
+    assert "['materialized_view', 'view', 'table', 'sink']" in validation_macros
+
+
+def test_query_bodied_sink_is_replaced_from_a_staged_materialized_view():
+    sink = (MATERIALIZATION_DIR / "sink.sql").read_text()
+    adapter_macros = ADAPTER_MACROS.read_text()
+
+    assert (
+        render_adapter_macro(
+            "risingwave__replace_sink_from_relation", {}, ' "dev"."public"."orders_mv" ', "kafka"
+        )
+        == '"dev"."public"."orders_mv"'
+    )
+    assert (
+        render_adapter_macro(
+            "risingwave__replace_sink_from_relation",
+            {},
+            "select id, amount from orders_mv",
+            "kafka",
+        )
+        is None
+    )
+    with pytest.raises(ValueError, match="Raw sink DDL cannot be safely rewritten"):
+        render_adapter_macro("risingwave__replace_sink_from_relation", {}, "orders_mv", None)
+
+    stage = "risingwave__stage_sink_query(target_relation, sql)"
+    replace = "risingwave__replace_sink(target_relation, replace_from_relation)"
+    cleanup = "risingwave__drop_previous_sink_stages(target_relation, staged_relation)"
+    assert sink.index(stage) < sink.index(replace) < sink.index(cleanup)
+    # Earlier stages are dropped after every cut-over, not only with immediate_cleanup.
+    assert "immediate_cleanup" not in sink
+    assert '"_dbt_zero_down_tmp_"' in adapter_macros
+    assert "risingwave__create_materialized_view_with_temp_name(staged_relation, sql)" in (
+        adapter_macros
+    )
 
 
 @pytest.mark.parametrize(
@@ -459,6 +690,81 @@ def test_streaming_cache_refill_policy_renders_in_model_sql_header():
     assert rendered == "set streaming_cache_refill_policy = 'both';"
 
 
+def test_sql_header_sends_changed_session_settings_inline_at_execution():
+    requested = []
+
+    def session_setting_statements(settings):
+        requested.append(settings)
+        return ["SET background_ddl = true", "SET streaming_parallelism = 4"]
+
+    rendered = render_adapter_macro(
+        "risingwave__render_sql_header",
+        {"sql_header": "select 1;", "background_ddl": True, "streaming_parallelism": 4},
+        {"enable_serverless_backfill": True},
+        extra_context={
+            "execute": True,
+            "adapter": SimpleNamespace(
+                session_setting_statements=session_setting_statements,
+                statement_class_settings=lambda statement_class, config: {
+                    "statement_timeout": 600000,
+                    "streaming_parallelism": 1,
+                },
+            ),
+            "risingwave__native_model_session_settings": lambda: ["streaming_parallelism"],
+        },
+    )
+
+    assert rendered == (
+        "select 1;\nSET background_ddl = true;\nSET streaming_parallelism = 4;"
+    )
+    assert requested == [
+        {
+            "background_ddl": True,
+            "streaming_parallelism": 4,
+            "enable_serverless_backfill": True,
+            "statement_timeout": 600000,
+        }
+    ]
+
+
+def test_schema_change_column_alters_invalidate_the_column_cache():
+    events = []
+    relation = SimpleNamespace(schema="analytics", identifier="orders")
+    extra_context = {
+        "adapter": SimpleNamespace(
+            invalidate_column_cache=lambda relation: events.append(("invalidate", relation))
+        ),
+        "default__alter_relation_add_remove_columns": lambda *args: events.append(
+            ("add_remove", args)
+        ),
+        "default__alter_column_type": lambda *args: events.append(("alter_type", args)),
+    }
+
+    render_adapter_macro(
+        "risingwave__alter_relation_add_remove_columns",
+        {},
+        relation,
+        ["amount"],
+        [],
+        extra_context=extra_context,
+    )
+    render_adapter_macro(
+        "risingwave__alter_column_type",
+        {},
+        relation,
+        "amount",
+        "numeric",
+        extra_context=extra_context,
+    )
+
+    assert events == [
+        ("add_remove", (relation, ["amount"], [])),
+        ("invalidate", relation),
+        ("alter_type", (relation, "amount", "numeric")),
+        ("invalidate", relation),
+    ]
+
+
 def test_profile_session_settings_render_safe_set_statements():
     connections = load_local_connections_module()
 
@@ -494,13 +800,17 @@ def test_profile_session_settings_render_safe_set_statements():
 
     assert handle.cursor_obj.closed
     assert handle.cursor_obj.statements == [
-        "SET RW_IMPLICIT_FLUSH TO true",
-        "SET streaming_cache_refill_policy = 'both'",
-        "SET enable_serverless_backfill = true",
-        "SET backfill_rate_limit = 1000",
-        "SET streaming_parallelism_for_materialized_view = 'bounded(16)'",
-        "SET streaming_parallelism_for_source = 'ratio(0.5)'",
-        "SET enable_index_selection = false",
+        "; ".join(
+            [
+                "SET RW_IMPLICIT_FLUSH TO true",
+                "SET streaming_cache_refill_policy = 'both'",
+                "SET enable_serverless_backfill = true",
+                "SET backfill_rate_limit = 1000",
+                "SET streaming_parallelism_for_materialized_view = 'bounded(16)'",
+                "SET streaming_parallelism_for_source = 'ratio(0.5)'",
+                "SET enable_index_selection = false",
+            ]
+        )
     ]
 
 
@@ -551,3 +861,215 @@ def execute_wait_macro(name, *args, background_ddl=None):
     }
     CallableMacroGenerator(macro, context)(*args)
     return queries
+
+
+def test_stream_plan_tracking_is_opt_in_and_reports_regressions():
+    calls = []
+    reports = []
+
+    def track_stream_plan(unique_id, relation, explain_sql, thresholds, accept):
+        calls.append((unique_id, relation, " ".join(explain_sql.split()), thresholds, accept))
+        return ["fragments grew from 2 to 3 (`max_fragment_increase` = 0)"]
+
+    context = {
+        "execute": True,
+        "model": {"unique_id": "model.project.orders_mv"},
+        "adapter": SimpleNamespace(track_stream_plan=track_stream_plan),
+        "risingwave__render_materialized_view_options": lambda: "",
+        "risingwave__validation_mode": lambda: "error",
+        "risingwave__validation_report": lambda code, message: reports.append((code, message)),
+    }
+
+    # Rendered in front of CREATE MATERIALIZED VIEW, so disabled tracking renders nothing.
+    assert (
+        render_adapter_macro(
+            "risingwave__track_stream_plan",
+            {},
+            "analytics.orders_mv",
+            "select 1",
+            extra_context=context,
+        )
+        == ""
+    )
+    assert calls == []
+
+    thresholds = {"enabled": True}
+    render_adapter_macro(
+        "risingwave__track_stream_plan",
+        {"plan_tracking": thresholds},
+        "analytics.orders_mv",
+        "select 1",
+        extra_context=context,
+    )
+
+    assert calls == [
+        (
+            "model.project.orders_mv",
+            "analytics.orders_mv",
+            "explain (distsql) create materialized view analytics.orders_mv as select 1",
+            thresholds,
+            False,
+        )
+    ]
+    assert reports == [
+        (
+            "RW011",
+            "Stream plan for `analytics.orders_mv` exceeds `plan_tracking` thresholds: "
+            "fragments grew from 2 to 3 (`max_fragment_increase` = 0).",
+        )
+    ]
+
+
+def test_maintained_tests_read_failures_from_a_persistent_materialized_view():
+    materialization = (MATERIALIZATION_DIR / "test.sql").read_text()
+
+    assert "config.get('maintained', false)" in materialization
+    assert "risingwave__get_relation_comment(old_relation) != fingerprint" in materialization
+    assert "risingwave__create_materialized_view_as(target_relation, maintained_sql)" in (
+        materialization
+    )
+    assert "risingwave__alter_relation_comment(target_relation, fingerprint)" in materialization
+
+    maintained_sql = render_adapter_macro(
+        "risingwave__maintained_test_sql", {}, "select * from orders where id is null", "count(*)"
+    )
+    assert " ".join(maintained_sql.split()) == (
+        "select count(*) as failures from ( select * from orders where id is null ) "
+        "dbt_internal_test"
+    )
+
+    result_sql = render_adapter_macro(
+        "risingwave__maintained_test_result_sql", {}, "audit.not_null_orders_id", "!= 0", "> 10"
+    )
+    assert " ".join(result_sql.split()) == (
+        "select failures, failures != 0 as should_warn, failures > 10 as should_error "
+        "from ( select coalesce((select failures from audit.not_null_orders_id), 0) "
+        "as failures ) dbt_internal_test"
+    )
+
+
+def test_microbatch_batches_replace_their_event_time_range_without_a_temp_table():
+    materialization = (MATERIALIZATION_DIR / "incremental.sql").read_text()
+
+    assert "incremental_strategy == 'microbatch'" in materialization
+    assert "adapter.apply_session_settings({'rw_implicit_flush': 'false'})" in materialization
+    assert "risingwave__microbatch_is_last_batch()" in materialization
+
+    batch = SimpleNamespace(
+        event_time_start="2024-01-01 00:00:00+00:00",
+        event_time_end="2024-01-02 00:00:00+00:00",
+    )
+    microbatch_sql = render_adapter_macro(
+        "risingwave__get_incremental_microbatch_sql",
+        {"event_time": "ordered_at"},
+        {
+            "target_relation": "analytics.orders",
+            "temp_relation": "(select * from raw_orders) as dbt_microbatch_source",
+            "dest_columns": [SimpleNamespace(name="id"), SimpleNamespace(name="ordered_at")],
+        },
+        extra_context={
+            "model": SimpleNamespace(batch=batch),
+            "get_quoted_csv": lambda names: ", ".join('"{}"'.format(name) for name in names),
+        },
+    )
+    assert " ".join(microbatch_sql.split()) == (
+        "delete from analytics.orders where ordered_at >= '2024-01-01 00:00:00+00:00' "
+        "and ordered_at < '2024-01-02 00:00:00+00:00'; "
+        'insert into analytics.orders ("id", "ordered_at") select "id", "ordered_at" '
+        "from (select * from raw_orders) as dbt_microbatch_source"
+    )
+
+
+def test_microbatch_flushes_only_after_the_last_batch():
+    import datetime
+
+    import pytz
+
+    def is_last_batch(event_time_end, run_end=None):
+        batch = SimpleNamespace(event_time_end=event_time_end)
+        return render_adapter_macro(
+            "risingwave__microbatch_is_last_batch",
+            {},
+            extra_context={
+                "model": SimpleNamespace(batch=batch),
+                "invocation_args_dict": {"event_time_end": run_end},
+                "modules": SimpleNamespace(datetime=datetime, pytz=pytz),
+            },
+        )
+
+    now = datetime.datetime.now(pytz.utc)
+    assert is_last_batch(now + datetime.timedelta(hours=1))
+    assert not is_last_batch(now - datetime.timedelta(hours=1))
+    day = datetime.datetime(2024, 1, 2, tzinfo=pytz.utc)
+    assert is_last_batch(day, "2024-01-02T00:00:00")
+    assert not is_last_batch(day - datetime.timedelta(days=1), "2024-01-02T00:00:00")
+
+
+def test_persist_docs_issues_only_changed_comments_in_one_execution():
+    relation = RisingWaveRelation.create(database="dev", schema="analytics", identifier="wide_mv")
+    queries = []
+
+    def run_query(sql):
+        queries.append(sql)
+        if "pg_description" in sql:
+            return [(None, "Orders"), ("id", "Order id"), ("amount", "Old amount")]
+        return None
+
+    config = SimpleNamespace(persist_relation_docs=lambda: True, persist_column_docs=lambda: True)
+    adapter = SimpleNamespace(
+        get_columns_in_relation=lambda relation: [
+            SimpleNamespace(name=name) for name in ("id", "amount", "status")
+        ],
+        quote=lambda name: f'"{name}"',
+    )
+    context = {"run_query": run_query, "adapter": adapter}
+    context.update(
+        {
+            name: (
+                lambda name: lambda *args: render_adapter_macro(
+                    name, config, *args, extra_context=context
+                )
+            )(name)
+            for name in (
+                "risingwave__get_relation_comments",
+                "risingwave__alter_relation_comment",
+                "risingwave__alter_column_comment",
+            )
+        }
+    )
+    model = {
+        "description": "Orders",
+        "columns": {
+            "id": {"description": "Order id", "quote": None},
+            "amount": {"description": "Amount in cents", "quote": None},
+            "status": {"description": "Order status", "quote": None},
+        },
+    }
+
+    render_adapter_macro(
+        "risingwave__persist_docs",
+        config,
+        relation,
+        model,
+        extra_context=context,
+    )
+
+    assert len(queries) == 2
+    statements = [" ".join(line.split()) for line in queries[1].splitlines() if line.strip()]
+    assert statements == [
+        'comment on column "analytics"."wide_mv".amount is \'Amount in cents\';',
+        'comment on column "analytics"."wide_mv".status is \'Order status\';',
+    ]
+
+    queries.clear()
+    model["columns"]["amount"]["description"] = "Old amount"
+    model["columns"]["status"]["description"] = ""
+    render_adapter_macro(
+        "risingwave__persist_docs",
+        config,
+        relation,
+        model,
+        extra_context=context,
+    )
+
+    assert len(queries) == 1
@@ -0,0 +1,225 @@
+from pathlib import Path
+
+from dbt.adapters.risingwave import planner
+
+
+REBUILD_PLAN_MACROS = (
+    Path(__file__).resolve().parents[2]
+    / "dbt"
+    / "include"
+    / "risingwave"
+    / "macros"
+    / "rebuild_plan.sql"
+)
+
+
+def model(name, materialized, depends_on=(), schema="analytics", **config):
+    return {
+        "unique_id": f"model.project.{name}",
+        "name": name,
+        "alias": name,
+        "schema": schema,
+        "resource_type": "model",
+        "tags": config.pop("tags", []),
+        "config": {"materialized": materialized, **config},
+        "depends_on": {"nodes": list(depends_on)},
+    }
+
+
+def source(name, schema="raw"):
+    return {
+        "unique_id": f"source.project.raw.{name}",
+        "name": name,
+        "identifier": name,
+        "schema": schema,
+        "resource_type": "source",
+        "config": {},
+    }
+
+
+def graph_nodes(*items):
+    return {item["unique_id"]: item for item in items}
+
+
+def test_plan_ranks_rebuilds_by_upstream_backfill_rows():
+    orders = source("orders")
+    events = source("events")
+    sources = graph_nodes(orders, events)
+    nodes = graph_nodes(
+        model("small_mv", "materialized_view", [orders["unique_id"]]),
+        model("large_mv", "materialized_view", [orders["unique_id"], events["unique_id"]]),
+        model("plain_view", "view", [events["unique_id"]]),
+    )
+    snapshot = planner.CatalogSnapshot.from_rows(
+        [
+            ("raw", "orders", "table", None, 100),
+            ("raw", "events", "table", None, 5000),
+            ("analytics", "small_mv", "materialized view", None, 10),
+            ("analytics", "large_mv", "materialized view", None, 10),
+        ]
+    )
+
+    plan = planner.plan_rebuilds(nodes, sources, snapshot, full_refresh=True)
+
+    assert [(item.name, item.action, item.backfill_rows) for item in plan] == [
+        ("large_mv", "rebuild", 5100),
+        ("small_mv", "rebuild", 100),
+        ("plain_view", "create", 0),
+    ]
+
+
+def test_plan_mirrors_materialization_branches_without_full_refresh():
+    orders = source("orders")
+    sources = graph_nodes(orders)
+    nodes = graph_nodes(
+        model(
+            "zd_mv",
+            "materialized_view",
+            [orders["unique_id"]],
+            zero_downtime={"enabled": True},
+        ),
+        model("plain_mv", "materialized_view", [orders["unique_id"]]),
+        model(
+            "indexed_mv",
+            "materialized_view",
+            [orders["unique_id"]],
+            indexes=[{"columns": ["id"]}],
+            on_configuration_change="apply",
+        ),
+        model("raw_sink", "sink", ["model.project.plain_mv"], zero_downtime={"enabled": True}),
+        model("zd_table", "table", [orders["unique_id"]], zero_downtime={"enabled": True}),
+    )
+    snapshot = planner.CatalogSnapshot.from_rows(
+        [
+            ("raw", "orders", "table", None, 100),
+            ("analytics", "zd_mv", "materialized view", None, 100),
+            ("analytics", "zd_table", "table", None, 100),
+            ("analytics", "plain_mv", "materialized view", None, 100),
+            ("analytics", "indexed_mv", "materialized view", None, 40),
+            ("analytics", "raw_sink", "sink", None, None),
+        ]
+    )
+
+    plan = {
+        item.name: item
+        for item in planner.plan_rebuilds(nodes, sources, snapshot, zero_downtime=True)
+    }
+
+    assert (plan["zd_mv"].action, plan["zd_mv"].backfill_rows) == ("swap", 100)
+    assert (plan["plain_mv"].action, plan["plain_mv"].backfill_rows) == ("no-op", 0)
+    assert (plan["indexed_mv"].action, plan["indexed_mv"].backfill_rows) == ("apply_indexes", 40)
+    assert plan["raw_sink"].action == "fail"
+    assert (plan["zd_table"].action, plan["zd_table"].backfill_rows) == ("swap", 100)
+
+
+def test_only_single_relation_sinks_are_planned_as_replace_sink():
+    orders = source("orders")
+    sources = graph_nodes(orders)
+    relation_sink = model(
+        "relation_sink",
+        "sink",
+        [orders["unique_id"]],
+        connector="kafka",
+        zero_downtime={"enabled": True},
+    )
+    relation_sink["raw_code"] = "{{ config(connector='kafka') }}\n{{ source('raw', 'orders') }}"
+    compiled_sink = model(
+        "compiled_sink",
+        "sink",
+        [orders["unique_id"]],
+        connector="kafka",
+        zero_downtime={"enabled": True},
+    )
+    compiled_sink["compiled_code"] = '"raw"."orders"'
+    query_sink = model(
+        "query_sink",
+        "sink",
+        [orders["unique_id"]],
+        connector="kafka",
+        zero_downtime={"enabled": True},
+    )
+    query_sink["raw_code"] = "select id from {{ source('raw', 'orders') }}"
+    nodes = graph_nodes(relation_sink, compiled_sink, query_sink)
+    snapshot = planner.CatalogSnapshot.from_rows(
+        [
+            ("raw", "orders", "table", None, 100),
+            ("analytics", "relation_sink", "sink", None, None),
+            ("analytics", "compiled_sink", "sink", None, None),
+            ("analytics", "query_sink", "sink", None, None),
+        ]
+    )
+
+    plan = {
+        item.name: (item.action, item.backfill_rows)
+        for item in planner.plan_rebuilds(nodes, sources, snapshot, zero_downtime=True)
+    }
+
+    assert plan == {
+        "relation_sink": ("replace", 0),
+        "compiled_sink": ("replace", 0),
+        "query_sink": ("rebuild", 100),
+    }
+
+
+def test_plan_matches_existing_index_names_and_reports_unknown_row_counts():
+    orders = source("orders")
+    sources = graph_nodes(orders)
+    nodes = graph_nodes(
+        model(
+            "indexed_mv",
+            "materialized_view",
+            [orders["unique_id"]],
+            indexes=[{"columns": ["id"]}],
+            on_configuration_change="apply",
+            tags=["nightly"],
+        ),
+        model("other_mv", "materialized_view", [orders["unique_id"]]),
+    )
+    snapshot = planner.CatalogSnapshot.from_rows(
+        [
+            ("raw", "orders", "table", None, None),
+            ("analytics", "indexed_mv", "materialized view", None, 40),
+            ("analytics", "__dbt_index_indexed_mv_id", "index", "indexed_mv", 40),
+        ]
+    )
+
+    plan = planner.plan_rebuilds(nodes, sources, snapshot, select=["tag:nightly"])
+    assert [(item.name, item.action) for item in plan] == [("indexed_mv", "no-op")]
+
+    selected = planner.select_nodes(nodes, "other_mv")
+    assert planner.snapshot_schemas(selected, nodes, sources) == ["analytics", "raw"]
+    assert planner.relations_missing_row_counts(selected, nodes, sources, snapshot) == [
+        ("raw", "orders")
+    ]
+
+    (created,) = planner.plan_rebuilds(nodes, sources, snapshot, select="other_mv")
+    assert created.action == "create"
+    assert (created.backfill_rows, created.unknown_upstreams) == (0, ["raw.orders"])
+
+    snapshot.with_row_counts([("raw", "orders", 7)])
+    (created,) = planner.plan_rebuilds(nodes, sources, snapshot, select="other_mv")
+    assert (created.backfill_rows, created.unknown_upstreams) == (7, [])
+
+
+def test_plan_looks_through_ephemeral_models():
+    orders = source("orders")
+    sources = graph_nodes(orders)
+    ephemeral = model("orders_prep", "ephemeral", [orders["unique_id"]])
+    nodes = graph_nodes(
+        ephemeral,
+        model("orders_mv", "materialized_view", [ephemeral["unique_id"]]),
+    )
+    snapshot = planner.CatalogSnapshot.from_rows([("raw", "orders", "table", None, 12)])
+
+    plan = planner.plan_rebuilds(nodes, sources, snapshot)
+
+    assert [(item.name, item.backfill_rows) for item in plan] == [("orders_mv", 12)]
+
+
+def test_rebuild_plan_snapshot_reads_catalog_in_one_query():
+    macros = REBUILD_PLAN_MACROS.read_text()
+
+    assert macros.count("call statement('rebuild_plan_snapshot'") == 1
+    assert "rw_catalog.rw_table_stats" in macros
+    assert "rw_indexes.primary_table_id" in macros
+    assert "where rw_schemas.name in (" in macros
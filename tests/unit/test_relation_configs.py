@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+import agate
+import pytest
+from dbt.adapters.relation_configs import RelationConfigChangeAction
+from dbt_common.exceptions import DbtRuntimeError
+
+from dbt.adapters.risingwave.relation import RisingWaveRelation
+from dbt.adapters.risingwave.relation_configs import (
+    RisingWaveIndexConfig,
+    RisingWaveIndexConfigChange,
+    RisingWaveMaterializedViewConfig,
+)
+
+
+def test_index_config_validation_still_raises_on_invalid_columns():
+    with pytest.raises(DbtRuntimeError, match="at least one column"):
+        RisingWaveIndexConfig.from_dict({"column_names": []})
+    with pytest.raises(DbtRuntimeError, match="unique column names"):
+        RisingWaveIndexConfig(column_names=("id", "id"))
+
+    rules = RisingWaveIndexConfig(column_names=("id",)).validation_rules
+    assert {rule.validation_check for rule in rules} == {True}
+
+    with pytest.raises(DbtRuntimeError, match="only `drop` and `create`"):
+        RisingWaveIndexConfigChange(
+            action=RelationConfigChangeAction.alter,
+            context=RisingWaveIndexConfig(column_names=("id",)),
+        )
+
+
+def test_bulk_index_constructors_match_per_entry_parsing():
+    entries = [{"columns": ["ID"]}, {"columns": ["tenant", "ts"], "include": ["Amount"]}]
+    per_entry = [
+        RisingWaveIndexConfig.from_dict(RisingWaveIndexConfig.parse_model_node(entry))
+        for entry in entries
+    ]
+    bulk = RisingWaveIndexConfig.from_model_node_entries(entries)
+    assert list(bulk) == per_entry
+    # `name` does not take part in equality; an unknown name stays `None`.
+    assert [index.name for index in bulk] == [None, None]
+
+    table = agate.Table(
+        [("__dbt_index_mv_id", "id"), ("__dbt_index_mv_tenant_ts", "tenant,ts")],
+        ["name", "column_names"],
+    )
+    bulk = RisingWaveIndexConfig.from_relation_results_table(table)
+    assert bulk == tuple(
+        RisingWaveIndexConfig.from_dict(RisingWaveIndexConfig.parse_relation_results(row))
+        for row in table.rows
+    )
+    assert [index.name for index in bulk] == ["__dbt_index_mv_id", "__dbt_index_mv_tenant_ts"]
+    unnamed = RisingWaveIndexConfig.from_relation_results_table(
+        agate.Table([("id",)], ["column_names"])
+    )
+    assert unnamed[0].name is None
+    assert hash(bulk[0]) == hash(per_entry[0])
+
+
+def test_materialized_view_index_changes_only_report_differences():
+    relation = RisingWaveRelation.create(database="dev", schema="analytics", identifier="mv")
+    relation_config = SimpleNamespace(
+        identifier="mv",
+        compiled_code="select 1",
+        config={"indexes": [{"columns": ["id"]}, {"columns": ["tenant"]}]},
+    )
+    relation_results = {
+        "indexes": agate.Table(
+            [("__dbt_index_mv_id", "id"), ("__dbt_index_mv_ts", "ts")], ["name", "column_names"]
+        )
+    }
+
+    changes = relation.get_materialized_view_config_change_collection(
+        relation_results, relation_config
+    )
+
+    assert sorted((change.action, change.context.column_names) for change in changes.indexes) == [
+        (RelationConfigChangeAction.create, ("tenant",)),
+        (RelationConfigChangeAction.drop, ("ts",)),
+    ]
+    assert RisingWaveMaterializedViewConfig.from_relation_results({}).indexes == []
@@ -0,0 +1,261 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+import agate
+
+from dbt.adapters.risingwave import snapshot
+from dbt.adapters.risingwave.impl import RisingWaveAdapter
+from dbt.adapters.risingwave.subscription import CursorPosition
+
+SNAPSHOT_MATERIALIZATION = (
+    Path(__file__).resolve().parents[2]
+    / "dbt"
+    / "include"
+    / "risingwave"
+    / "macros"
+    / "materializations"
+    / "snapshot.sql"
+)
+
+COLUMNS = ["id", "status", "op", "rw_timestamp"]
+META_COLUMNS = {
+    "dbt_scd_id": "dbt_scd_id",
+    "dbt_updated_at": "dbt_updated_at",
+    "dbt_valid_from": "dbt_valid_from",
+    "dbt_valid_to": "dbt_valid_to",
+}
+
+
+def quote(name):
+    return '"{}"'.format(name)
+
+
+def changes(*rows):
+    return agate.Table(rows, COLUMNS)
+
+
+class FakeCursor:
+    def __init__(self, rows, committed=1000):
+        self.rows = list(rows)
+        self.committed = committed
+        self.statements = []
+
+    def __call__(self, sql):
+        self.statements.append(sql)
+        if sql.startswith("fetch"):
+            size = int(sql.split()[1])
+            batch, self.rows = self.rows[:size], self.rows[size:]
+            return changes(*batch)
+        if sql == snapshot.COMMITTED_TIMESTAMP_SQL:
+            return agate.Table([(self.committed,)], ["rw_timestamp"])
+        return changes()
+
+
+def test_plan_batch_closes_and_opens_versions_per_key():
+    rows = changes(
+        (1, "new", "Insert", 100),
+        (2, "new", "Insert", 100),
+        (1, "new", "UpdateDelete", 200),
+        (1, "paid", "UpdateInsert", 200),
+        (3, "paid", "Delete", 300),
+        (2, "new", "Delete", 300),
+    )
+
+    ignored = snapshot.plan_batch(rows, ["id"], ["id", "status"])
+    assert ignored.closes == {(1,): 100, (2,): 100}
+    assert [(v.key, v.values, v.valid_from, v.valid_to) for v in ignored.inserts] == [
+        ((1,), [1, "new"], 100, 200),
+        ((2,), [2, "new"], 100, None),
+        ((1,), [1, "paid"], 200, None),
+    ]
+
+    invalidated = snapshot.plan_batch(rows, ["id"], ["id", "status"], hard_deletes="invalidate")
+    assert invalidated.closes == {(1,): 100, (2,): 100, (3,): 300}
+    assert invalidated.inserts[1].valid_to == 300
+
+
+def test_plan_batch_stamps_full_snapshot_rows_with_the_default_timestamp():
+    rows = changes((1, "new", "Insert", None), (1, "paid", "UpdateInsert", 900))
+
+    batch = snapshot.plan_batch(rows, ["id"], ["id", "status"], default_timestamp=1000)
+
+    assert [(v.valid_from, v.valid_to) for v in batch.inserts] == [(1000, 1000), (1000, None)]
+
+
+def test_versions_render_as_one_update_and_one_insert():
+    closes = {(1, "eu"): 1_700_000_000_000}
+    update = snapshot.close_versions_sql(
+        "analytics.orders_snapshot", quote, ["id", "region"], "dbt_valid_to", closes
+    )
+    assert " ".join(update.split()) == (
+        'update analytics.orders_snapshot set "dbt_valid_to" = case '
+        "when \"id\" = 1 and \"region\" = 'eu' then '2023-11-14 22:13:20.000'::timestamp end "
+        'where "dbt_valid_to" is null and ( ("id" = 1 and "region" = \'eu\') )'
+    )
+
+    version = snapshot.SnapshotVersion((1,), [1, "it's"], 1_700_000_000_000)
+    insert = snapshot.insert_versions_sql(
+        "analytics.orders_snapshot", quote, ["id", "status"], META_COLUMNS, [version]
+    )
+    assert " ".join(insert.split()) == (
+        'insert into analytics.orders_snapshot ("id", "status", "dbt_scd_id", '
+        '"dbt_updated_at", "dbt_valid_from", "dbt_valid_to") values '
+        "(1, 'it''s', '{}', '2023-11-14 22:13:20.000'::timestamp, "
+        "'2023-11-14 22:13:20.000'::timestamp, null)".format(
+            snapshot.scd_id((1,), 1_700_000_000_000)
+        )
+    )
+
+
+def test_array_values_render_as_typed_array_constructors():
+    assert snapshot.render_literal(["a", "it's"]) == "ARRAY['a', 'it''s']"
+    assert snapshot.render_literal([[1, 2], [3, None]]) == "ARRAY[ARRAY[1, 2], ARRAY[3, null]]"
+    assert snapshot.render_literal([]) == "'{}'"
+
+    # dbt result tables carry arrays as JSON text.
+    version = snapshot.SnapshotVersion((1,), [1, '["a", "b"]', '["x"]'], 1_700_000_000_000)
+    insert = snapshot.insert_versions_sql(
+        "analytics.orders_snapshot",
+        quote,
+        ["id", "tags", "label"],
+        META_COLUMNS,
+        [version],
+        array_types={"tags": "character varying[]"},
+    )
+    assert "(1, ARRAY['a', 'b']::character varying[], '[\"x\"]', " in insert
+
+
+def test_first_run_loads_a_full_snapshot_and_stores_the_position_once():
+    cursor = FakeCursor([(1, "new", "Insert", None), (2, "new", "Insert", None)], committed=1000)
+    saved = []
+
+    applied = snapshot.apply_changes(
+        cursor,
+        saved.append,
+        "snap",
+        "snap_sub",
+        "c",
+        quote,
+        ["id"],
+        ["id", "status"],
+        META_COLUMNS,
+    )
+
+    assert applied == 2
+    assert cursor.statements[:2] == [
+        "declare c subscription cursor for snap_sub full",
+        snapshot.COMMITTED_TIMESTAMP_SQL,
+    ]
+    assert sum(sql.startswith("insert into snap") for sql in cursor.statements) == 1
+    assert cursor.statements[-1] == "close c"
+    assert saved == [CursorPosition(1000, 0)]
+    assert snapshot.format_position(saved[0]) == "dbt_changelog_position=1000:0"
+
+
+def test_later_runs_resume_after_the_stored_position_and_save_each_batch():
+    position = snapshot.parse_position("dbt_changelog_position=1000:1")
+    cursor = FakeCursor(
+        [
+            (1, "paid", "UpdateInsert", 1000),
+            (2, "paid", "UpdateInsert", 1000),
+            (3, "new", "Insert", 1500),
+        ]
+    )
+    saved = []
+
+    applied = snapshot.apply_changes(
+        cursor,
+        lambda position: saved.append(snapshot.format_position(position)),
+        "snap",
+        "snap_sub",
+        "c",
+        quote,
+        ["id"],
+        ["id", "status"],
+        META_COLUMNS,
+        position=position,
+        batch_size=2,
+    )
+
+    assert applied == 2
+    assert cursor.statements[0] == "declare c subscription cursor for snap_sub since 999"
+    assert saved == ["dbt_changelog_position=1000:2", "dbt_changelog_position=1500:1"]
+    assert snapshot.parse_position("managed by dbt") is None
+
+
+def test_changelog_snapshot_materialization_falls_back_to_the_default_strategy():
+    materialization = SNAPSHOT_MATERIALIZATION.read_text()
+
+    assert "config.get('strategy') != 'changelog'" in materialization
+    assert "return(materialization_snapshot_default())" in materialization
+    assert "risingwave__create_subscription(subscription_relation" in materialization
+    assert "rebuild=old_relation is none" in materialization
+
+
+def test_position_comment_carries_the_query_fingerprint():
+    comment = snapshot.format_position(CursorPosition(1000, 2), "abc123")
+
+    assert comment == "dbt_changelog_position=1000:2 dbt_changelog_sql=abc123"
+    assert snapshot.parse_position(comment) == CursorPosition(1000, 2)
+    assert snapshot.parse_fingerprint(comment) == "abc123"
+    assert snapshot.parse_fingerprint("dbt_changelog_position=1000:2") is None
+
+
+def test_reload_closes_current_versions_at_the_full_snapshot_time():
+    cursor = FakeCursor([(1, "new", "Insert", None)], committed=2000)
+
+    snapshot.apply_changes(
+        cursor,
+        lambda position: None,
+        "snap",
+        "snap_sub",
+        "c",
+        quote,
+        ["id"],
+        ["id", "status"],
+        META_COLUMNS,
+        close_current=True,
+    )
+
+    assert cursor.statements[2] == (
+        "update snap\nset \"dbt_valid_to\" = '1970-01-01 00:00:02.000'::timestamp\n"
+        'where "dbt_valid_to" is null'
+    )
+    assert any(sql.startswith("insert into snap") for sql in cursor.statements[3:])
+
+
+def test_a_position_older_than_the_retention_reloads_a_full_snapshot(monkeypatch):
+    adapter = RisingWaveAdapter.__new__(RisingWaveAdapter)
+    adapter.execute_macro = Mock(return_value="dbt_changelog_position=1000:0 dbt_changelog_sql=a")
+    adapter.get_columns_in_relation = Mock(return_value=[])
+    adapter.quote = quote
+    adapter.execute = Mock(return_value=(None, agate.Table([(5000,)], ["rw_timestamp"])))
+    applied = Mock(return_value=0)
+    monkeypatch.setattr(snapshot, "apply_changes", applied)
+
+    adapter.apply_changelog_snapshot(
+        "snap",
+        "snap__dbt_changelog",
+        "snap_sub",
+        "id",
+        ["id"],
+        META_COLUMNS,
+        fingerprint="a",
+        retention="1D",
+    )
+
+    adapter.execute.assert_called_once_with(snapshot.retention_cutoff_sql("1D"), fetch=True)
+    assert applied.call_args.kwargs["position"] is None
+    assert applied.call_args.kwargs["close_current"] is True
+
+
+def test_changelog_snapshot_rebuilds_the_changelog_when_the_query_changes():
+    materialization = SNAPSHOT_MATERIALIZATION.read_text()
+
+    assert "changelog_fingerprint = local_md5(sql | trim)" in materialization
+    assert "endswith(' dbt_changelog_sql=' ~ changelog_fingerprint)" in materialization
+    assert materialization.index("adapter.drop_relation(existing_changelog)") < (
+        materialization.index("statement('create_changelog')")
+    )
+    assert "reload=changelog_changed and old_relation is not none" in materialization
+    assert "retention=config.get('retention', '1D')" in materialization
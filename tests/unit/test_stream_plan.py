@@ -0,0 +1,59 @@
+from dbt.adapters.risingwave import stream_plan
+
+
+EXPLAIN_OUTPUT = """Fragment 0
+StreamMaterialize { columns: [id, total], stream_key: [id], pk_columns: [id] }
+├── tables: [ Materialize: 4294967294 ]
+└── StreamHashAgg { group_key: [id], aggs: [sum(amount), count] }
+    ├── tables: [ HashAggState: 0 ]
+    └── StreamExchange Hash([0]) from 1
+
+Fragment 1
+StreamTableScan { table: orders, columns: [id, amount] }
+├── tables: [ StreamScan: 1 ]
+└── StreamExchange NoShuffle from 2
+
+Table 0
+├── columns: [ id, sum(amount), count ]
+└── read pk prefix len hint: 1
+
+Table 1
+├── columns: [ vnode, id, backfill_finished ]
+└── read pk prefix len hint: 1
+
+Table 4294967294
+├── columns: [ id, total ]
+└── read pk prefix len hint: 1""".splitlines()
+
+
+def test_stream_plan_counts_fragments_shuffles_and_state_tables():
+    plan = stream_plan.StreamPlan.from_explain_lines(EXPLAIN_OUTPUT)
+
+    assert (plan.fragments, plan.exchanges, plan.state_tables) == (2, 1, 3)
+    assert plan.operators == {
+        "StreamExchange": 2,
+        "StreamHashAgg": 1,
+        "StreamMaterialize": 1,
+        "StreamTableScan": 1,
+    }
+
+
+def test_stream_plan_checks_growth_against_previous_run(tmp_path):
+    path = stream_plan.plan_path(tmp_path, "model.project.orders_mv")
+    previous = stream_plan.StreamPlan.from_explain_lines(EXPLAIN_OUTPUT)
+    stream_plan.save_plan(path, "analytics.orders_mv", previous)
+
+    grown = stream_plan.StreamPlan.from_explain_lines(
+        EXPLAIN_OUTPUT + ["", "Fragment 2", "StreamHashJoin { type: Inner }", "", "Table 2"]
+    )
+    loaded = stream_plan.load_plan(path)
+
+    assert loaded == previous
+    assert stream_plan.check_plan(previous, loaded, {}) == []
+    assert stream_plan.check_plan(grown, loaded, {"max_fragment_increase": 1}) == [
+        "state tables grew from 3 to 4 (`max_state_table_increase` = 0)"
+    ]
+    assert stream_plan.check_plan(grown, None, {"max_fragments": 2}) == [
+        "3 fragments exceeds `max_fragments` = 2"
+    ]
+    assert stream_plan.operator_changes(grown, loaded) == ["+1 StreamHashJoin"]
@@ -0,0 +1,86 @@
+import agate
+import pytest
+
+from dbt.adapters.risingwave import subscription
+
+
+class FakeCursor:
+    """Serves `fetch` batches from a list of changes and records every statement."""
+
+    def __init__(self, changes):
+        self.changes = changes
+        self.offset = 0
+        self.statements = []
+
+    def __call__(self, sql):
+        self.statements.append(sql)
+        if not sql.startswith("fetch"):
+            return agate.Table([], ["id", "op", "rw_timestamp"])
+        size = int(sql.split()[1])
+        rows = self.changes[self.offset : self.offset + size]
+        self.offset += len(rows)
+        return agate.Table(rows, ["id", "op", "rw_timestamp"])
+
+
+def consumed_ids(batches):
+    return [[row["id"] for row in batch] for batch in batches]
+
+
+def test_changes_are_fetched_in_batches_and_the_cursor_is_closed(tmp_path):
+    path = subscription.position_path(tmp_path, "analytics.orders_sub")
+    cursor = FakeCursor([(1, "Insert", 100), (2, "Insert", 100), (3, "Insert", 200)])
+
+    batches = subscription.iter_changes(
+        cursor, "analytics.orders_sub", path, "dbt_cursor_orders", batch_size=2
+    )
+
+    assert consumed_ids(batches) == [[1, 2], [3]]
+    assert cursor.statements == [
+        "declare dbt_cursor_orders subscription cursor for analytics.orders_sub full",
+        "fetch 2 from dbt_cursor_orders",
+        "fetch 2 from dbt_cursor_orders",
+        "fetch 2 from dbt_cursor_orders",
+        "close dbt_cursor_orders",
+    ]
+    assert subscription.load_position(path) == subscription.CursorPosition(200, 1)
+
+
+def test_resumed_cursor_skips_rows_already_consumed_at_the_stored_timestamp(tmp_path):
+    path = subscription.position_path(tmp_path, "orders_sub")
+    subscription.save_position(path, "orders_sub", subscription.CursorPosition(100, 2))
+    cursor = FakeCursor(
+        [
+            (1, "Insert", 99),
+            (2, "Insert", 100),
+            (3, "Insert", 100),
+            (4, "Delete", 100),
+            (5, "Insert", 101),
+        ]
+    )
+
+    batches = list(subscription.iter_changes(cursor, "orders_sub", path, "c", batch_size=10))
+
+    assert consumed_ids(batches) == [[4, 5]]
+    assert cursor.statements[0] == "declare c subscription cursor for orders_sub since 99"
+    assert subscription.load_position(path) == subscription.CursorPosition(101, 1)
+
+
+def test_position_only_advances_after_the_consumer_asks_for_more(tmp_path):
+    path = subscription.position_path(tmp_path, "orders_sub")
+    cursor = FakeCursor([(1, "Insert", 100), (2, "Insert", 200)])
+
+    batches = subscription.iter_changes(cursor, "orders_sub", path, "c", batch_size=1)
+    next(batches)
+    next(batches)
+    batches.close()
+
+    assert subscription.load_position(path) == subscription.CursorPosition(100, 1)
+    assert cursor.statements[-1] == "close c"
+
+
+def test_declare_rejects_unknown_start():
+    with pytest.raises(ValueError, match="`start` must be one of"):
+        subscription.declare_cursor_sql("c", "orders_sub", None, start="latest")
+
+    name = subscription.cursor_name('analytics."Orders-Sub"')
+    assert name == "dbt_cursor_analytics__orders_sub_"